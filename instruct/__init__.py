@@ -2,14 +2,18 @@ from __future__ import annotations
 
 import ast
 import builtins
+import datetime
 import enum
 import functools
+import hashlib
 import inspect
+import linecache
 import logging
 import os
 import re
 import sys
 import tempfile
+import threading
 import time
 import types
 import typing
@@ -18,8 +22,8 @@ import weakref
 
 from contextlib import suppress, contextmanager
 from contextvars import ContextVar
-from collections import abc, ChainMap
-from base64 import urlsafe_b64encode
+from collections import abc, ChainMap, OrderedDict
+from base64 import urlsafe_b64encode, urlsafe_b64decode
 from collections.abc import (
     Mapping as AbstractMapping,
     Iterable as AbstractIterable,
@@ -27,6 +31,8 @@ from collections.abc import (
     ValuesView as AbstractValuesView,
     ItemsView as AbstractItemsView,
     Iterator,
+    AsyncIterator,
+    Hashable,
 )
 from enum import IntEnum
 
@@ -55,13 +61,18 @@ from typing import (
     overload,
     MutableMapping,
 )
-from weakref import WeakValueDictionary
 
 import inflection
 from jinja2 import Environment, PackageLoader
 
-from . import exceptions
+from . import binary, exceptions, instrumentation, msgpack, streams, validation
 from .about import __version__, __version_info__
+from .binary import dumps_into
+from .codecs import CONTAINER_TYPES, MAPPING_TYPES, cached_on_class
+from .msgpack import dumps as to_msgpack, dumps_many as to_many_msgpack
+from .projections import projection, Projection
+from .validation import describe_expected_types, describe_value, FieldError
+from .instrumentation import stats, reset_stats
 from .compat import CellType
 from .constants import NoPickle, NoJSON, NoIterable, Range, NoHistory, RangeFlags, Undefined
 from .exceptions import (
@@ -74,6 +85,7 @@ from .exceptions import (
     ExceptionJSONSerializable,
     ValueError as InstructValueError,
     TypeError as InstructTypeError,
+    LazyMessage,
 )
 from .subtype import wrapper_for_type
 from .typing import (
@@ -326,6 +338,116 @@ def clear(instance: Atomic, fields: Iterable[str] | None = None) -> Atomic:
     return instance
 
 
+class _Batch:
+    __slots__ = ("depth", "old_values")
+
+    def __init__(self) -> None:
+        self.depth = 0
+        # field -> value before the first change in the batch
+        self.old_values: dict[str, Any] = {}
+
+    def changed(self, field: str, old_value: Any) -> None:
+        if field not in self.old_values:
+            self.old_values[field] = old_value
+
+
+# id(instance) -> batch, consulted by the setters of fields with listeners
+_pending_batches: dict[int, _Batch] = {}
+_batches_lock = threading.Lock()
+
+# class -> {field: classified listeners}
+_listener_names: weakref.WeakKeyDictionary[type, dict[str, ListenerNames]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _listener_names_for(cls: type, field: str) -> ListenerNames:
+    try:
+        return _listener_names[cls][field]
+    except KeyError:
+        pass
+    names = classify_listeners(listeners_in_effect(cls, field))
+    _listener_names.setdefault(cls, {})[field] = names
+    return names
+
+
+def _fire_batched_listeners(instance: Atomic, old_values: Mapping[str, Any]) -> None:
+    cls = type(instance)
+    grouped: dict[str, dict[str, Any]] = {}
+    for field, old_value in old_values.items():
+        new_value = getattr(instance, field)
+        names = _listener_names_for(cls, field)
+        for name in chain(names.on_sets, names.on_sets_0, names.on_sets_1, names.on_sets_3):
+            listener = getattr(instance, name)
+            if name in names.on_sets_0:
+                listener()
+            elif name in names.on_sets_1:
+                listener(new_value)
+            elif name in names.on_sets:
+                listener(old_value, new_value)
+            else:
+                listener(field, old_value, new_value)
+        for name in names.grouped:
+            grouped.setdefault(name, {})[field] = new_value
+    for name, values in grouped.items():
+        getattr(instance, name)(**values)
+
+
+@contextmanager
+def batch_update(instance: T) -> Generator[T, None, None]:
+    """
+    Defer the event listeners of ``instance`` until the block exits, then call
+    each once per changed field with the value before the first change and the
+    current value. Grouped listeners are called once with every changed field
+    they listen to.
+
+    If the block raises, the pending listener calls are dropped (the fields
+    keep whatever was assigned). Batches on the same instance nest, firing when
+    the outermost exits.
+
+        with instruct.batch_update(item):
+            item.first_name = "Autumn"
+            item.last_name = "Jolitz"
+    """
+    key = id(instance)
+    with _batches_lock:
+        batch = _pending_batches.get(key)
+        if batch is None:
+            batch = _pending_batches[key] = _Batch()
+        batch.depth += 1
+    completed = False
+    try:
+        yield instance
+        completed = True
+    finally:
+        with _batches_lock:
+            batch.depth -= 1
+            outermost = not batch.depth
+            if outermost:
+                del _pending_batches[key]
+    if outermost and completed and batch.old_values:
+        _fire_batched_listeners(cast(Atomic, instance), batch.old_values)
+
+
+def update(instance: T, **fields: Any) -> T:
+    """
+    Assign several fields of an instruct class instance, calling its event
+    listeners once afterwards (see ``batch_update``).
+    """
+    if isinstance(instance, type) or not isinstance(type(instance), AtomicMeta):
+        raise TypeError("Can only call on an AtomicMeta-metaclassed instance!")
+    unrecognized_keys = frozenset(fields) - frozenset(keys(instance))
+    if unrecognized_keys:
+        if implements_init_errors(instance):
+            instance._handle_init_errors([], [], unrecognized_keys)
+        else:
+            raise ValueError("Unknown keys: {}".format(", ".join(unrecognized_keys)))
+    with batch_update(instance):
+        for field, value in fields.items():
+            setattr(instance, field, value)
+    return instance
+
+
 Errors = Union[Tuple[Exception, ...], List[Exception]]
 ErroredNames = Union[Tuple[str, ...], List[str], FrozenSet[str], Set[str]]
 
@@ -678,6 +800,149 @@ def asjson(instance):
     raise TypeError("Must be an AtomicMeta-metaclassed type!")
 
 
+# converters that undo what ``to_json`` did to a field value
+_IDENTITY = None
+_NOT_REVERSIBLE = object()
+
+
+def _decode_base64(value: str) -> bytes:
+    if value.startswith("base64:"):
+        return urlsafe_b64decode(value[len("base64:") :])
+    return value
+
+
+def _json_item_converter(hint: TypeHint) -> Callable[[Any], Any] | None | object:
+    """
+    Converter for a value nested in a collection; ``to_json`` only turns
+    Atomic instances in collections into dicts.
+    """
+    origin = get_origin(hint)
+    if origin is Annotated:
+        return _json_item_converter(get_args(hint)[0])
+    if origin is Union:
+        members = tuple(arg for arg in get_args(hint) if arg is not NoneType)
+        if any(is_atomic_type(member) for member in members):
+            if len(members) > 1:
+                return _NOT_REVERSIBLE
+            return _json_field_converter(members[0], None)
+        return _IDENTITY
+    if is_atomic_type(hint):
+        return trusted_json_decoder(hint)
+    return _IDENTITY
+
+
+def _json_field_converter(
+    hint: TypeHint, binary_encoder: Callable | None
+) -> Callable[[Any], Any] | None | object:
+    origin = get_origin(hint)
+    if origin is Annotated:
+        return _json_field_converter(get_args(hint)[0], binary_encoder)
+    if origin is Union:
+        members = tuple(arg for arg in get_args(hint) if arg is not NoneType)
+        if len(members) > 1:
+            converters = [_json_field_converter(member, binary_encoder) for member in members]
+            if any(convert is not _IDENTITY for convert in converters):
+                return _NOT_REVERSIBLE
+            return _IDENTITY
+        return _json_field_converter(members[0], binary_encoder)
+    if is_atomic_type(hint):
+        return trusted_json_decoder(hint)
+    if hint is datetime.datetime:
+        return datetime.datetime.fromisoformat
+    if hint is datetime.date:
+        return datetime.date.fromisoformat
+    if hint is datetime.time:
+        return datetime.time.fromisoformat
+    if hint in (bytes, bytearray):
+        if binary_encoder is not None:
+            return _NOT_REVERSIBLE
+        if hint is bytearray:
+            return lambda value: bytearray(_decode_base64(value))
+        return _decode_base64
+    if origin in CONTAINER_TYPES:
+        args = get_args(hint)
+        # JSON arrays are lists already
+        container = CONTAINER_TYPES[origin]
+        if container is list:
+            container = None
+        if origin is tuple and args and not (len(args) == 2 and args[1] is Ellipsis):
+            converters = tuple(_json_item_converter(arg) for arg in args)
+            if _NOT_REVERSIBLE in converters:
+                return _NOT_REVERSIBLE
+            return lambda value: tuple(
+                item if convert is None else convert(item)
+                for convert, item in zip(converters, value)
+            )
+        convert_item = _json_item_converter(args[0]) if args else _IDENTITY
+        if convert_item is _NOT_REVERSIBLE:
+            return _NOT_REVERSIBLE
+        if convert_item is _IDENTITY:
+            return container
+        if container is None:
+            return lambda value: [convert_item(item) for item in value]
+        return lambda value: container(convert_item(item) for item in value)
+    if origin in MAPPING_TYPES:
+        args = get_args(hint)
+        convert_value = _json_item_converter(args[1]) if args else _IDENTITY
+        if convert_value is _NOT_REVERSIBLE:
+            return _NOT_REVERSIBLE
+        if convert_value is _IDENTITY:
+            return _IDENTITY
+        return lambda value: {key: convert_value(item) for key, item in value.items()}
+    return _IDENTITY
+
+
+def _build_trusted_json_decoder(data_class: type[T]) -> Callable[[Mapping[str, Any]], T]:
+    binary_encoders = getattr(data_class, "BINARY_JSON_ENCODERS", EMPTY_MAPPING)
+    converters = {}
+    reversible = True
+    for field in data_class._columns:
+        convert = _json_field_converter(data_class._slots[field], binary_encoders.get(field))
+        if convert is _NOT_REVERSIBLE:
+            reversible = False
+            break
+        if convert is not _IDENTITY:
+            converters[field] = convert
+    if not reversible:
+        public_cls = public_class(data_class)
+
+        def decode(data: Mapping[str, Any]) -> T:
+            return public_cls(**data)
+
+    elif not converters:
+        from_dict = data_class._trusted_from_dict
+
+        def decode(data: Mapping[str, Any]) -> T:
+            return from_dict(data)
+
+    else:
+        from_dict = data_class._trusted_from_dict
+        converter_items = tuple(converters.items())
+
+        def decode(data: Mapping[str, Any]) -> T:
+            data = {**data}
+            for field, convert in converter_items:
+                value = data.get(field)
+                if value is not None:
+                    data[field] = convert(value)
+            return from_dict(data)
+
+    return decode
+
+
+def trusted_json_decoder(cls: type[T]) -> Callable[[Mapping[str, Any]], T]:
+    """
+    Return a function that reverses ``to_json`` for ``cls``: ISO dates and times
+    are parsed, ``base64:`` strings decoded and nested dicts turned into
+    instances, then the values are written directly into the slots as with
+    ``trusted_from_dict``.
+
+    If a field can not be reversed exactly (i.e. it has a ``BINARY_JSON_ENCODERS``
+    entry or is a union of Atomic types) the class falls back to ``cls(**data)``.
+    """
+    return cached_on_class(public_class(cls), "_trusted_json_decoder", _build_trusted_json_decoder)
+
+
 def annotated_metadata(instance_or_cls: Atomic | type[Atomic]) -> Mapping[str, tuple[Any]]:
     """
     returns any values from an Annotated[...] class field.
@@ -690,17 +955,25 @@ FieldMappingEntry = dict[str, Union[None, "FieldMappingEntry"]]
 FieldMapping = dict[str, FieldMappingEntry | None]
 
 
+# class -> its full tree, as the fields of a class never change once created
+_all_fields: weakref.WeakKeyDictionary[type[Atomic], FrozenMapping] = weakref.WeakKeyDictionary()
+
+
 def show_all_fields(
     instance_or_cls: Atomic | type[Atomic],
     *,
     deep_traverse_on: Mapping[str, Any] | None = None,
-) -> FieldMapping:
+) -> FrozenMapping[str, FrozenMapping | None]:
     """
     Create a tree of all the fields supported in the instruct class and any
     embedded instruct classes.
 
     deep_traverse_on: only descend if the same key exists in the provided mapping,
         if None, always descend.
+
+    The full tree (no ``deep_traverse_on``) is computed once per class and
+    shared, so it is returned frozen. Partial trees are not kept, as callers
+    such as ``Cls & {...}`` pass arbitrary ``deep_traverse_on`` mappings.
     """
     if not isinstance(instance_or_cls, type):
         cls = type(instance_or_cls)
@@ -708,6 +981,11 @@ def show_all_fields(
         cls = instance_or_cls
     if not isinstance(cls, AtomicMeta):
         raise TypeError("Must be an AtomicMeta-metaclassed type!")
+    if deep_traverse_on is None:
+        try:
+            return _all_fields[cls]
+        except KeyError:
+            pass
     all_fields: FieldMappingEntry = {}
     for key, value in cls._slots.items():
         all_fields[key] = {}
@@ -726,15 +1004,27 @@ def show_all_fields(
                 target.update(show_all_fields(value, deep_traverse_on=next_deep_level))
         if not all_fields[key]:
             all_fields[key] = None
-    return all_fields
+    result = FrozenMapping(all_fields)
+    if deep_traverse_on is None:
+        _all_fields[cls] = result
+    return result
 
 
 SkippedFieldMapping = Mapping[str, Union["SkippedFieldMapping", None]]
 MutableSkippedMapping = MutableMapping[str, Union["MutableSkippedMapping", None]]
 
+# subtracted class -> its skipped fields (or None), computed once as for ``_all_fields``
+_skipped_fields: weakref.WeakKeyDictionary[type[Atomic], FrozenMapping | None] = (
+    weakref.WeakKeyDictionary()
+)
+
 
 def skipped_fields(instance_or_cls: Atomic | type[Atomic]) -> SkippedFieldMapping | None:
     cls: type[Atomic] = public_class(instance_or_cls, preserve_subtraction=True)
+    try:
+        return _skipped_fields[cls]
+    except KeyError:
+        pass
     skipped: dict[str, Any] = {key: None for key in cls._skipped_fields}
     for key in cls._slots:
         typedef = cls._slots[key]
@@ -751,9 +1041,256 @@ def skipped_fields(instance_or_cls: Atomic | type[Atomic]) -> SkippedFieldMappin
             skipped_on_typedef = skipped_fields(atomic_cls)
             if skipped_on_typedef:
                 skipped[key] = skipped_on_typedef
-    if not skipped:
+    result = FrozenMapping(skipped) if skipped else None
+    _skipped_fields[cls] = result
+    return result
+
+
+# generated functions that live on the public class rather than the data class
+GENERATED_SUPPORT_METHODS = (
+    "__iter__",
+    "__getstate__",
+    "__setstate__",
+    "__eq__",
+    "_clear",
+    "__getitem__",
+    "__setitem__",
+    "_asdict",
+    "_astuple",
+    "_aslist",
+)
+
+_finalize_lock = threading.RLock()
+
+
+def defer_until_finalized(cls: type[Atomic], thunks: list[Callable[[], Any]]) -> None:
+    """
+    Run ``thunks`` when ``finalize(cls)`` is called or on the first
+    instantiation of ``cls`` (or a subclass), whichever comes first.
+    """
+    with _finalize_lock:
+        pending = vars(cls).get("_pending_finalize")
+        if pending is not None:
+            pending[-1:-1] = thunks
+            return
+        original_new = vars(cls).get("__new__")
+
+        def __new__(klass, *args, **kwargs):
+            finalize(klass)
+            return klass.__new__(klass, *args, **kwargs)
+
+        def restore_new():
+            if original_new is None:
+                del cls.__new__
+            else:
+                cls.__new__ = original_new
+
+        # restore last so that other threads wait in ``finalize`` until every thunk ran
+        cls._pending_finalize = [*thunks, restore_new]
+        cls.__new__ = staticmethod(__new__)
+
+
+def finalize(instance_or_cls: Atomic | type[Atomic]) -> type[Atomic]:
+    """
+    Run any work deferred at class creation (i.e. ``lazy=True`` or
+    ``lazy_method_annotations=True``) for a class and its bases. Safe to call
+    more than once and from several threads; returns the class.
+    """
+    cls = instance_or_cls
+    if not isinstance(cls, type):
+        cls = type(cls)
+    if not isinstance(cls, AtomicMeta):
+        raise TypeError(f"Can only call on AtomicMeta-metaclassed types!, {cls}")
+    for base in reversed(cls.__mro__):
+        if "_pending_finalize" not in vars(base):
+            continue
+        with _finalize_lock:
+            pending = vars(base).get("_pending_finalize")
+            if pending is None:
+                continue
+            while pending:
+                pending.pop(0)()
+            with suppress(AttributeError):
+                del base._pending_finalize
+    return cls
+
+
+def warmup(*classes: type[Atomic], background: bool = True) -> threading.Thread | None:
+    """
+    Materialize ``lazy=True`` classes ahead of their first use. With no
+    classes given, every class created so far is finalized.
+
+    By default the work happens on a daemon thread, which is returned so
+    callers may ``join()`` it; first use from another thread waits for a
+    class that is being materialized.
+    """
+    if not classes:
+        classes = tuple(AtomicMeta.REGISTRY)
+
+    def run() -> None:
+        for cls in classes:
+            finalize(cls)
+
+    if not background:
+        run()
         return None
-    return FrozenMapping(skipped)
+    thread = threading.Thread(target=run, name="instruct-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+class _Unmaterialized:
+    """
+    Stands in for a generated attribute of a ``lazy=True`` class until the
+    class is finalized. Any access materializes the class and then forwards
+    to the generated attribute.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def _materialize(self, owner: type[Atomic]) -> None:
+        finalize(owner)
+        if inspect.getattr_static(owner, self.name, None) is self:
+            raise AttributeError(f"{owner.__qualname__}.{self.name} failed to materialize")
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            self._materialize(owner)
+            return getattr(owner, self.name)
+        self._materialize(type(instance))
+        return getattr(instance, self.name)
+
+    def __set__(self, instance, value) -> None:
+        self._materialize(type(instance))
+        setattr(instance, self.name, value)
+
+    def __delete__(self, instance) -> None:
+        self._materialize(type(instance))
+        delattr(instance, self.name)
+
+    def __repr__(self) -> str:
+        return f"<unmaterialized {self.name!r}>"
+
+
+class MemoryUsage(NamedTuple):
+    """
+    Approximate bytes attributable to the generated parts of a class.
+
+    ``code_bytes`` counts each distinct code object once, so code shared
+    with other classes is included in every class that uses it unless a
+    ``seen`` set is passed to ``memory_usage``.
+    """
+
+    code_objects: int
+    code_bytes: int
+    function_bytes: int
+    metadata_bytes: int
+    type_bytes: int
+
+    @property
+    def total(self) -> int:
+        return self.code_bytes + self.function_bytes + self.metadata_bytes + self.type_bytes
+
+
+def _functions_of(value: Any) -> Iterator[FunctionType]:
+    if isinstance(value, (classmethod, staticmethod)):
+        value = value.__func__
+    if isinstance(value, functools.partial):
+        value = value.func
+    if isinstance(value, FunctionType):
+        yield value
+    elif isinstance(value, property):
+        for func in (value.fget, value.fset, value.fdel):
+            yield from _functions_of(func)
+    elif isinstance(value, BoundClassOrInstanceAttribute):
+        for name in (
+            "_class_attribute",
+            "_instance_attribute",
+            *ClassOrInstanceFuncsDataDescriptor.__slots__,
+        ):
+            yield from _functions_of(getattr(value, name, None))
+
+
+def _code_objects_of(code: CodeType) -> Iterator[CodeType]:
+    yield code
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            yield from _code_objects_of(const)
+
+
+def memory_usage(
+    instance_or_cls: Atomic | type[Atomic], *, seen: set[int] | None = None
+) -> MemoryUsage:
+    """
+    Account for the memory used by the generated functions, code objects and
+    metadata descriptors of an instruct class (its support class, data class and
+    unchecked sibling, if built). Inherited attributes are not counted.
+
+    Pass the same ``seen`` set across calls to total many classes without counting
+    shared objects twice:
+
+        seen = set()
+        total = sum(memory_usage(cls, seen=seen).total for cls in classes)
+    """
+    cls = instance_or_cls
+    if not isinstance(cls, type):
+        cls = type(cls)
+    if not isinstance(cls, AtomicMeta):
+        raise TypeError(f"Can only call on AtomicMeta-metaclassed types!, {cls}")
+    if seen is None:
+        seen = set()
+    support_cls = cls.__public_class__()
+    data_class = support_cls._data_class
+    own_classes = [support_cls, data_class]
+    if "_unchecked_class" in vars(data_class):
+        own_classes.append(vars(data_class)["_unchecked_class"])
+
+    code_objects = code_bytes = function_bytes = metadata_bytes = type_bytes = 0
+
+    def add_function(func: FunctionType) -> None:
+        nonlocal code_objects, code_bytes, function_bytes
+        if id(func) in seen:
+            return
+        seen.add(id(func))
+        function_bytes += sys.getsizeof(func)
+        for code in _code_objects_of(func.__code__):
+            if id(code) in seen:
+                continue
+            seen.add(id(code))
+            code_objects += 1
+            code_bytes += sys.getsizeof(code)
+        for cell in func.__closure__ or ():
+            function_bytes += sys.getsizeof(cell)
+            with suppress(ValueError):
+                contents = cell.cell_contents
+                if isinstance(contents, dict):
+                    for item in contents.values():
+                        for nested in _functions_of(item):
+                            add_function(nested)
+                else:
+                    for nested in _functions_of(contents):
+                        add_function(nested)
+
+    for own_cls in own_classes:
+        if id(own_cls) in seen:
+            continue
+        seen.add(id(own_cls))
+        type_bytes += sys.getsizeof(own_cls) + sys.getsizeof(vars(own_cls))
+        for value in vars(own_cls).values():
+            if isinstance(value, (ImmutableValue, ImmutableMapping, ImmutableCollection)):
+                if id(value) not in seen:
+                    seen.add(id(value))
+                    metadata_bytes += sys.getsizeof(value)
+                    if id(value.value) not in seen and not isinstance(value.value, type):
+                        seen.add(id(value.value))
+                        metadata_bytes += sys.getsizeof(value.value)
+                continue
+            for func in _functions_of(value):
+                add_function(func)
+    return MemoryUsage(code_objects, code_bytes, function_bytes, metadata_bytes, type_bytes)
 
 
 # End of public helpers
@@ -768,18 +1305,194 @@ def _dump_skipped_fields(instance_or_cls):
     return skipped_fields(instance_or_cls)
 
 
+def generated_filename(source: str, kind: str, owner: str | None = None) -> str:
+    """
+    Name generated code for tracebacks and profilers: after the class (and
+    field) it belongs to, i.e. ``<instruct:app.Order.id:property>``, or without
+    an ``owner`` after what it is and a digest of its source, i.e.
+    ``<instruct:property:1f2e3d4c5b6a>``.
+    """
+    if owner is not None:
+        return f"<instruct:{owner}:{kind}>"
+    digest = hashlib.blake2b(source.encode("utf8"), digest_size=6).hexdigest()
+    return f"<instruct:{kind}:{digest}>"
+
+
+@functools.lru_cache(maxsize=4096)
+def _source_lines(source: str) -> list[str]:
+    # one list of lines per source, however many classes' filenames refer to it
+    return source.splitlines(True)
+
+
+def register_generated_source(filename: str, source: str) -> None:
+    """
+    Make ``source`` what ``linecache`` (and so ``traceback``, ``pdb`` and
+    ``inspect.getsource``) reads for ``filename``. Entries without an mtime are
+    left alone by ``linecache.checkcache()``.
+    """
+    linecache.cache[filename] = (len(source), None, _source_lines(source), filename)
+
+
+# generated filename -> how many live classes use its ``linecache`` entry
+_source_users: dict[str, int] = {}
+_source_users_lock = threading.Lock()
+
+
+def _hold_source(filename: str, source: str) -> None:
+    with _source_users_lock:
+        _source_users[filename] = _source_users.get(filename, 0) + 1
+        if filename not in linecache.cache:
+            register_generated_source(filename, source)
+
+
+def release_generated_sources(filenames: Iterable[str]) -> None:
+    """
+    Drop the ``linecache`` entries of generated code no live class uses anymore.
+    Called when a class is garbage collected with the filenames it held.
+    """
+    with _source_users_lock:
+        for filename in filenames:
+            users = _source_users.get(filename, 0) - 1
+            if users > 0:
+                _source_users[filename] = users
+                continue
+            _source_users.pop(filename, None)
+            linecache.cache.pop(filename, None)
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile_generated(
+    source: str, filename: str, flags: int = 0, dont_inherit: bool = False
+) -> CodeType:
+    return compile(source, filename, mode="exec", flags=flags, dont_inherit=dont_inherit)
+
+
+def _retarget(code: CodeType, filename: str) -> CodeType:
+    consts = tuple(
+        _retarget(const, filename) if isinstance(const, CodeType) else const
+        for const in code.co_consts
+    )
+    return code.replace(co_filename=filename, co_consts=consts)
+
+
+def compile_generated(
+    source: str,
+    kind: str,
+    flags: int = 0,
+    dont_inherit: bool = False,
+    *,
+    owner: str | None = None,
+    filename: str | None = None,
+    sources: list[str] | None = None,
+) -> CodeType:
+    """
+    Compile rendered template source, registering it with ``linecache`` under
+    ``generated_filename(source, kind, owner)`` unless given a real ``filename``
+    (i.e. a ``INSTRUCT_DEBUG_CODEGEN`` dump).
+
+    Source is compiled once however many classes render it (same field names
+    and setter shape, or a ``Cls - {...}`` of an existing class), and the code
+    is shared. Only with an ``owner`` (instrumented classes) is it copied under
+    a per-class name with ``code.replace(...)``.
+
+    The ``linecache`` filename is appended to ``sources``, for the class to
+    hand to ``release_generated_sources`` once it is collected.
+    """
+    if filename is not None:
+        return _compile_generated(source, filename, flags, dont_inherit)
+    shared_filename = generated_filename(source, kind)
+    code = _compile_generated(source, shared_filename, flags, dont_inherit)
+    if owner is not None:
+        filename = generated_filename(source, kind, owner)
+        code = _retarget(code, filename)
+    else:
+        filename = shared_filename
+    if sources is None:
+        register_generated_source(filename, source)
+    else:
+        _hold_source(filename, source)
+        sources.append(filename)
+    return code
+
+
+# parsing a template is the expensive part of rendering one, so keep the
+# templates built from strings (i.e. ``__defaults__init__template__``) around
+_template_from_string = functools.lru_cache(maxsize=256)(env.from_string)
+
+
+_rendered: OrderedDict[Hashable, str] = OrderedDict()
+_RENDER_CACHE_SIZE = 4096
+
+
+def _render_key(value: Any) -> Hashable:
+    if value is None or isinstance(value, (str, int, float)):
+        return (type(value), value)
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_render_key(item) for item in value))
+    raise TypeError(f"{type(value)!r} is not a cacheable render argument")
+
+
+def _render(template_name: str | None, source: str | None, arguments: dict[str, Any]) -> str:
+    try:
+        key = (
+            template_name,
+            source,
+            tuple(sorted((name, _render_key(value)) for name, value in arguments.items())),
+        )
+    except TypeError:
+        key = None
+    else:
+        try:
+            rendered = _rendered[key]
+        except KeyError:
+            pass
+        else:
+            with suppress(KeyError):
+                _rendered.move_to_end(key)
+            return rendered
+    if template_name is None:
+        rendered = _template_from_string(source).render(arguments)
+    else:
+        rendered = env.get_template(template_name).render(arguments)
+    if key is not None:
+        _rendered[key] = rendered
+        while len(_rendered) > _RENDER_CACHE_SIZE:
+            with suppress(KeyError):
+                _rendered.popitem(last=False)
+    return rendered
+
+
+def render_template(template_name: str, **arguments: Any) -> str:
+    """
+    Render one of the ``instruct/templates``.
+
+    Renders are memoized process-wide on the arguments (strings, numbers, None
+    and tuples or lists of them), so classes with the same field shapes only
+    render each template once. Any other argument bypasses the cache.
+    """
+    return _render(template_name, None, arguments)
+
+
+def render_string(source: str, **arguments: Any) -> str:
+    """
+    Like ``render_template`` but for template source, which is parsed once.
+    """
+    return _render(None, source, arguments)
+
+
 def make_fast_clear(fields, set_block, class_name):
     set_block = set_block.format(key="%(key)s")
-    code_template = env.get_template("fast_clear.jinja").render(
-        fields=fields, setter_variable_template=set_block, class_name=class_name
+    code_template = render_template(
+        "fast_clear.jinja",
+        fields=tuple(fields),
+        setter_variable_template=set_block,
+        class_name=class_name,
     )
     return code_template
 
 
 def make_fast_dumps(fields, class_name):
-    code_template = env.get_template("fast_dumps.jinja").render(
-        fields=fields, class_name=class_name
-    )
+    code_template = render_template("fast_dumps.jinja", fields=tuple(fields), class_name=class_name)
     return code_template
 
 
@@ -791,9 +1504,10 @@ def make_fast_getset_item(
     set_variable_template: str,
     **kwargs,
 ):
-    code_template = env.get_template("fast_getitem.jinja").render(
-        fields=fields,
-        properties=properties,
+    code_template = render_template(
+        "fast_getitem.jinja",
+        fields=tuple(fields),
+        properties=tuple(properties),
         class_name=class_name,
         get_variable_template=get_variable_template,
         set_variable_template=set_variable_template,
@@ -812,20 +1526,208 @@ def make_fast_getset_item(
 
 
 def make_fast_eq(fields):
-    code_template = env.get_template("fast_eq.jinja").render(fields=fields)
+    code_template = render_template("fast_eq.jinja", fields=tuple(fields))
     return code_template
 
 
 def make_fast_iter(fields, **kwargs):
-    code_template = env.get_template("fast_iter.jinja").render(fields=fields, **kwargs)
+    code_template = render_template("fast_iter.jinja", fields=tuple(fields), **kwargs)
     return code_template
 
 
 def make_set_get_states(fields, **kwargs):
-    code_template = env.get_template("raw_get_set_state.jinja").render(fields=fields, **kwargs)
+    code_template = render_template("raw_get_set_state.jinja", fields=tuple(fields), **kwargs)
+    return code_template
+
+
+def annotate_generated_methods(
+    functions: Mapping[str, FunctionType],
+    slots: Mapping[str, TypeHint],
+    field_names: tuple[str, ...],
+    has_iter_fields: bool,
+    hint_namespace: Mapping[str, Any],
+) -> None:
+    """
+    Fill in the annotations of the generated ``__getitem__``, ``__setitem__``,
+    ``__iter__``, ``__getstate__`` and ``__setstate__`` from the field hints.
+    """
+    values_hint = ""
+    maybe_values_hint = ""
+    keys_hint = ""
+    iter_hint = ""
+    set_values_hint = ""
+    if slots:
+        values_hint = _make_union(*slots.values(), globals=hint_namespace, locals={})
+        maybe_values_hint = _make_union(
+            *(tuple(slots.values()) + (None,)), globals=hint_namespace, locals={}
+        )
+        set_values_hint = _make_union(
+            *(tuple(slots.values()) + (typing.Any,)), globals=hint_namespace, locals={}
+        )
+    if field_names:
+        keys_hint = _make_union(Literal[*field_names], globals=hint_namespace, locals={})
+        if not is_typing_definition(keys_hint):
+            keys_hint = f"{keys_hint.__name__}"
+    if has_iter_fields and keys_hint and values_hint:
+        iter_hint = _make_tuple(keys_hint, values_hint, globals=hint_namespace, locals={})
+    if values_hint:
+        functions["__getitem__"].__annotations__["return"] = values_hint
+    if keys_hint:
+        functions["__getitem__"].__annotations__["key"] = keys_hint
+    if set_values_hint:
+        functions["__setitem__"].__annotations__["key"] = set_values_hint
+    functions["__iter__"].__annotations__["return"] = iter_hint
+    functions["__getstate__"].__annotations__["return"] = dict[str, maybe_values_hint]  # type:ignore
+    functions["__setstate__"].__annotations__["state"] = dict[str, maybe_values_hint]  # type:ignore
+
+
+def make_trusted_construct(fields, setter_variable_template: str, class_name: str, listeners):
+    code_template = render_template(
+        "trusted_construct.jinja",
+        fields=tuple(fields),
+        setter_variable_template=setter_variable_template,
+        class_name=class_name,
+        listeners=tuple(listeners.items()),
+    )
     return code_template
 
 
+def listeners_in_effect(cls: type, field: str) -> tuple[Callable, ...]:
+    """
+    Return the listener functions bound into the property for ``field`` on ``cls``.
+
+    Listeners belong to the class that (re)defines the field, so walk the MRO
+    until we find it.
+    """
+    for base in cls.__mro__:
+        if field in vars(base):
+            listener_funcs = vars(base).get("_listener_funcs")
+            if listener_funcs is None:
+                return ()
+            return tuple(listener_funcs.value.get(field, ()))
+    return ()
+
+
+def _first_definition(cls: type, name: str) -> Any:
+    for base in cls.__mro__:
+        if name in vars(base):
+            return vars(base)[name]
+    return None
+
+
+def _late_bound_listener(name: str) -> Callable[..., Any]:
+    def listener(self, *args):
+        return getattr(self, name)(*args)
+
+    return listener
+
+
+def overridden_listeners(cls: type, field: str) -> dict[str, Callable[..., Any]]:
+    """
+    Return the listeners bound into the setter of ``field`` (as generated by the
+    class that defines it) which ``cls`` overrides by name, resolved to what
+    ``self.<name>`` would call.
+    """
+    owner = None
+    for base in cls.__mro__:
+        if field in vars(base):
+            owner = base
+            break
+    if owner is None or owner is cls:
+        return {}
+    overrides = {}
+    for func in listeners_in_effect(cls, field):
+        name = func.__name__
+        value = _first_definition(cls, name)
+        if value is _first_definition(owner, name):
+            continue
+        if not isinstance(value, FunctionType):
+            value = _late_bound_listener(name)
+        overrides[name] = value
+    return overrides
+
+
+def rebind_listeners(
+    function: Callable[..., Any] | None, listeners: Mapping[str, Callable[..., Any]]
+) -> Callable[..., Any] | None:
+    """
+    Return a generated setter with the listeners it binds as ``_on_<name>``
+    replaced by ``listeners``.
+    """
+    if function is None or function.__closure__ is None:
+        return function
+    code = function.__code__
+    closure = list(function.__closure__)
+    changed = False
+    for name, listener in listeners.items():
+        try:
+            index = code.co_freevars.index(f"_on_{name}")
+        except ValueError:
+            continue
+        cell = make_class_cell()
+        cell.cell_contents = listener
+        closure[index] = cell
+        changed = True
+    if not changed:
+        return function
+    new_function = FunctionType(
+        code, function.__globals__, function.__name__, function.__defaults__, tuple(closure)
+    )
+    new_function.__kwdefaults__ = function.__kwdefaults__
+    new_function.__annotations__ = function.__annotations__
+    return new_function
+
+
+def _with_listeners(
+    prop: property | ClassOrInstanceFuncsDataDescriptor, listeners: Mapping[str, Callable]
+) -> property | ClassOrInstanceFuncsDataDescriptor:
+    if isinstance(prop, property):
+        return property(prop.fget, rebind_listeners(prop.fset, listeners), prop.fdel)
+    return ClassOrInstanceFuncsDataDescriptor(
+        prop._class_attribute,
+        prop._instance_attribute,
+        instance_setter=rebind_listeners(prop._instance_setter_function, listeners),
+        instance_deleter=prop._instance_deleter_function,
+        class_setter=prop._class_setter_function,
+        class_deleter=prop._class_deleter_function,
+    )
+
+
+def rebind_inherited_listeners(cls: type[Atomic], fields: Iterable[str]) -> None:
+    """
+    Listeners are bound into the setter of the class that defines a field. Give
+    ``cls`` its own copy of the properties for inherited ``fields`` whose
+    listeners it overrides by name.
+
+    The ``_listener_funcs`` and ``_unchecked_properties`` of ``cls`` are replaced
+    with updated copies rather than changed in place.
+    """
+    listener_funcs = {}
+    unchecked_properties = {}
+    for field in fields:
+        overrides = overridden_listeners(cls, field)
+        if not overrides:
+            continue
+        listener_funcs[field] = listeners_in_effect(cls, field)
+        build_unchecked = unchecked_property_for(cls, field)
+        prop = _with_listeners(inspect.getattr_static(cls, field), overrides)
+        setattr(cls, field, prop)
+        if hasattr(prop, "__set_name__"):
+            prop.__set_name__(cls, field)
+        if build_unchecked is not None:
+            unchecked_properties[field] = functools.partial(
+                _build_then, build_unchecked, _with_listeners, overrides
+            )
+    if listener_funcs:
+        cls._listener_funcs = ImmutableMapping[str, Iterable[Callable]](
+            {**vars(cls)["_listener_funcs"].value, **listener_funcs}
+        )
+    if unchecked_properties:
+        cls._unchecked_properties = ImmutableMapping[str, UncheckedPropertyBuilder](
+            {**vars(cls)["_unchecked_properties"].value, **unchecked_properties}
+        )
+
+
 DEFAULTS_FRAGMENT = """
 def _set_defaults(self):
     result = self
@@ -854,8 +1756,8 @@ _set_defaults = make_defaults()
 
 
 def make_defaults(fields: tuple[str, ...], defaults_var_template: str):
-    defaults_var_template = env.from_string(defaults_var_template).render(fields=fields)
-    code = env.from_string(DEFAULTS_FRAGMENT).render(item=defaults_var_template)
+    defaults_var_template = render_string(defaults_var_template, fields=tuple(fields))
+    code = render_string(DEFAULTS_FRAGMENT, item=defaults_var_template)
     return code
 
 
@@ -939,12 +1841,26 @@ def replace_class_references(
     """
     Given a vector of (generic_class, specialized_class), replace any LOAD_GLOBAL or __closure__
     references to generic_class with specialized_class.
+
+    The rewritten function is cached per (func, references) so that deriving the same
+    subtracted classes again reuses it.
     """
     if func is None:
         return None
     if not references:
         return func
+    try:
+        hash(func)
+    except TypeError:
+        return _replace_class_references(func, references, return_classmethod)
+    return _cached_replace_class_references(func, references, return_classmethod)
+
 
+def _replace_class_references(
+    func: Callable[[Any], T] | ClassMethod[T],
+    references: tuple[tuple[type, type], ...],
+    return_classmethod: bool,
+):
     function: Callable[[Any], T]
 
     dest_func_name = func.__name__
@@ -1088,6 +2004,11 @@ def replace_class_references(
     return new_function
 
 
+# rewriting the bytecode and closures is costly, and the same (function, mutant classes)
+# pairs recur whenever a nested subtraction is rebuilt or combined with other skips
+_cached_replace_class_references = functools.lru_cache(maxsize=1024)(_replace_class_references)
+
+
 def ispy311(cls: type[CodeType]) -> TypeGuard[Py311Code]:
     return hasattr(cls, "co_qualname") and hasattr(cls, "co_exceptiontable")
 
@@ -1105,6 +2026,17 @@ class Py311Code(Protocol):
     co_exceptiontable: bytes
 
 
+@functools.lru_cache(maxsize=4096)
+def _cached_replace_freevars(code: CodeType, filename: str, freevars: tuple[str, ...]) -> CodeType:
+    # Equal code objects (i.e. from identical generated source) map to one result.
+    # Code objects compare equal regardless of ``co_filename``, hence keying on it.
+    return code.replace(co_freevars=freevars)
+
+
+def _replace_freevars(code: CodeType, freevars: tuple[str, ...]) -> CodeType:
+    return _cached_replace_freevars(code, code.co_filename, freevars)
+
+
 def insert_class_closure(
     klass: type[BaseAtomic], function: Callable[..., Any] | None
 ) -> Callable[..., Any] | None:
@@ -1134,10 +2066,12 @@ def insert_class_closure(
 
     # Insert the class cell into the closure references:
     if "__class__" not in code.co_freevars:
-        if sys.version_info >= (3, 12):
-            if any(tainted in target for target in (code.co_names,) for tainted in ("super",)):
-                raise SyntaxError(f"restructure {function} to be in a closure!")
+        if "super" not in code.co_names:
+            # nothing reads ``__class__``, and appending a free variable the
+            # bytecode does not know of crashes ``frame.f_locals`` on 3.11
             return function
+        if sys.version_info >= (3, 12):
+            raise SyntaxError(f"restructure {function} to be in a closure!")
         closure_var_names.append("__class__")
         current_closure.append(class_cell)
     else:
@@ -1145,10 +2079,12 @@ def insert_class_closure(
         current_closure[index] = class_cell
 
     # recreate the function using its guts
-    if hasattr(code, "replace"):
-        code = code.replace(
-            co_freevars=tuple(closure_var_names),
-        )
+    if tuple(closure_var_names) == code.co_freevars:
+        # Only the cell contents changed, so keep sharing the code object
+        # with any other class compiled from the same source.
+        pass
+    elif hasattr(code, "replace"):
+        code = _replace_freevars(code, tuple(closure_var_names))
     else:
         args: tuple[Any, ...] = (
             code.co_argcount,
@@ -1191,10 +2127,64 @@ def insert_class_closure(
     return new_function
 
 
+def _with_class_closure(
+    prop: property | ClassOrInstanceFuncsDataDescriptor, klass: type[BaseAtomic]
+) -> property | ClassOrInstanceFuncsDataDescriptor:
+    if not isinstance(prop, property):
+        return prop
+    return property(
+        insert_class_closure(klass, prop.fget),
+        insert_class_closure(klass, prop.fset),
+        insert_class_closure(klass, prop.fdel),
+    )
+
+
 def explode(*args, **kwargs):
     raise TypeError("This shouldn't happen!")
 
 
+def _import_module(module_name: str) -> types.ModuleType:
+    try:
+        return sys.modules[module_name]
+    except KeyError:
+        return import_module(module_name)
+
+
+# class -> namespaces of the modules of its MRO that its hints may refer to
+_module_namespaces: weakref.WeakKeyDictionary[type, tuple[Mapping[str, Any], ...]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def module_namespaces(cls: type) -> tuple[Mapping[str, Any], ...]:
+    """
+    Return the (live) namespaces of the modules that define ``cls`` and its
+    bases, in MRO order. Memoized per class.
+    """
+    try:
+        return _module_namespaces[cls]
+    except KeyError:
+        pass
+    namespaces = []
+    seen_modules = set()
+    for b in cls.__mro__:
+        module_name = b.__module__
+        if module_name in ("builtins", "instruct") or module_name in seen_modules:
+            continue
+        seen_modules.add(module_name)
+        namespaces.append(vars(_import_module(module_name)))
+    result = _module_namespaces[cls] = tuple(namespaces)
+    return result
+
+
+def _dedupe_by_id(iterable):
+    seen = set()
+    for item in iterable:
+        if id(item) not in seen:
+            seen.add(id(item))
+            yield item
+
+
 def _dedupe(iterable):
     seen = set()
     for item in iterable:
@@ -1222,7 +2212,10 @@ def gather_listeners(class_name, attrs, class_columns, combined_class_columns, i
     for key, value in attrs.items():
         if callable(value):
             if hasattr(value, "_event_listener_funcs"):
-                for field in value._event_listener_funcs:
+                fields = value._event_listener_funcs
+                if not fields and getattr(value, "_event_listener_grouped", False):
+                    fields = tuple(class_columns)
+                for field in fields:
                     if field not in class_columns and field in inherited_listeners:
                         lost_listeners.append(field)
                         continue
@@ -1288,34 +2281,45 @@ def is_debug_mode(mode=None, class_name=None, field=None) -> bool:
     return False
 
 
-def create_proxy_property(
-    env: Environment,
-    class_name: str,
-    key: str,
-    value: type | tuple[type, ...] | dict[str, type] | TypeHint,
-    isinstance_compatible_coerce_type: tuple[type, ...] | type | None,
-    coerce_func: Callable | None,
-    derived_type: type | None,
-    listener_funcs: tuple[Callable, ...] | None,
-    coerce_failure_funcs: tuple[Callable, ...] | None,
-    local_getter_var_template: str,
-    local_setter_var_template: str,
-    *,
-    fast: bool,
-) -> tuple[property | ClassOrInstanceFuncsDataDescriptor, type | tuple[type, ...]]:
-    ns_globals = {"NoneType": NoneType, "Flags": Flags, "typing": typing}
-    setter_template = env.get_template("setter.jinja")
-    getter_template = env.get_template("getter.jinja")
+def is_instrumented(class_name: str) -> bool:
+    """
+    Whether ``INSTRUCT_STATS`` asks for every class, or ``class_name`` in its
+    comma separated list, to be instrumented.
+    """
+    setting = os.environ.get("INSTRUCT_STATS", "")
+    if setting.lower() in AFFIRMATIVE:
+        return True
+    return class_name in (name.strip() for name in setting.split(","))
 
-    ns = {"make_getter": explode, "make_setter": explode}
-    getter_code = getter_template.render(
-        field_name=key, get_variable_template=local_getter_var_template
-    )
+
+class ListenerNames(NamedTuple):
+    """
+    Event listener function names for a field, bucketed by how they are called:
+
+    on_sets: ``listener(old, new)``
+    on_sets_0: ``listener()``
+    on_sets_1: ``listener(new)``
+    on_sets_3: ``listener(field_name, old, new)``
+    grouped: ``listener(**{field_name: new, ...})``
+    """
+
+    on_sets: tuple[str, ...]
+    on_sets_0: tuple[str, ...]
+    on_sets_1: tuple[str, ...]
+    on_sets_3: tuple[str, ...]
+    grouped: tuple[str, ...] = ()
+
+
+def classify_listeners(listener_funcs: Iterable[Callable] | None) -> ListenerNames:
     pending_on_sets = []
     pending_on_sets_0 = []
     pending_on_sets_1 = []
     pending_on_sets_3 = []
+    pending_grouped = []
     for func in listener_funcs or ():
+        if getattr(func, "_event_listener_grouped", False):
+            pending_grouped.append(func.__name__)
+            continue
         func_signature = inspect.signature(func)
         func_params = func_signature.parameters.copy()
         if "self" in func_params:
@@ -1328,17 +2332,88 @@ def create_proxy_property(
             pending_on_sets_3.append(func.__name__)
         else:
             pending_on_sets.append(func.__name__)
-    setter_code = setter_template.render(
+    return ListenerNames(
+        tuple(pending_on_sets),
+        tuple(pending_on_sets_0),
+        tuple(pending_on_sets_1),
+        tuple(pending_on_sets_3),
+        tuple(pending_grouped),
+    )
+
+
+def create_proxy_property(
+    env: Environment,
+    class_name: str,
+    key: str,
+    value: type | tuple[type, ...] | dict[str, type] | TypeHint,
+    isinstance_compatible_coerce_type: tuple[type, ...] | type | None,
+    coerce_func: Callable | None,
+    derived_type: type | None,
+    listener_funcs: tuple[Callable, ...] | None,
+    coerce_failure_funcs: tuple[Callable, ...] | None,
+    local_getter_var_template: str,
+    local_setter_var_template: str,
+    *,
+    fast: bool,
+    instrumented: bool = False,
+    owner: str | None = None,
+    sources: list[str] | None = None,
+) -> tuple[
+    property | ClassOrInstanceFuncsDataDescriptor,
+    UncheckedPropertyBuilder,
+    type | tuple[type, ...],
+]:
+    """
+    Returns the property for ``key``, a function building its unchecked variant
+    (only called by ``Cls.unchecked()``) and the ``isinstance``-compatible types
+    for it.
+    """
+    ns_globals = {
+        "NoneType": NoneType,
+        "Flags": Flags,
+        "typing": typing,
+        "_batches": _pending_batches,
+        "_describe_expected_types": describe_expected_types,
+        "_stats_for": instrumentation.stats_for,
+        "_perf_counter": instrumentation._perf_counter,
+    }
+    ns = {"make_getter": explode, "make_setter": explode}
+    getter_code = render_template(
+        "getter.jinja", field_name=key, get_variable_template=local_getter_var_template
+    )
+    on_sets, on_sets_0, on_sets_1, on_sets_3, grouped = classify_listeners(listener_funcs)
+    bound_listeners = {func.__name__: func for func in listener_funcs or ()}
+    # listeners wanting the previous value read it straight from the slot when
+    # the getter is a plain ``return <expression>``
+    old_value_expression = "self.%(key)s"
+    getter_body = local_getter_var_template.strip()
+    if "\n" not in getter_body and getter_body.startswith("return "):
+        old_value_expression = getter_body[len("return ") :]
+    # Pick the narrowest setter body that can handle a value of the wrong type:
+    #   - scalar: reject it
+    #   - coerce: try the ``__coerce__`` function, then reject it
+    #   - derived: upgrade a dict into the nested Atomic (then coerce), then reject it
+    setter_kind = "scalar"
+    if derived_type is not None:
+        setter_kind = "derived"
+    elif isinstance_compatible_coerce_type is not None:
+        setter_kind = "coerce"
+    setter_code = render_template(
+        "setter.jinja",
         field_name=key,
         setter_variable_template=local_setter_var_template,
-        on_sets=tuple(pending_on_sets),
-        on_sets_1=tuple(pending_on_sets_1),
-        on_sets_0=tuple(pending_on_sets_0),
-        on_sets_3=tuple(pending_on_sets_3),
+        on_sets=on_sets,
+        on_sets_1=on_sets_1,
+        on_sets_0=on_sets_0,
+        on_sets_3=on_sets_3,
+        grouped=grouped,
         post_coerce_failure_handlers=coerce_failure_funcs,
         has_coercion=isinstance_compatible_coerce_type is not None,
+        setter_kind=setter_kind,
+        old_value_expression=old_value_expression,
+        instrumented=instrumented,
     )
-    filename = "<getter-setter>"
+    filename = None
     if is_debug_mode("codegen", class_name, key):
         with tempfile.NamedTemporaryFile(
             delete=False, mode="w", prefix=f"{class_name}-{key}", suffix=".py", encoding="utf8"
@@ -1349,7 +2424,13 @@ def create_proxy_property(
             filename = fh.name
             logger.debug(f"{class_name}.{key} at {filename}")
 
-    code = compile(f"{getter_code}\n{setter_code}", filename, mode="exec")
+    code = compile_generated(
+        f"{getter_code}\n{setter_code}",
+        "property",
+        owner=None if owner is None else f"{owner}.{key}",
+        filename=filename,
+        sources=sources,
+    )
     exec(code, ns_globals, ns)
 
     isinstance_compatible_types = parse_typedef(value)
@@ -1361,6 +2442,7 @@ def create_proxy_property(
         isinstance_compatible_types,
         isinstance_compatible_coerce_type,
         coerce_func,
+        bound_listeners,
     )
     new_property: ClassOrInstanceFuncsDescriptor | property
     if derived_type is not None:
@@ -1372,7 +2454,27 @@ def create_proxy_property(
     else:
         new_property = property(getter_func, setter_func)
 
-    return new_property, isinstance_compatible_types
+    def make_unchecked_property() -> property | ClassOrInstanceFuncsDataDescriptor:
+        # the same code as ``setter_func``, only closed over ``unchecked=True``
+        unchecked_setter_func = ns["make_setter"](
+            value,
+            fast,
+            derived_type,
+            isinstance_compatible_types,
+            isinstance_compatible_coerce_type,
+            coerce_func,
+            bound_listeners,
+            unchecked=True,
+        )
+        if derived_type is not None:
+            return ClassOrInstanceFuncsDataDescriptor(
+                functools.partial(_derived_type_for, derived_type=derived_type),
+                getter_func,
+                instance_setter=unchecked_setter_func,
+            )
+        return property(getter_func, unchecked_setter_func)
+
+    return new_property, make_unchecked_property, isinstance_compatible_types
 
 
 def _derived_type_for(cls, *, derived_type):
@@ -1383,6 +2485,48 @@ EMPTY_FROZEN_SET: frozenset[Any] = frozenset()
 EMPTY_MAPPING: FrozenMapping[Any, Any] = FrozenMapping({})
 
 
+# Unchecked properties are only needed by ``Cls.unchecked()``, so classes keep
+# the functions that build them
+UncheckedPropertyBuilder = Callable[[], Union[property, ClassOrInstanceFuncsDataDescriptor]]
+
+
+def _build_then(
+    build: UncheckedPropertyBuilder,
+    apply: Callable[..., property | ClassOrInstanceFuncsDataDescriptor],
+    *args: Any,
+) -> property | ClassOrInstanceFuncsDataDescriptor:
+    return apply(build(), *args)
+
+
+def _with_accessors(
+    prop: property | ClassOrInstanceFuncsDataDescriptor, overridden: property
+) -> property | ClassOrInstanceFuncsDataDescriptor:
+    """
+    Replace the accessors of ``prop`` with those the class body defined itself.
+    """
+    if overridden.fget is not None:
+        prop = prop.getter(overridden.fget)
+    if overridden.fset is not None:
+        prop = prop.setter(overridden.fset)
+    if overridden.fdel is not None:
+        prop = prop.deleter(overridden.fdel)
+    return prop
+
+
+def unchecked_property_for(cls: type, field: str) -> UncheckedPropertyBuilder | None:
+    """
+    Return the function building the unchecked variant of the property for
+    ``field``, as generated by the class that (re)defines it, if any.
+    """
+    for base in cls.__mro__:
+        if field in vars(base):
+            unchecked_properties = vars(base).get("_unchecked_properties")
+            if unchecked_properties is None:
+                return None
+            return unchecked_properties.value.get(field)
+    return None
+
+
 def __no_op_skip_get__(self):
     return
 
@@ -1617,22 +2761,45 @@ def list_callables(cls):
         yield key, value
 
 
-def find_users_of(mutant_class_parent_names, in_cls):
-    ignore_functions = frozenset()
-    for parent_cls in in_cls.__bases__:
-        ignore_functions |= frozenset(
-            value
-            for key, value in list_callables(parent_cls)
-            if not (key.startswith("__") and key.endswith("__"))
-        )
-    functions_to_scan = (
-        (key, value) for key, value in list_callables(in_cls) if not key.startswith("__")
+# class -> (every name loaded by its callables, ((callable name, names it loads), ...))
+_external_names: weakref.WeakKeyDictionary[
+    type, tuple[frozenset[str], tuple[tuple[str, frozenset[str]], ...]]
+] = weakref.WeakKeyDictionary()
+
+
+def _external_names_of(
+    in_cls: type,
+) -> tuple[frozenset[str], tuple[tuple[str, frozenset[str]], ...]]:
+    try:
+        return _external_names[in_cls]
+    except KeyError:
+        pass
+    # walking a lazy class's attributes would materialize it halfway through
+    finalize(in_cls)
+    users = []
+    for key, value in list_callables(in_cls):
+        if key.startswith("__"):
+            continue
+        code = getattr(value, "__code__", None)
+        if code is None:
+            continue
+        users.append((key, frozenset(code.co_names) | frozenset(code.co_freevars)))
+    result = _external_names[in_cls] = (
+        frozenset().union(*(names for _, names in users)),
+        tuple(users),
     )
-    for key, value in functions_to_scan:
-        external_names = frozenset(value.__code__.co_names) | frozenset(value.__code__.co_freevars)
+    return result
+
+
+def find_users_of(mutant_class_parent_names, in_cls):
+    all_names, users = _external_names_of(in_cls)
+    # nothing on the class can refer to a mutated class by name
+    if all_names.isdisjoint(mutant_class_parent_names):
+        return
+    for key, external_names in users:
         matches = external_names & mutant_class_parent_names
         if matches:
-            yield (key, value), matches
+            yield (key, getattr(in_cls, key)), matches
 
 
 def is_defined_coerce(cls, key):
@@ -1663,13 +2830,98 @@ _data_classes: weakref.WeakSet[type[Atomic]] = weakref.WeakSet()
 DERIVED_BAD_CHARS = re.compile(r"[^\w\d]+")
 
 
+class SubtractionCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+
+# (public class, operator, fields) -> derived class. Keyed on the class itself as
+# same named classes may live in different modules. Entries are held strongly and
+# the least recently used are dropped past ``maxsize``. Fields given as strings or
+# a FrozenMapping are also entries as given so a hit skips normalizing them.
+_subtracted: OrderedDict[tuple[type[Atomic], str, Hashable], type[Atomic]] = OrderedDict()
+_subtraction_cache_stats = {"hits": 0, "misses": 0, "maxsize": 1024}
+_subtraction_lock = threading.Lock()
+
+
+def subtraction_cache_info() -> SubtractionCacheInfo:
+    """
+    Report the hits/misses of ``Cls - fields`` and ``Cls & fields``, the number of
+    cached entries and the most that are kept.
+    """
+    return SubtractionCacheInfo(
+        _subtraction_cache_stats["hits"],
+        _subtraction_cache_stats["misses"],
+        len(_subtracted),
+        _subtraction_cache_stats["maxsize"],
+    )
+
+
+def clear_subtraction_cache(*, maxsize: int | None = None) -> None:
+    """
+    Forget all derived classes and reset the statistics.
+
+    ``maxsize`` sets how many entries are kept (``0`` disables the cache).
+    """
+    if maxsize is not None and maxsize < 0:
+        raise ValueError(f"maxsize must be >= 0, not {maxsize!r}")
+    with _subtraction_lock:
+        _subtracted.clear()
+        _subtraction_cache_stats["hits"] = _subtraction_cache_stats["misses"] = 0
+        if maxsize is not None:
+            _subtraction_cache_stats["maxsize"] = maxsize
+
+
+def _subtraction_probe_key(fields: Any) -> Hashable | None:
+    """
+    Return a key for ``fields`` as passed to ``-``/``&`` if it can be made without
+    normalizing them.
+    """
+    if isinstance(fields, str):
+        return frozenset((fields,))
+    if isinstance(fields, FrozenMapping):
+        return fields
+    if isinstance(fields, (frozenset, set, tuple, list)) and all(
+        isinstance(field, str) for field in fields
+    ):
+        return frozenset(fields)
+    return None
+
+
+def _cached_subtraction(key: tuple[type[Atomic], str, Hashable]) -> type[Atomic] | None:
+    try:
+        value = _subtracted[key]
+    except KeyError:
+        return None
+    with suppress(KeyError):
+        _subtracted.move_to_end(key)
+    _subtraction_cache_stats["hits"] += 1
+    return value
+
+
+def _cache_subtraction(
+    value: type[Atomic], *keys: tuple[type[Atomic], str, Hashable | None]
+) -> None:
+    maxsize = _subtraction_cache_stats["maxsize"]
+    if not maxsize:
+        return
+    with _subtraction_lock:
+        for key in keys:
+            if key[-1] is None:
+                continue
+            _subtracted[key] = value
+            _subtracted.move_to_end(key)
+        while len(_subtracted) > maxsize:
+            _subtracted.popitem(last=False)
+
+
 class AtomicMeta(AbstractAtomic, type):
     __slots__ = ()
-    REGISTRY = ImmutableCollection[Set[type[BaseAtomic]]](set())
+    REGISTRY = ImmutableCollection[Set[type[BaseAtomic]]](weakref.WeakSet())
     MIXINS = ImmutableMapping[str, BaseAtomic]({})
-    SKIPPED_FIELDS: Mapping[tuple[str, FrozenMapping[str, None]], type[Atomic]] = (
-        WeakValueDictionary()
-    )
+    SKIPPED_FIELDS: Mapping[tuple[type[Atomic], str, Hashable], type[Atomic]] = _subtracted
 
     def __public_class__(self):
         """
@@ -1706,6 +2958,15 @@ class AtomicMeta(AbstractAtomic, type):
     ) -> type[Atomic]:
         assert isinstance(include, (list, frozenset, set, tuple, dict, str, FrozenMapping))
         cls: type[Atomic] = cast(type[Atomic], self)
+        probe_key = (
+            public_class(cls, preserve_subtraction=True),
+            "&",
+            _subtraction_probe_key(include),
+        )
+        if probe_key[-1] is not None:
+            value = _cached_subtraction(probe_key)
+            if value is not None:
+                return value
         include_fields: FrozenMapping = flatten_fields.collect(include)
         include_fields -= cls._skipped_fields
         if not include_fields:
@@ -1713,18 +2974,30 @@ class AtomicMeta(AbstractAtomic, type):
         skip_fields = (
             FrozenMapping(show_all_fields(cls, deep_traverse_on=include_fields)) - include_fields
         )
-        return cast(type[Atomic], self - skip_fields)
+        new_cls = cast(type[Atomic], self - skip_fields)
+        _cache_subtraction(new_cls, probe_key)
+        return new_cls
 
     def __sub__(self: AbstractAtomic, skip: Mapping[str, Any] | Iterable[Any]) -> type[Atomic]:
         assert isinstance(skip, (list, frozenset, set, tuple, dict, str, FrozenMapping))
-        debug_mode = is_debug_mode("skip")
-
-        root_class: type[AtomicMeta] = cast(type[AtomicMeta], type(self))
         cls: type[Atomic] = public_class(cast(Atomic, self))
 
         if not skip:
             return cls
 
+        # derived classes share their root's public class, so probe on their own
+        probe_key = (
+            public_class(cast(Atomic, self), preserve_subtraction=True),
+            "-",
+            _subtraction_probe_key(skip),
+        )
+        if probe_key[-1] is not None:
+            value = _cached_subtraction(probe_key)
+            if value is not None:
+                return value
+
+        debug_mode = is_debug_mode("skip")
+
         if isinstance(skip, str):
             skip = frozenset((skip,))
 
@@ -1734,18 +3007,16 @@ class AtomicMeta(AbstractAtomic, type):
 
         currently_skipped_fields: FrozenMapping[str, None] = FrozenMapping(self._skipped_fields)
         effective_skipped_fields: FrozenMapping = skip_fields | currently_skipped_fields
-        # print(self, effective_skipped_fields, tuple(root_class.SKIPPED_FIELDS.keys()))
         if not effective_skipped_fields:
             return cls
 
-        try:
-            value = root_class.SKIPPED_FIELDS[(cls.__qualname__, effective_skipped_fields)]
-        except KeyError:
-            # print(f"Cache miss for {self.__qualname__}")
-            pass
-        else:
-            # print(f"Cache hit for {self.__qualname__}")
+        cache_key = (cls, "-", effective_skipped_fields)
+        value = _cached_subtraction(cache_key)
+        if value is not None:
+            _cache_subtraction(value, probe_key)
             return value
+        _subtraction_cache_stats["misses"] += 1
+        finalize(cls)
         skip_fields = effective_skipped_fields
 
         skip_entire_keys = set()
@@ -1813,6 +3084,7 @@ class AtomicMeta(AbstractAtomic, type):
                 changes, "And".join(sorted(key.capitalize() for key in redefinitions))
             )
         if not changes:
+            _cache_subtraction(cls, cache_key, probe_key)
             return cls
         new_cls_name = f"{cls.__name__}{changes}"
         attrs = {
@@ -1821,10 +3093,7 @@ class AtomicMeta(AbstractAtomic, type):
             "__qualname__": ".".join((cls.__qualname__, new_cls_name)),
         }
         new_cls: type[Atomic] = type(new_cls_name, (cls,), attrs, skip_fields=skip_attrs)
-        cache = cast(
-            MutableMapping[Tuple[str, SkippedFieldMapping], type[Atomic]], root_class.SKIPPED_FIELDS
-        )
-        cache[(cls.__qualname__, effective_skipped_fields)] = new_cls
+        _cache_subtraction(new_cls, cache_key, probe_key)
         return new_cls
 
     def __new__(
@@ -1834,6 +3103,11 @@ class AtomicMeta(AbstractAtomic, type):
         attrs: dict[str, Any],
         *,
         fast: bool | None = None,
+        lazy: bool | None = None,
+        # defers only the Union/Literal annotations of the generated methods;
+        # field hints are resolved at class creation as the setters need them
+        lazy_method_annotations: bool | None = None,
+        instrumented: bool | None = None,
         # metadata:
         skip_fields: FrozenMapping = FrozenMapping(),
         include_fields: FrozenMapping = FrozenMapping(),
@@ -1859,12 +3133,16 @@ class AtomicMeta(AbstractAtomic, type):
             _data_classes.add(concrete)
             return concrete
 
+        # inheriting walks the generated attributes of lazy bases
+        for base in bases:
+            if isinstance(base, AtomicMeta) and base._configuration.get("lazy"):
+                finalize(base)
+
         # support for reconstructing the type hints!
         maybe_calling_frame = None
         calling_frame = None
         calling_locals: Mapping[str, Any] = {}
-        calling_globals: Mapping[str, Any]
-        provisional_globals: ChainMap[str, Any] = ChainMap()
+        namespaces: list[Mapping[str, Any]] = []
 
         try:
             calling_frame = inspect.currentframe()
@@ -1884,20 +3162,21 @@ class AtomicMeta(AbstractAtomic, type):
                 ):
                     pass
                 else:
-                    provisional_globals.maps.append(calling_frame.f_globals)
+                    namespaces.append(calling_frame.f_globals)
         finally:
             # ARJ: avoid leaking frames
             del calling_frame, maybe_calling_frame
 
         if "__module__" in attrs:
-            defining_module = import_module(attrs["__module__"])
-            provisional_globals.maps.append(vars(defining_module))
+            namespaces.append(vars(_import_module(attrs["__module__"])))
 
         for base in bases[::-1]:
-            for b in base.mro():
-                if b.__module__ not in ("builtins", "instruct"):
-                    provisional_globals.maps.append(vars(import_module(b.__module__)))
-        calling_globals = provisional_globals
+            namespaces.extend(module_namespaces(base))
+        # Names are looked up in the module namespaces first, then the
+        # calling frame's locals. Nothing is flattened or copied; resolving a
+        # hint only writes into the throwaway ``locals={}`` passed alongside.
+        hint_namespace = ChainMap(*_dedupe_by_id(namespaces), calling_locals)
+        del namespaces
 
         # ARJ: Used to create an "anchor"-base type that just marks
         # that this is now an "Atomic"-type (b/c there aren't good ways to express all
@@ -1958,8 +3237,8 @@ class AtomicMeta(AbstractAtomic, type):
         if missing_slots and support_cls_attrs["__annotations__"]:
             hints = _resolve_hint(
                 {**support_cls_attrs["__annotations__"]},
-                locals=calling_locals,
-                globals=calling_globals,
+                locals={},
+                globals=hint_namespace,
             )
             support_cls_attrs["__slots__"] = hints
             support_cls_attrs["__annotations__"] = hints
@@ -2010,6 +3289,28 @@ class AtomicMeta(AbstractAtomic, type):
             fast = support_cls_attrs.pop("fast")
         if fast is None:
             fast = not __debug__
+        if lazy is None:
+            lazy = os.environ.get("INSTRUCT_LAZY", "").lower() in AFFIRMATIVE
+        if lazy_method_annotations is None:
+            lazy_method_annotations = (
+                os.environ.get("INSTRUCT_LAZY_METHOD_ANNOTATIONS", "").lower() in AFFIRMATIVE
+            )
+        if instrumented is None:
+            instrumented = is_instrumented(class_name) or any(
+                isinstance(base, AtomicMeta) and base._configuration.get("instrumented")
+                for base in bases
+            )
+        # generated code of instrumented classes is named after the class, so
+        # tracebacks and profilers attribute it per class (and field); other
+        # classes share the code (and name) of identical source
+        owner = None
+        if instrumented:
+            qualname = support_cls_attrs.get("__qualname__", class_name)
+            owner = f"{support_cls_attrs.get('__module__', '')}.{qualname}"
+        # linecache entries this class holds, released once it is collected
+        generated_sources: list[str] = []
+        # work that ``finalize(cls)`` (or the first instantiation) will run
+        pending_finalize: list[Callable[[], Any]] = []
 
         combined_slots: dict[str, TypeHint]
         nested_atomic_collections: dict[str, type[Atomic] | tuple[type[Atomic], ...]]
@@ -2189,8 +3490,8 @@ class AtomicMeta(AbstractAtomic, type):
 
             typehint = _resolve_hint(
                 maybe_typehint,
-                globals=dict(calling_globals),
-                locals=dict(calling_locals),
+                globals=hint_namespace,
+                locals={},
             )
             support_cls_attrs["__annotations__"][key] = typehint
             del typehint_or_anonymous_struct_decl
@@ -2280,10 +3581,13 @@ class AtomicMeta(AbstractAtomic, type):
                 local_getter_var_template = getter_var_template.format(key="{{field_name}}")
                 del setter_var_template
                 del getter_var_template
+            # the unwrapped setter is used by paths that write trusted values directly
+            raw_setter_var_template = local_setter_var_template.replace("{{field_name}}", "%(key)s")
             for index, template_name in enumerate(setter_wrapper):
-                template = env.get_template(template_name)
-                local_setter_var_template = template.render(
-                    field_name="{{field_name}}", setter_variable_template=local_setter_var_template
+                local_setter_var_template = render_template(
+                    template_name,
+                    field_name="{{field_name}}",
+                    setter_variable_template=local_setter_var_template,
                 )
             local_setter_var_template = local_setter_var_template.replace(
                 "{{field_name}}", "%(key)s"
@@ -2299,6 +3603,11 @@ class AtomicMeta(AbstractAtomic, type):
             tuple[str, Callable[..., Any]]
             | tuple[str, property | ClassOrInstanceFuncsDataDescriptor]
         ] = []
+        unchecked_properties = {}
+        # per-field arguments for ``create_proxy_property``, which may run later
+        # for ``lazy=True`` classes
+        field_codegen: dict[str, tuple[Any, Any, Any, type[Atomic] | None]] = {}
+        overridden_properties: dict[str, property] = {}
         for key, raw_typedef in tuple(current_class_slots.items()):
             disabled_derived = None
             if raw_typedef in klass.REGISTRY:
@@ -2327,31 +3636,46 @@ class AtomicMeta(AbstractAtomic, type):
             if get_origin(raw_typedef) is Annotated:
                 _, *metadata = get_args(raw_typedef)
                 annotated_metadata[key] = tuple(metadata)
-            new_property, isinstance_compatible_types = create_proxy_property(
-                env,
-                class_name,
-                key,
+            column_types[key] = parse_typedef(raw_typedef)
+            field_codegen[key] = (raw_typedef, coerce_types, coerce_func, derived_class)
+            if key in properties and key in support_cls_attrs:
+                overridden_properties[key] = support_cls_attrs[key]
+
+        def generate_properties() -> dict[str, property | ClassOrInstanceFuncsDataDescriptor]:
+            generated = {}
+            for key, (
                 raw_typedef,
                 coerce_types,
                 coerce_func,
                 derived_class,
-                listeners.get(key),
-                post_coerce_failure_handlers.get(key),
-                local_getter_var_template,
-                local_setter_var_template,
-                fast=fast,
-            )
-            column_types[key] = isinstance_compatible_types
-            if key in properties and key in support_cls_attrs:
-                current_prop = support_cls_attrs[key]
-                if current_prop.fget is not None:
-                    new_property = new_property.getter(current_prop.fget)
-                if current_prop.fset is not None:
-                    new_property = new_property.setter(current_prop.fset)
-                if current_prop.fdel is not None:
-                    new_property = new_property.deleter(current_prop.fdel)
-            support_cls_attrs[key] = new_property
-            class_cell_fixups.append((key, new_property))
+            ) in field_codegen.items():
+                new_property, build_unchecked, _ = create_proxy_property(
+                    env,
+                    class_name,
+                    key,
+                    raw_typedef,
+                    coerce_types,
+                    coerce_func,
+                    derived_class,
+                    listeners.get(key),
+                    post_coerce_failure_handlers.get(key),
+                    local_getter_var_template,
+                    local_setter_var_template,
+                    fast=fast,
+                    instrumented=instrumented,
+                    owner=owner,
+                    sources=generated_sources,
+                )
+                if key in overridden_properties:
+                    current_prop = overridden_properties[key]
+                    new_property = _with_accessors(new_property, current_prop)
+                    build_unchecked = functools.partial(
+                        _build_then, build_unchecked, _with_accessors, current_prop
+                    )
+                generated[key] = new_property
+                unchecked_properties[key] = build_unchecked
+                class_cell_fixups.append((key, new_property))
+            return generated
 
         # Support columns are left as-is for slots
         support_columns = tuple(deduplicate(pending_support_columns))
@@ -2371,164 +3695,173 @@ class AtomicMeta(AbstractAtomic, type):
         if "__init_subclass__" in support_cls_attrs:
             init_subclass = support_cls_attrs.pop("__init_subclass__")
 
-        if combined_columns:
-            exec(
-                compile(
-                    make_fast_dumps(combined_columns, class_name), "<make_fast_dumps>", mode="exec"
-                ),
-                dataclass_attrs,
-                dataclass_attrs,
-            )
-            class_cell_fixups.append(("_asdict", cast(FunctionType, dataclass_attrs["_asdict"])))
-            class_cell_fixups.append(("_astuple", cast(FunctionType, dataclass_attrs["_astuple"])))
-            class_cell_fixups.append(("_aslist", cast(FunctionType, dataclass_attrs["_aslist"])))
-            exec(
-                compile(make_fast_eq(combined_columns), "<make_fast_eq>", mode="exec"),
-                dataclass_attrs,
-                dataclass_attrs,
-            )
-            exec(
-                compile(
-                    make_fast_clear(combined_columns, local_setter_var_template, class_name),
-                    "<make_fast_clear>",
-                    mode="exec",
-                ),
-                dataclass_attrs,
-                dataclass_attrs,
-            )
-            class_cell_fixups.append(("clear", cast(FunctionType, dataclass_attrs["_clear"])))
-
-            iter_fields = []
-            for field in combined_columns:
-                if field in annotated_metadata and NoIterable in annotated_metadata[field]:
-                    continue
-                iter_fields.append(field)
-
-            values_hint = ""
-            maybe_values_hint = ""
-            keys_hint = ""
-            iter_hint = ""
-            set_values_hint = ""
-            if combined_slots:
-                values_hint = _make_union(
-                    *combined_slots.values(),
-                    globals=dict(calling_globals),
-                    locals=dict(calling_locals),
+        def generate_methods() -> tuple[dict[str, FunctionType], dict[str, FunctionType]]:
+            if combined_columns:
+                exec(
+                    compile_generated(
+                        make_fast_dumps(combined_columns, class_name),
+                        "asdict",
+                        owner=owner,
+                        sources=generated_sources,
+                    ),
+                    dataclass_attrs,
+                    dataclass_attrs,
                 )
-                maybe_values_hint = _make_union(
-                    *(tuple(combined_slots.values()) + (None,)),
-                    globals=dict(calling_globals),
-                    locals=dict(calling_locals),
+                class_cell_fixups.append(
+                    ("_asdict", cast(FunctionType, dataclass_attrs["_asdict"]))
                 )
-                set_values_hint = _make_union(
-                    *(tuple(combined_slots.values()) + (typing.Any,)),
-                    globals=dict(calling_globals),
-                    locals=dict(calling_locals),
+                class_cell_fixups.append(
+                    ("_astuple", cast(FunctionType, dataclass_attrs["_astuple"]))
                 )
-            all_field_names = tuple(deduplicate(combined_columns, properties))
-            if all_field_names:
-                keys_hint = _make_union(
-                    Literal[*all_field_names],
-                    globals=dict(calling_globals),
-                    locals=dict(calling_locals),
+                class_cell_fixups.append(
+                    ("_aslist", cast(FunctionType, dataclass_attrs["_aslist"]))
                 )
-                if not is_typing_definition(keys_hint):
-                    keys_hint = f"{keys_hint.__name__}"
-            del all_field_names
-            if iter_fields and keys_hint and values_hint:
-                iter_hint = _make_tuple(
-                    keys_hint,
-                    values_hint,
-                    globals=dict(calling_globals),
-                    locals=dict(calling_locals),
+                exec(
+                    compile_generated(
+                        make_fast_eq(combined_columns),
+                        "eq",
+                        owner=owner,
+                        sources=generated_sources,
+                    ),
+                    dataclass_attrs,
+                    dataclass_attrs,
                 )
-            exec(
-                compile(
-                    make_fast_getset_item(
-                        combined_columns,
-                        properties,
-                        class_name,
-                        local_getter_var_template,
-                        local_setter_var_template,
+                exec(
+                    compile_generated(
+                        make_fast_clear(combined_columns, local_setter_var_template, class_name),
+                        "clear",
+                        owner=owner,
+                        sources=generated_sources,
                     ),
-                    "<make_fast_getset_item>",
-                    mode="exec",
-                    dont_inherit=True,
-                    flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT
-                    | ast.PyCF_TYPE_COMMENTS
-                    | annotations.compiler_flag,
-                ),
-                dataclass_attrs,
-                dataclass_attrs,
-            )
-            if values_hint:
-                dataclass_attrs["__getitem__"].__annotations__["return"] = values_hint
-            if keys_hint:
-                dataclass_attrs["__getitem__"].__annotations__["key"] = keys_hint
-            if set_values_hint:
-                dataclass_attrs["__setitem__"].__annotations__["key"] = set_values_hint
-            exec(
-                compile(
-                    make_fast_iter(iter_fields, class_name=class_name),
-                    "<make_fast_iter>",
-                    mode="exec",
-                ),
-                dataclass_attrs,
-                dataclass_attrs,
-            )
-            dataclass_attrs["__iter__"].__annotations__["return"] = iter_hint
-            del iter_fields
-            pickle_fields = []
-            for field in combined_columns:
-                if field in annotated_metadata and NoPickle in annotated_metadata[field]:
-                    continue
-                pickle_fields.append(field)
-            exec(
-                compile(
-                    make_set_get_states(pickle_fields, class_name=class_name),
-                    "<make_set_get_states>",
-                    mode="exec",
-                ),
-                dataclass_attrs,
-                dataclass_attrs,
-            )
-            dataclass_attrs["__getstate__"].__annotations__["return"] = dict[str, maybe_values_hint]  # type:ignore
-            dataclass_attrs["__setstate__"].__annotations__["state"] = dict[str, maybe_values_hint]  # type:ignore
-            exec(
-                compile(
-                    make_defaults(tuple(combined_columns), defaults_var_template),
-                    "<make_defaults>",
-                    mode="exec",
-                ),
-                dataclass_attrs,
-                dataclass_attrs,
-            )
-            class_cell_fixups.append(
-                ("_set_defaults", cast(FunctionType, dataclass_attrs["_set_defaults"]))
-            )
+                    dataclass_attrs,
+                    dataclass_attrs,
+                )
+                class_cell_fixups.append(("clear", cast(FunctionType, dataclass_attrs["_clear"])))
 
-        for key in (
-            "__iter__",
-            "__getstate__",
-            "__setstate__",
-            "__eq__",
-            "_clear",
-            "__getitem__",
-            "__setitem__",
-            "_asdict",
-            "_astuple",
-            "_aslist",
-        ):
-            # Move the autogenerated functions into the support class
-            # Any overrides that *may* call them will be assigned
-            # to the concrete class instead
-            if key in dataclass_attrs:
-                if key in base_class_functions:
-                    continue
-                logger.debug(f"Copying {key} into {class_name} attributes")
-                support_cls_attrs[key] = dataclass_attrs.pop(key)
-        if "_set_defaults" in dataclass_attrs:
-            data_class_attrs["_set_defaults"] = dataclass_attrs.pop("_set_defaults")
+                iter_fields = []
+                for field in combined_columns:
+                    if field in annotated_metadata and NoIterable in annotated_metadata[field]:
+                        continue
+                    iter_fields.append(field)
+
+                exec(
+                    compile_generated(
+                        make_fast_getset_item(
+                            combined_columns,
+                            properties,
+                            class_name,
+                            local_getter_var_template,
+                            local_setter_var_template,
+                        ),
+                        "getitem",
+                        owner=owner,
+                        sources=generated_sources,
+                        dont_inherit=True,
+                        flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT
+                        | ast.PyCF_TYPE_COMMENTS
+                        | annotations.compiler_flag,
+                    ),
+                    dataclass_attrs,
+                    dataclass_attrs,
+                )
+                exec(
+                    compile_generated(
+                        make_fast_iter(iter_fields, class_name=class_name),
+                        "iter",
+                        owner=owner,
+                        sources=generated_sources,
+                    ),
+                    dataclass_attrs,
+                    dataclass_attrs,
+                )
+                has_iter_fields = bool(iter_fields)
+                del iter_fields
+                pickle_fields = []
+                for field in combined_columns:
+                    if field in annotated_metadata and NoPickle in annotated_metadata[field]:
+                        continue
+                    pickle_fields.append(field)
+                exec(
+                    compile_generated(
+                        make_set_get_states(pickle_fields, class_name=class_name),
+                        "getstate",
+                        owner=owner,
+                        sources=generated_sources,
+                    ),
+                    dataclass_attrs,
+                    dataclass_attrs,
+                )
+                annotate = functools.partial(
+                    annotate_generated_methods,
+                    {
+                        name: dataclass_attrs[name]
+                        for name in (
+                            "__getitem__",
+                            "__setitem__",
+                            "__iter__",
+                            "__getstate__",
+                            "__setstate__",
+                        )
+                    },
+                    dict(combined_slots),
+                    tuple(deduplicate(combined_columns, properties)),
+                    has_iter_fields,
+                    hint_namespace,
+                )
+                # The generated functions are copied with insert_class_closure, but
+                # the copies share the same ``__annotations__`` dicts, so these may
+                # be filled in after the class is made.
+                if lazy_method_annotations and not lazy:
+                    pending_finalize.append(annotate)
+                else:
+                    annotate()
+                del annotate
+                exec(
+                    compile_generated(
+                        make_defaults(tuple(combined_columns), defaults_var_template),
+                        "defaults",
+                        owner=owner,
+                        sources=generated_sources,
+                    ),
+                    dataclass_attrs,
+                    dataclass_attrs,
+                )
+                class_cell_fixups.append(
+                    ("_set_defaults", cast(FunctionType, dataclass_attrs["_set_defaults"]))
+                )
+
+            support_methods = {}
+            for key in GENERATED_SUPPORT_METHODS:
+                # Move the autogenerated functions into the support class
+                # Any overrides that *may* call them will be assigned
+                # to the concrete class instead
+                if key in dataclass_attrs:
+                    if key in base_class_functions:
+                        continue
+                    logger.debug(f"Copying {key} into {class_name} attributes")
+                    support_methods[key] = dataclass_attrs.pop(key)
+            data_methods = {}
+            if "_set_defaults" in dataclass_attrs:
+                data_methods["_set_defaults"] = dataclass_attrs.pop("_set_defaults")
+            return support_methods, data_methods
+
+        if lazy:
+            # Stand-ins that materialize the class on first access; the data class
+            # still gets a ``_set_defaults`` only once materialized.
+            for key in current_class_fields:
+                support_cls_attrs[key] = _Unmaterialized(key)
+            if combined_columns:
+                for key in GENERATED_SUPPORT_METHODS:
+                    if key not in base_class_functions:
+                        support_cls_attrs[key] = _Unmaterialized(key)
+                support_cls_attrs["_trusted_construct"] = _Unmaterialized("_trusted_construct")
+                support_cls_attrs["_trusted_from_dict"] = _Unmaterialized("_trusted_from_dict")
+        else:
+            support_cls_attrs.update(generate_properties())
+            support_methods, data_methods = generate_methods()
+            support_cls_attrs.update(support_methods)
+            data_class_attrs.update(data_methods)
+            del support_methods, data_methods
 
         # Any keys subtracted must have no-nop setters in order to
         # allow for subtype relationship will behaving as if those keys are fundamentally
@@ -2565,6 +3898,8 @@ class AtomicMeta(AbstractAtomic, type):
             support_cls_attrs["_modified_fields"] = ()
         conf = AttrsDict[type[BaseAtomic]](**mixins)
         conf["fast"] = fast
+        conf["lazy"] = lazy
+        conf["instrumented"] = instrumented
         extra_slots = tuple(_dedupe(pending_extra_slots))
         support_cls_attrs["__extra_slots__"] = ImmutableCollection[str](extra_slots)
         support_cls_attrs["_properties"] = tuple(properties)
@@ -2575,6 +3910,9 @@ class AtomicMeta(AbstractAtomic, type):
         support_cls_attrs["_configuration"] = ImmutableMapping[str, type[BaseAtomic]](conf)
 
         support_cls_attrs["_listener_funcs"] = ImmutableMapping[str, Iterable[Callable]](listeners)
+        support_cls_attrs["_unchecked_properties"] = ImmutableMapping[
+            str, UncheckedPropertyBuilder
+        ](unchecked_properties)
         # Ensure public class has zero slots!
         support_cls_attrs["__slots__"] = ()
         if avail_generics:
@@ -2613,38 +3951,102 @@ class AtomicMeta(AbstractAtomic, type):
             type[Atomic],
             super().__new__(klass, class_name, bases, support_cls_attrs, **init_subclass_kwargs),
         )  # type:ignore[misc]
+        # the list is filled in as (and if) the class's code is generated
+        weakref.finalize(support_cls, release_generated_sources, generated_sources)
         if create_match_args:
             support_cls.__match_args__ = tuple(cast(AbstractAtomic, support_cls))  # type:ignore[misc]
         # assert '<' not in support_cls.__qualname__, f'poop {c}'
         if override_class_iter is not None:
             support_cls.__class_iter__ = types.MethodType(override_class_iter, support_cls)  # type:ignore[method-assign]
 
-        for prop_name, value in support_cls_attrs.items():
-            if isinstance(value, property):
-                value = property(
-                    insert_class_closure(support_cls, value.fget),
-                    insert_class_closure(support_cls, value.fset),
-                )
-            elif isinstance(value, FunctionType):
-                value = insert_class_closure(support_cls, value)
-            else:
-                continue
-            setattr(support_cls, prop_name, value)
+        def install_generated(
+            generated_attrs: Mapping[str, Any], *, set_descriptors: bool = False
+        ) -> None:
+            for prop_name, value in generated_attrs.items():
+                if isinstance(value, property):
+                    value = property(
+                        insert_class_closure(support_cls, value.fget),
+                        insert_class_closure(support_cls, value.fset),
+                    )
+                elif isinstance(value, FunctionType):
+                    value = insert_class_closure(support_cls, value)
+                elif not set_descriptors:
+                    continue
+                setattr(support_cls, prop_name, value)
+
+        def install_unchecked_and_trusted() -> None:
+            installed = {
+                key: functools.partial(_build_then, build, _with_class_closure, support_cls)
+                for key, build in unchecked_properties.items()
+            }
+            # kept alongside any inherited fields rebound for listener overrides
+            support_cls._unchecked_properties = ImmutableMapping[str, UncheckedPropertyBuilder](
+                {**vars(support_cls)["_unchecked_properties"].value, **installed}
+            )
+            if not combined_columns:
+                return
+            trusted_listeners = {}
+            for field in combined_columns:
+                field_listeners = listeners_in_effect(support_cls, field)
+                if field_listeners:
+                    trusted_listeners[field] = classify_listeners(field_listeners)
+            exec(
+                compile_generated(
+                    make_trusted_construct(
+                        combined_columns, raw_setter_var_template, class_name, trusted_listeners
+                    ),
+                    "trusted_construct",
+                    owner=owner,
+                    sources=generated_sources,
+                ),
+                dataclass_attrs,
+                dataclass_attrs,
+            )
+            support_cls._trusted_construct = classmethod(dataclass_attrs.pop("_trusted_construct"))
+            support_cls._trusted_from_dict = classmethod(dataclass_attrs.pop("_trusted_from_dict"))
+
+        install_generated(support_cls_attrs)
+        rebind_inherited_listeners(
+            support_cls, (field for field in combined_columns if field not in current_class_slots)
+        )
+        if lazy:
+
+            def materialize() -> None:
+                install_generated(generate_properties(), set_descriptors=True)
+                support_methods, data_methods = generate_methods()
+                install_generated(support_methods)
+                for key, value in data_methods.items():
+                    setattr(data_class, key, insert_class_closure(data_class, value))
+                install_unchecked_and_trusted()
+
+            pending_finalize.insert(0, materialize)
+        else:
+            install_unchecked_and_trusted()
+
+        if pending_finalize:
+            defer_until_finalized(support_cls, pending_finalize)
 
         dataclass_attrs["klass"] = support_cls
         dataclass_slots = (
             tuple(f"_{key}_" for key in combined_columns) + support_columns + extra_slots
         )
-        dataclass_template = env.get_template("data_class.jinja").render(
+        dataclass_template = render_template(
+            "data_class.jinja",
             class_name=class_name,
             slots=repr(dataclass_slots),
-            data_class_attrs=data_class_attrs,
-            class_slots=current_class_slots,
+            data_class_attrs=tuple(data_class_attrs),
+            class_slots=tuple(current_class_slots),
         )
         dataclass_attrs["_dataclass_attrs"] = data_class_attrs
         dataclass_attrs["define_data_class"] = define_data_class
         dataclass_attrs["in_data_class"] = in_data_class
-        exec(compile(dataclass_template, "<dcs>", mode="exec"), dataclass_attrs, dataclass_attrs)
+        exec(
+            compile_generated(
+                dataclass_template, "data_class", owner=owner, sources=generated_sources
+            ),
+            dataclass_attrs,
+            dataclass_attrs,
+        )
 
         data_class: type[Atomic]
 
@@ -2654,6 +4056,8 @@ class AtomicMeta(AbstractAtomic, type):
             if callable(value):
                 setattr(data_class, key, insert_class_closure(data_class, value))
         data_class.__qualname__ = f"{support_cls.__qualname__}.{data_class.__name__}"
+        if instrumented:
+            instrumentation.instrument_data_class(data_class)
         # parent_cell.value = support_cls
         reg = inspect.getattr_static(klass, "REGISTRY")
         reg.value.add(support_cls)
@@ -2662,12 +4066,140 @@ class AtomicMeta(AbstractAtomic, type):
         #     support_cls.__init_subclass__ = classmethod(wrap_init_subclass(init_subclass))
         return support_cls
 
-    def from_json(cls: type[T], data: dict[str, Any]) -> T:
+    def from_json(cls: type[T], data: dict[str, Any], *, trusted: bool = False) -> T:
+        if trusted:
+            return trusted_json_decoder(cls)(data)
         return cls(**data)
 
-    def from_many_json(cls: type[T], iterable: Iterable[dict[str, Any]]) -> tuple[T, ...]:
+    def from_many_json(
+        cls: type[T], iterable: Iterable[dict[str, Any]], *, trusted: bool = False
+    ) -> tuple[T, ...]:
+        if trusted:
+            decode = trusted_json_decoder(cls)
+            return tuple(decode(item) for item in iterable)
         return tuple(cls(**item) for item in iterable)
 
+    def unchecked(cls: type[T]) -> type[T]:
+        """
+        Return a sibling of the data class whose setters store what they are
+        given: dicts for nested classes and ``__coerce__`` types are converted as
+        usual, but a value of the wrong type is stored rather than rejected.
+
+        The sibling shares the public class and slot layout, so instances are
+        ``isinstance`` of the public class, pickle as it and may have their
+        ``__class__`` swapped between the checked and unchecked forms. Use it on
+        hot internal paths that already trust their input:
+
+            FastItem = Item.unchecked()
+            items = [FastItem(**row) for row in rows]
+        """
+        finalize(cls)
+        data_class = cls._data_class
+        try:
+            return vars(data_class)["_unchecked_class"]
+        except KeyError:
+            pass
+        attrs: dict[str, Any] = {"__slots__": ()}
+        for field in cls._columns:
+            build_unchecked = unchecked_property_for(data_class, field)
+            if build_unchecked is not None:
+                attrs[field] = build_unchecked()
+        with define_data_class():
+            unchecked_cls = type(data_class)(
+                f"{data_class.__name__}Unchecked", (data_class,), attrs
+            )
+        unchecked_cls.__module__ = data_class.__module__
+        unchecked_cls.__qualname__ = f"{data_class.__qualname__}Unchecked"
+        unchecked_cls.__public_class__ = data_class.__public_class__
+        unchecked_cls._data_class = ImmutableValue[type[Atomic]](unchecked_cls)
+        unchecked_cls._unchecked_class = unchecked_cls
+        data_class._unchecked_class = unchecked_cls
+        return unchecked_cls
+
+    def trusted_construct(cls: type[T], *values: Any, fire_listeners: bool = False) -> T:
+        """
+        Construct an instance from positional values (in field order) without
+        type checks, coercion or listeners.
+
+        Only use this for data that is known to be valid already (i.e. read back
+        from a store this class wrote). Missing trailing values are left at their
+        defaults. If ``fire_listeners`` is set, each listener is called once after
+        all values are written.
+        """
+        return cls._trusted_construct(*values, fire_listeners=fire_listeners)
+
+    def trusted_from_dict(
+        cls: type[T], data: Mapping[str, Any], *, fire_listeners: bool = False
+    ) -> T:
+        """
+        Like ``trusted_construct`` but from a mapping of field name to value.
+
+        Keys that are not fields are ignored.
+        """
+        return cls._trusted_from_dict(data, fire_listeners=fire_listeners)
+
+    def loads_from(
+        cls: type[T],
+        data: memoryview | bytes | bytearray,
+        offset: int = 0,
+        *,
+        copy: bool = False,
+    ) -> tuple[T, int]:
+        """
+        Read an instance written by ``instruct.dumps_into(instance, buffer)`` from
+        ``data`` at ``offset``. Returns the instance and the offset after it.
+
+        ``bytes`` fields are ``memoryview`` slices of ``data`` unless ``copy`` is set.
+        """
+        return binary.loads_from(cls, data, offset, copy=copy)
+
+    def schema_fingerprint(cls) -> str:
+        """
+        Hex digest of the binary layout used by ``dumps_into``/``loads_from``.
+        """
+        return binary.schema_fingerprint(cls)
+
+    def aiter_from(cls: type[T], stream: Any, **options: Any) -> AsyncIterator[T]:
+        """
+        ``async for item in Cls.aiter_from(reader)`` over NDJSON or CSV records read
+        from an ``asyncio.StreamReader``. See ``instruct.streams.aiter_from`` for
+        the batching, executor and backpressure ``options``.
+        """
+        return streams.aiter_from(cls, stream, **options)
+
+    def read_csv(cls: type[T], fileobj: Iterable[str], **options: Any) -> Iterator[T]:
+        """
+        Yield an instance per row of a CSV file with a header row, converting the
+        cells by field type. See ``instruct.streams.read_csv``.
+        """
+        return streams.read_csv(cls, fileobj, **options)
+
+    def write_csv(cls: type[T], fileobj: Any, instances: Iterable[T], **options: Any) -> int:
+        """
+        Write ``instances`` as CSV with a header row. See ``instruct.streams.write_csv``.
+        """
+        return streams.write_csv(cls, fileobj, instances, **options)
+
+    def validate(cls: type[T], data: Mapping[str, Any]) -> tuple[T | None, tuple[FieldError, ...]]:
+        """
+        Return ``(instance, ())`` or ``(None, errors)`` instead of raising, with an
+        error per bad value, nested field and collection item. See
+        ``instruct.validation.validate``.
+        """
+        return validation.validate(cls, data)
+
+    def from_msgpack(cls: type[T], data: bytes | bytearray | memoryview) -> T:
+        """
+        Read an instance written by ``instruct.to_msgpack(instance)``.
+        """
+        return msgpack.loads(cls, data)
+
+    def from_many_msgpack(cls: type[T], data: bytes | bytearray | memoryview) -> tuple[T, ...]:
+        """
+        Read the instances written by ``instruct.to_many_msgpack(instances)``.
+        """
+        return msgpack.loads_many(cls, data)
+
     def __str__(self):
         try:
             params = self.__parameters__
@@ -2774,6 +4306,10 @@ class History(metaclass=AtomicMeta):
         _columns: frozenset[str]
 
     def __init__(self, *args, **kwargs):
+        self._start_history()
+        super().__init__(*args, **kwargs)
+
+    def _start_history(self):
         t_s = time.time()
         self._suppress_history = frozenset(
             field for field, metadata in self._annotated_metadata.items() if NoHistory in metadata
@@ -2788,7 +4324,10 @@ class History(metaclass=AtomicMeta):
         ]
         self._changed_index = len(self._changed_keys)
 
-        super().__init__(*args, **kwargs)
+    def _on_trusted_construct(self):
+        # Trusted values become the baseline of the history
+        super()._on_trusted_construct()
+        self._start_history()
 
     def __setattr__(self, key, value):
         super().__setattr__(key, value)
@@ -2957,7 +4496,7 @@ class WeaklyHeld(metaclass=AtomicMeta):
 AtomicMeta.register_mixin("weakref", WeaklyHeld)
 
 
-def add_event_listener(*fields: str):
+def add_event_listener(*fields: str, grouped: bool = False):
     """
     Event listeners are functions that are run when an attribute is set.
 
@@ -2986,8 +4525,10 @@ def add_event_listener(*fields: str):
                 created_at = new
 
         Use of the ``grouped=True`` keyword-only parameter will instead
-        fire the event handler only when all fields are set at least once and then
-        on any change afterwards
+        call the event handler with the new values of the changed fields as
+        keyword arguments: one at a time on a plain assignment, all of them
+        at once at the end of ``batch_update(...)``/``update(...)``. Without
+        field names it listens to every field the class defines.
 
         Or you can put the *attribute names* in the handler function itself!
 
@@ -2998,8 +4539,7 @@ def add_event_listener(*fields: str):
             @add_event_listener(grouped=True)
             def when_both(self, **kwargs):
                 if "name" in kwargs and "secret" in kwargs:
-                    # both attributes have either been set once
-                    # or one of the attributes has changed
+                    # both attributes were changed together
                 ...
 
 
@@ -3030,6 +4570,8 @@ def add_event_listener(*fields: str):
         func._event_listener_funcs = (
             inspect.getattr_static(func, "_event_listener_funcs", ()) + fields
         )
+        if grouped:
+            func._event_listener_grouped = True
         return func
 
     return wrapper
@@ -3089,11 +4631,23 @@ class JSONSerializable(metaclass=AtomicMeta):
         return AtomicMeta.to_json(cast(AtomicMeta, self))[0]
 
     @classmethod
-    def from_json(cls: AtomicMeta, data: dict[str, Any]) -> type[Atomic]:
+    def from_json(cls: AtomicMeta, data: dict[str, Any], *, trusted: bool = False) -> type[Atomic]:
+        """
+        Construct from the output of ``to_json``. With ``trusted`` set, the data is
+        taken to be exactly what ``to_json`` produced and is decoded without
+        validation (see ``instruct.trusted_json_decoder``).
+        """
+        if trusted:
+            return trusted_json_decoder(cls)(data)
         return cls(**data)
 
     @classmethod
-    def from_many_json(cls: AtomicMeta, iterable: Iterable[dict[str, Any]]) -> tuple[T, ...]:
+    def from_many_json(
+        cls: AtomicMeta, iterable: Iterable[dict[str, Any]], *, trusted: bool = False
+    ) -> tuple[T, ...]:
+        if trusted:
+            decode = trusted_json_decoder(cls)
+            return tuple(decode(item) for item in iterable)
         return tuple(cls.from_json(item) for item in iterable)
 
 
@@ -3109,6 +4663,25 @@ result._{{field}}_ = None
 """
 
 
+def _invalid_type_message(field_name, val_repr, val_type, types_required, expected) -> str:
+    if expected is None:
+        expected = describe_expected_types(tuple(types_required))
+    return (
+        f"Unable to set {field_name} to {val_repr} ({val_type.__name__}). {field_name} expects "
+        f"{expected}"
+    )
+
+
+_titleize = functools.lru_cache(maxsize=1024)(inflection.titleize)
+
+
+def _construction_failed_message(data_class: type, count: int) -> str:
+    return (
+        f"Unable to construct {_titleize(data_class.__name__[1:])}, encountered {count} "
+        f"error{'s' if count > 1 else ''}"
+    )
+
+
 class SimpleBase(metaclass=AtomicMeta):
     __slots__ = ("_flags",)
     __setter_template__ = ImmutableValue[str]("self._{key}_ = val")
@@ -3152,33 +4725,19 @@ class SimpleBase(metaclass=AtomicMeta):
         return load_cls, (cls, (), {}, s), self.__getstate__()
 
     @classmethod
-    def _create_invalid_type(cls, field_name, val, val_type, types_required):
-        pending_types_required_names = []
-        # ARJ: hmm, you know... the "types_required" field really  can be made into a static
-        # string and stored on the type once...
-        for req_cls in types_required:
-            # ARJ: Handle Literal[1, 2, 3]-cases.. :/
-            if issubclass(req_cls, CustomTypeCheck) and req_cls.__origin__ is Literal:
-                pending_types_required_names.extend(
-                    f'"{arg}"' if isinstance(arg, str) else str(arg) for arg in req_cls.__args__
-                )
-                continue
-            pending_types_required_names.append(req_cls.__name__)
-        types_required_names = tuple(pending_types_required_names)
-        if len(types_required_names) > 1:
-            if len(types_required_names) == 2:
-                left, right = types_required_names
-                expects = f"either an {left} or {right}"
-            else:
-                *rest_types, end = types_required_names
-                rest = ", ".join([x for x in rest_types])
-                expects = f"either an {rest} or a {end}"
-        else:
-            (expected_type,) = types_required_names
-            expects = f"a {expected_type}"
+    def _create_invalid_type(cls, field_name, val, val_type, types_required, *, expected=None):
+        # formatted only if the error is displayed, as callers probing unions or
+        # handling the error themselves discard it. ``val`` may change before
+        # then, so its (bounded) repr is taken now.
         return InstructTypeError(
-            f"Unable to set {field_name} to {val!r} ({val_type.__name__}). {field_name} expects "
-            f"{expects}",
+            LazyMessage(
+                _invalid_type_message,
+                field_name,
+                describe_value(val),
+                val_type,
+                types_required,
+                expected,
+            ),
             field_name,
             val,
         )
@@ -3187,6 +4746,29 @@ class SimpleBase(metaclass=AtomicMeta):
     def _create_invalid_value(cls, message, *args, **kwargs):
         return InstructValueError(message, *args, **kwargs)
 
+    @classmethod
+    def _trusted_from_dict(cls, data, *, fire_listeners=False):
+        # Replaced by generated code on classes with fields.
+        self = cls.__new__(cls)
+        self._flags = Flags.INITIALIZED
+        self._on_trusted_construct()
+        self.__post_init__()
+        return self
+
+    @classmethod
+    def _trusted_construct(cls, *values, fire_listeners=False):
+        if values:
+            raise TypeError(
+                f"trusted_construct() takes 0 positional arguments but {len(values)} were given"
+            )
+        return cls._trusted_from_dict({}, fire_listeners=fire_listeners)
+
+    def _on_trusted_construct(self):
+        """
+        Hook called after a trusted construction has written the fields but
+        before ``__post_init__``. Mixins use this to set up their own state.
+        """
+
     def _handle_init_errors(self, errors, errored_keys, unrecognized_keys):
         if unrecognized_keys:
             fields = ", ".join(unrecognized_keys)
@@ -3196,18 +4778,10 @@ class SimpleBase(metaclass=AtomicMeta):
                 )
             )
         if errors:
-            typename = inflection.titleize(type(self).__name__[1:])
+            message = LazyMessage(_construction_failed_message, type(self), len(errors))
             if len(errors) == 1:
-                raise ClassCreationFailed(
-                    f"Unable to construct {typename}, encountered {len(errors)} "
-                    f"error{'s' if len(errors) > 1 else ''}",
-                    *errors,
-                ) from errors[0]
-            raise ClassCreationFailed(
-                f"Unable to construct {typename}, encountered {len(errors)} "
-                f"error{'s' if len(errors) > 1 else ''}",
-                *errors,
-            )
+                raise ClassCreationFailed(message, *errors) from errors[0]
+            raise ClassCreationFailed(message, *errors)
 
     def __init__(self, *args, **kwargs):
         self._flags |= Flags.IN_CONSTRUCTOR
@@ -3283,11 +4857,28 @@ __all__ = [
     "items",
     "get",
     "clear",
+    "update",
+    "batch_update",
     "reset_to_defaults",
     "asdict",
     "astuple",
     "aslist",
     "show_all_fields",
+    "memory_usage",
+    "MemoryUsage",
+    "finalize",
+    "warmup",
+    "subtraction_cache_info",
+    "clear_subtraction_cache",
+    "stats",
+    "reset_stats",
+    "dumps_into",
+    "trusted_json_decoder",
+    "to_msgpack",
+    "to_many_msgpack",
+    "projection",
+    "Projection",
+    "FieldError",
     # default end-user base classes
     "SimpleBase",
     "Base",
@@ -0,0 +1,325 @@
+"""
+Schema driven binary encoding of instruct classes.
+
+A codec is derived from a class's ``_slots`` on first use. Every field is written
+in ``_columns`` order as a presence byte followed by its value:
+
+- ``bool`` as one byte, ``int`` as a little-endian signed 64 bit integer (a
+  ``ValueError`` naming the field is raised for larger values) and ``float``
+  as a little-endian double
+- ``str`` (UTF-8) and ``bytes`` as a 32 bit length followed by the data
+- nested Atomic classes inline, field by field
+- ``list``/``tuple``/``set``/``frozenset``/``dict`` as a 32 bit count followed
+  by the items (keys and values for ``dict``)
+
+A message is prefixed with the 8 byte schema fingerprint of its class so that
+peers with a different field layout are detected instead of misread.
+"""
+
+from __future__ import annotations
+
+import builtins
+import hashlib
+import struct
+import typing
+from collections import abc
+from typing import Any, Callable, NamedTuple, Tuple, Union
+
+from .codecs import CONTAINER_TYPES, MAPPING_TYPES, cached_on_class
+from .exceptions import TypeError, ValueError, SchemaMismatchError
+from .types import BaseAtomic
+from .typing import NoneType, get_origin, get_args, Annotated
+
+if typing.TYPE_CHECKING:
+    from .typing import Atomic
+
+    Encoder = Callable[[bytearray, Any], None]
+    Decoder = Callable[[memoryview, int, bool], Tuple[Any, int]]
+
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_I64_MIN = -(1 << 63)
+_I64_MAX = (1 << 63) - 1
+
+FINGERPRINT_SIZE = 8
+
+
+class BinaryCodec(NamedTuple):
+    schema: tuple
+    fingerprint: bytes
+    encode: Callable[[bytearray, Any], None]
+    decode: Callable[[memoryview, int, bool], Tuple[Any, int]]
+
+
+def _encode_bool(out: bytearray, value: bool) -> None:
+    out.append(1 if value else 0)
+
+
+def _decode_bool(view: memoryview, offset: int, copy: bool) -> tuple[bool, int]:
+    return view[offset] != 0, offset + 1
+
+
+def _int_encoder(field: str) -> Encoder:
+    def encode_int(out: bytearray, value: int) -> None:
+        if not _I64_MIN <= value <= _I64_MAX:
+            raise ValueError(
+                f"Cannot binary encode {field!r}: {value} does not fit in 64 bits",
+                field=field,
+                value=value,
+            )
+        out += _I64.pack(value)
+
+    return encode_int
+
+
+def _decode_int(view: memoryview, offset: int, copy: bool) -> tuple[int, int]:
+    return _I64.unpack_from(view, offset)[0], offset + 8
+
+
+def _encode_float(out: bytearray, value: float) -> None:
+    out += _F64.pack(value)
+
+
+def _decode_float(view: memoryview, offset: int, copy: bool) -> tuple[float, int]:
+    return _F64.unpack_from(view, offset)[0], offset + 8
+
+
+def _encode_str(out: bytearray, value: str) -> None:
+    data = value.encode("utf8")
+    out += _U32.pack(len(data))
+    out += data
+
+
+def _decode_str(view: memoryview, offset: int, copy: bool) -> tuple[str, int]:
+    (size,) = _U32.unpack_from(view, offset)
+    offset += 4
+    return str(view[offset : offset + size], "utf8"), offset + size
+
+
+def _encode_bytes(out: bytearray, value: bytes) -> None:
+    out += _U32.pack(len(value))
+    out += value
+
+
+def _decode_bytes(view: memoryview, offset: int, copy: bool) -> tuple[bytes | memoryview, int]:
+    (size,) = _U32.unpack_from(view, offset)
+    offset += 4
+    value = view[offset : offset + size]
+    if copy:
+        return value.tobytes(), offset + size
+    return value, offset + size
+
+
+_SCALARS = {
+    bool: ("bool", _encode_bool, _decode_bool),
+    float: ("f64", _encode_float, _decode_float),
+    str: ("str", _encode_str, _decode_str),
+    bytes: ("bytes", _encode_bytes, _decode_bytes),
+    bytearray: ("bytes", _encode_bytes, _decode_bytes),
+}
+
+
+def _nullable(encode: Encoder, decode: Decoder) -> tuple[Encoder, Decoder]:
+    def encode_nullable(out: bytearray, value: Any) -> None:
+        if value is None:
+            out.append(0)
+            return
+        out.append(1)
+        encode(out, value)
+
+    def decode_nullable(view: memoryview, offset: int, copy: bool) -> tuple[Any, int]:
+        if view[offset] == 0:
+            return None, offset + 1
+        return decode(view, offset + 1, copy)
+
+    return encode_nullable, decode_nullable
+
+
+def _plan(hint: Any, field: str) -> tuple[Any, Encoder, Decoder]:
+    """
+    Return the schema entry, encoder and decoder for a type hint.
+    """
+    origin = get_origin(hint)
+    if origin is Annotated:
+        return _plan(get_args(hint)[0], field)
+    if origin is Union:
+        members = tuple(arg for arg in get_args(hint) if arg is not NoneType)
+        if len(members) != 1:
+            raise TypeError(f"Cannot binary encode {field!r} of union {hint!r}", field, hint)
+        schema, encode, decode = _plan(members[0], field)
+        return ("optional", schema), *_nullable(encode, decode)
+    if hint is int:
+        # the encoder names the field when a value is out of range
+        return "i64", _int_encoder(field), _decode_int
+    if hint in _SCALARS:
+        return _SCALARS[hint]
+    if isinstance(hint, type) and issubclass(hint, BaseAtomic) and hasattr(hint, "_columns"):
+        schema, encode, decode = _build(hint)
+        return ("struct", schema), encode, decode
+    if origin in CONTAINER_TYPES:
+        return _plan_sequence(hint, origin, field)
+    if origin in MAPPING_TYPES:
+        key_hint, value_hint = get_args(hint) or (None, None)
+        if key_hint is None:
+            raise TypeError(f"Cannot binary encode untyped mapping {field!r}", field, hint)
+        key_schema, encode_key, decode_key = _plan(key_hint, field)
+        value_schema, encode_value, decode_value = _plan(value_hint, field)
+
+        def encode_mapping(out: bytearray, value: abc.Mapping) -> None:
+            out += _U32.pack(len(value))
+            for key, item in value.items():
+                encode_key(out, key)
+                encode_value(out, item)
+
+        def decode_mapping(view: memoryview, offset: int, copy: bool) -> tuple[dict, int]:
+            (count,) = _U32.unpack_from(view, offset)
+            offset += 4
+            result = {}
+            for _ in range(count):
+                key, offset = decode_key(view, offset, copy)
+                result[key], offset = decode_value(view, offset, copy)
+            return result, offset
+
+        return ("dict", key_schema, value_schema), encode_mapping, decode_mapping
+    raise TypeError(f"Cannot binary encode {field!r} of type {hint!r}", field, hint)
+
+
+def _plan_sequence(hint: Any, origin: type, field: str) -> tuple[Any, Encoder, Decoder]:
+    args = get_args(hint)
+    if not args:
+        raise TypeError(f"Cannot binary encode untyped collection {field!r}", field, hint)
+    container = CONTAINER_TYPES[origin]
+    if origin is tuple and not (len(args) == 2 and args[1] is Ellipsis):
+        # fixed length tuple
+        plans = tuple(_plan(arg, field) for arg in args)
+        encoders = tuple(encode for _, encode, _ in plans)
+        decoders = tuple(decode for _, _, decode in plans)
+
+        def encode_fixed(out: bytearray, value: tuple) -> None:
+            for encode, item in zip(encoders, value):
+                encode(out, item)
+
+        def decode_fixed(view: memoryview, offset: int, copy: bool) -> tuple[tuple, int]:
+            items = []
+            for decode in decoders:
+                item, offset = decode(view, offset, copy)
+                items.append(item)
+            return tuple(items), offset
+
+        return ("fixed_tuple", *(schema for schema, _, _ in plans)), encode_fixed, decode_fixed
+
+    item_schema, encode_item, decode_item = _plan(args[0], field)
+
+    def encode_sequence(out: bytearray, value: abc.Collection) -> None:
+        out += _U32.pack(len(value))
+        for item in value:
+            encode_item(out, item)
+
+    def decode_sequence(view: memoryview, offset: int, copy: bool) -> tuple[Any, int]:
+        (count,) = _U32.unpack_from(view, offset)
+        offset += 4
+        items = []
+        for _ in range(count):
+            item, offset = decode_item(view, offset, copy)
+            items.append(item)
+        if container is list:
+            return items, offset
+        return container(items), offset
+
+    return (container.__name__, item_schema), encode_sequence, decode_sequence
+
+
+def _build(cls: type[Atomic]) -> tuple[tuple, Encoder, Decoder]:
+    field_names = tuple(cls._columns)
+    schema = []
+    encoders = []
+    decoders = []
+    for field in field_names:
+        field_schema, encode, decode = _plan(cls._slots[field], field)
+        # every field may be unset
+        if field_schema[0] != "optional":
+            encode, decode = _nullable(encode, decode)
+        schema.append((field, field_schema))
+        encoders.append(encode)
+        decoders.append(decode)
+    encoders_by_field = tuple(encoders)
+    decoders_by_field = tuple(decoders)
+    construct = cls._trusted_construct
+
+    def encode_instance(out: bytearray, instance: Atomic) -> None:
+        for encode, value in zip(encoders_by_field, instance._astuple()):
+            encode(out, value)
+
+    def decode_instance(view: memoryview, offset: int, copy: bool) -> tuple[Atomic, int]:
+        values = []
+        for decode in decoders_by_field:
+            value, offset = decode(view, offset, copy)
+            values.append(value)
+        return construct(*values), offset
+
+    return tuple(schema), encode_instance, decode_instance
+
+
+def _build_codec(data_class: type[Atomic]) -> BinaryCodec:
+    schema, encode, decode = _build(data_class)
+    fingerprint = hashlib.sha256(repr(schema).encode("utf8")).digest()[:FINGERPRINT_SIZE]
+    return BinaryCodec(schema, fingerprint, encode, decode)
+
+
+def codec_for(cls: type[Atomic]) -> BinaryCodec:
+    """
+    Return the (cached) binary codec for an instruct class or instance.
+    """
+    return cached_on_class(cls, "_binary_codec", _build_codec)
+
+
+def schema_fingerprint(cls: type[Atomic] | Atomic) -> str:
+    """
+    Return the hex fingerprint of the binary layout of ``cls``. Classes with the
+    same field names and types in the same order share a fingerprint.
+    """
+    return codec_for(cls).fingerprint.hex()
+
+
+def dumps_into(instance: Atomic, buffer: bytearray) -> int:
+    """
+    Append the binary form of ``instance`` to ``buffer``, returning the number of
+    bytes written. Nothing is appended if a value cannot be encoded.
+    """
+    codec = codec_for(instance)
+    start = len(buffer)
+    buffer += codec.fingerprint
+    try:
+        codec.encode(buffer, instance)
+    except BaseException:
+        del buffer[start:]
+        raise
+    return len(buffer) - start
+
+
+def loads_from(
+    cls: type[Atomic], data: memoryview | bytes | bytearray, offset: int = 0, *, copy: bool = False
+) -> tuple[Atomic, int]:
+    """
+    Read an instance of ``cls`` written by ``dumps_into`` from ``data`` starting
+    at ``offset``, returning it with the offset just past it.
+
+    Values are trusted as written (see ``trusted_construct``). ``bytes`` fields
+    are ``memoryview`` slices of ``data`` unless ``copy`` is set, so they
+    are only valid as long as ``data`` is.
+    """
+    codec = codec_for(cls)
+    view = data if isinstance(data, memoryview) else memoryview(data)
+    fingerprint = view[offset : offset + FINGERPRINT_SIZE].tobytes()
+    if fingerprint != codec.fingerprint:
+        raise SchemaMismatchError(
+            f"Data was written with schema {fingerprint.hex()}, "
+            f"{cls.__qualname__} has schema {codec.fingerprint.hex()}",
+            expected=codec.fingerprint.hex(),
+            received=fingerprint.hex(),
+        )
+    try:
+        return codec.decode(view, offset + FINGERPRINT_SIZE, copy)
+    except (struct.error, builtins.IndexError, builtins.UnicodeDecodeError) as e:
+        raise SchemaMismatchError(f"Truncated or corrupt data for {cls.__qualname__}") from e
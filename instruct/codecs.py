@@ -0,0 +1,52 @@
+"""
+What the per-class codecs (binary, msgpack and the trusted JSON decoder) share.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import abc
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# collection origins -> the container a decoded list of items becomes
+CONTAINER_TYPES: dict[Any, type] = {
+    list: list,
+    tuple: tuple,
+    set: set,
+    frozenset: frozenset,
+    abc.Sequence: tuple,
+    abc.MutableSequence: list,
+    abc.Set: frozenset,
+    abc.MutableSet: set,
+    abc.Collection: tuple,
+    abc.Iterable: tuple,
+}
+MAPPING_TYPES = (dict, abc.Mapping, abc.MutableMapping)
+
+# reentrant, as building a codec builds those of the nested classes
+_codecs_lock = threading.RLock()
+
+
+def cached_on_class(cls: type, attribute: str, build: Callable[[type], T]) -> T:
+    """
+    Return ``build(data_class)`` for the data class of ``cls`` (or of an
+    instance), building it once and keeping it on the data class as
+    ``attribute``, as what is built refers to the class.
+    """
+    if not isinstance(cls, type):
+        cls = type(cls)
+    data_class = cls._data_class
+    try:
+        return vars(data_class)[attribute]
+    except KeyError:
+        pass
+    with _codecs_lock:
+        try:
+            return vars(data_class)[attribute]
+        except KeyError:
+            pass
+        result = build(data_class)
+        setattr(data_class, attribute, result)
+    return result
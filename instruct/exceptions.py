@@ -2,6 +2,7 @@ from __future__ import annotations
 import builtins
 import typing
 import weakref
+from collections import UserString
 from contextlib import suppress
 
 from .lang import titleize, humanize
@@ -104,10 +105,45 @@ class ExceptionJSONSerializable(JSONSerializable, abstract=True):
     __slots__ = ()
 
 
+class LazyMessage(UserString):
+    """
+    An exception message made by ``format(*args)`` the first time it is needed,
+    so that errors which are caught and discarded never pay for formatting it.
+
+    It stands in for the ``str`` it formats to (``exc.args[0]`` compares, searches
+    and concatenates like the message), so ``args`` must not keep anything that
+    may change before it is formatted: pass ``repr``s rather than live values.
+    """
+
+    def __init__(self, format: Callable[..., str] | str, *args: Any) -> None:
+        # ``UserString`` methods build their results from an already made ``str``
+        if isinstance(format, str):
+            self._format = None
+            self._value: str | None = format
+        else:
+            self._format = format
+            self._value = None
+        self._args = args
+
+    @property
+    def data(self) -> str:
+        if self._value is None:
+            self._value = self._format(*self._args)
+            self._format = None
+            self._args = ()
+        return self._value
+
+    def __str__(self) -> str:
+        return self.data
+
+    def __reduce__(self):
+        return str, (self.data,)
+
+
 class InstructError(Exception, ExceptionJSONSerializable):
-    message: str
     metadata: dict[str, JSON]
     debugging_info: dict[str, JSON]
+    _message: str | LazyMessage
 
     def __str__(self) -> str:
         return self.message
@@ -119,6 +155,17 @@ class InstructError(Exception, ExceptionJSONSerializable):
         self.message = ""
         return self
 
+    @property
+    def message(self) -> str:
+        message = self._message
+        if isinstance(message, LazyMessage):
+            message = self._message = str(message)
+        return message
+
+    @message.setter
+    def message(self, value: str | LazyMessage) -> None:
+        self._message = value
+
     def set_debugging_info(self: Self, val: dict[str, JSON]) -> Self:
         self.debugging_info = val
         return self
@@ -210,6 +257,12 @@ class ValueError(InstructError, builtins.ValueError, ExceptionJSONSerializable):
         super().__init__(message)
 
 
+class SchemaMismatchError(ValueError):
+    """
+    Raised when binary data was written for a different field layout.
+    """
+
+
 class ValidationError(
     InstructError, builtins.ValueError, builtins.TypeError, ExceptionJSONSerializable
 ):
@@ -0,0 +1,144 @@
+"""
+Opt-in counters for where time goes in instruct classes.
+
+A class is instrumented with ``class F(Base, instrumented=True)``, or by setting
+``INSTRUCT_STATS`` to a true value (every class) or a comma separated list of
+class names. Subclasses of an instrumented class are instrumented too.
+
+Instrumented classes have setters generated with counting and timing code in
+them and their ``__init__``, ``__json__`` and ``__reduce__`` wrapped; other
+classes are generated exactly as before and pay nothing. The counts are read
+with ``instruct.stats()`` and zeroed with ``instruct.reset_stats()``.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+import weakref
+from typing import Any, Callable
+
+_perf_counter = time.perf_counter
+
+
+class FieldStats:
+    __slots__ = ("sets", "coercions", "type_failures", "listener_calls", "time")
+
+    def __init__(self) -> None:
+        self.sets = 0
+        self.coercions = 0
+        self.type_failures = 0
+        self.listener_calls = 0
+        # cumulative seconds in the setter, listeners included
+        self.time = 0.0
+
+    def asdict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ClassStats:
+    __slots__ = (
+        "constructions",
+        "construction_time",
+        "to_json",
+        "to_json_time",
+        "pickles",
+        "pickle_time",
+        "fields",
+    )
+
+    def __init__(self) -> None:
+        self.constructions = 0
+        self.construction_time = 0.0
+        self.to_json = 0
+        self.to_json_time = 0.0
+        self.pickles = 0
+        self.pickle_time = 0.0
+        self.fields: dict[str, FieldStats] = {}
+
+    def field(self, name: str) -> FieldStats:
+        try:
+            return self.fields[name]
+        except KeyError:
+            return self.fields.setdefault(name, FieldStats())
+
+    def asdict(self) -> dict[str, Any]:
+        result: dict[str, Any] = {
+            name: getattr(self, name) for name in self.__slots__ if name != "fields"
+        }
+        result["fields"] = {name: value.asdict() for name, value in self.fields.items()}
+        return result
+
+
+_stats: weakref.WeakKeyDictionary[type, ClassStats] = weakref.WeakKeyDictionary()
+_stats_lock = threading.Lock()
+
+
+def stats_for(data_class: type) -> ClassStats:
+    """
+    Return the counters of an instrumented data class, creating them on first use.
+    """
+    try:
+        return _stats[data_class]
+    except KeyError:
+        pass
+    with _stats_lock:
+        try:
+            return _stats[data_class]
+        except KeyError:
+            class_stats = _stats[data_class] = ClassStats()
+    return class_stats
+
+
+def _stats_name(data_class: type) -> str:
+    public_class = data_class.__public_class__()
+    return f"{public_class.__module__}.{public_class.__qualname__}"
+
+
+def stats() -> dict[str, dict[str, Any]]:
+    """
+    Return a snapshot of the counters of every instrumented class that has been
+    used, keyed by ``"module.QualifiedName"``::
+
+        {"app.Order": {"constructions": 2, "construction_time": 1.2e-05, ...,
+                       "fields": {"id": {"sets": 2, "coercions": 1, ...}}}}
+    """
+    with _stats_lock:
+        current = tuple(_stats.items())
+    result: dict[str, dict[str, Any]] = {}
+    for data_class, class_stats in current:
+        result[_stats_name(data_class)] = class_stats.asdict()
+    return result
+
+
+def reset_stats() -> None:
+    """
+    Zero the counters of every instrumented class.
+    """
+    with _stats_lock:
+        _stats.clear()
+
+
+def _timed(function: Callable[..., Any], count: str, total: str) -> Callable[..., Any]:
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        class_stats = stats_for(type(self))
+        started = _perf_counter()
+        try:
+            return function(self, *args, **kwargs)
+        finally:
+            setattr(class_stats, total, getattr(class_stats, total) + _perf_counter() - started)
+            setattr(class_stats, count, getattr(class_stats, count) + 1)
+
+    return wrapper
+
+
+def instrument_data_class(data_class: type) -> None:
+    """
+    Count and time construction, ``to_json`` and pickling of ``data_class``.
+    """
+    data_class.__init__ = _timed(data_class.__init__, "constructions", "construction_time")
+    if hasattr(data_class, "__json__"):
+        data_class.__json__ = _timed(data_class.__json__, "to_json", "to_json_time")
+    data_class.__reduce__ = _timed(data_class.__reduce__, "pickles", "pickle_time")
@@ -0,0 +1,470 @@
+"""
+A pure Python msgpack codec for instruct classes.
+
+An instance is written as a msgpack array of its schema version followed by its
+field values in ``_columns`` order; nested instances are arrays of their field
+values. A batch of instances of one class is a single array of the schema
+version followed by one such array per instance. The output is plain msgpack,
+so any msgpack implementation can read it.
+
+Decoding checks the schema version and writes the values straight into the
+slots (see ``trusted_construct``), converting nested arrays back into instances
+and lists into the tuples/sets the field is declared as.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+import typing
+from collections import abc
+from typing import Any, Callable, NamedTuple, Optional, Union
+
+from .codecs import CONTAINER_TYPES, MAPPING_TYPES, cached_on_class
+from .exceptions import TypeError, ValueError, SchemaMismatchError
+from .types import BaseAtomic
+from .typing import NoneType, get_origin, get_args, Annotated
+
+if typing.TYPE_CHECKING:
+    from .typing import Atomic
+
+_U16 = struct.Struct(">H")
+_U32 = struct.Struct(">I")
+_U64 = struct.Struct(">Q")
+_I8 = struct.Struct(">b")
+_I16 = struct.Struct(">h")
+_I32 = struct.Struct(">i")
+_I64 = struct.Struct(">q")
+_F32 = struct.Struct(">f")
+_F64 = struct.Struct(">d")
+
+
+def _pack_array_header(out: bytearray, size: int) -> None:
+    if size < 16:
+        out.append(0x90 | size)
+    elif size < 0x10000:
+        out.append(0xDC)
+        out += _U16.pack(size)
+    else:
+        out.append(0xDD)
+        out += _U32.pack(size)
+
+
+def _pack_int(out: bytearray, value: int) -> None:
+    if 0 <= value < 0x80:
+        out.append(value)
+    elif -32 <= value < 0:
+        out.append(value & 0xFF)
+    elif value >= 0:
+        if value <= 0xFF:
+            out.append(0xCC)
+            out.append(value)
+        elif value <= 0xFFFF:
+            out.append(0xCD)
+            out += _U16.pack(value)
+        elif value <= 0xFFFFFFFF:
+            out.append(0xCE)
+            out += _U32.pack(value)
+        else:
+            out.append(0xCF)
+            out += _U64.pack(value)
+    elif value >= -0x80:
+        out.append(0xD0)
+        out += _I8.pack(value)
+    elif value >= -0x8000:
+        out.append(0xD1)
+        out += _I16.pack(value)
+    elif value >= -0x80000000:
+        out.append(0xD2)
+        out += _I32.pack(value)
+    else:
+        out.append(0xD3)
+        out += _I64.pack(value)
+
+
+def pack_into(out: bytearray, value: Any) -> None:
+    """
+    Append the msgpack form of ``value`` to ``out``. Instruct instances are
+    written as an array of their field values.
+    """
+    if value is None:
+        out.append(0xC0)
+    elif value is True:
+        out.append(0xC3)
+    elif value is False:
+        out.append(0xC2)
+    elif isinstance(value, int):
+        _pack_int(out, value)
+    elif isinstance(value, float):
+        out.append(0xCB)
+        out += _F64.pack(value)
+    elif isinstance(value, str):
+        data = value.encode("utf8")
+        size = len(data)
+        if size < 32:
+            out.append(0xA0 | size)
+        elif size < 0x100:
+            out.append(0xD9)
+            out.append(size)
+        elif size < 0x10000:
+            out.append(0xDA)
+            out += _U16.pack(size)
+        else:
+            out.append(0xDB)
+            out += _U32.pack(size)
+        out += data
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        size = len(value)
+        if size < 0x100:
+            out.append(0xC4)
+            out.append(size)
+        elif size < 0x10000:
+            out.append(0xC5)
+            out += _U16.pack(size)
+        else:
+            out.append(0xC6)
+            out += _U32.pack(size)
+        out += value
+    elif isinstance(value, BaseAtomic):
+        values = value._astuple()
+        _pack_array_header(out, len(values))
+        for item in values:
+            pack_into(out, item)
+    elif isinstance(value, abc.Mapping):
+        size = len(value)
+        if size < 16:
+            out.append(0x80 | size)
+        elif size < 0x10000:
+            out.append(0xDE)
+            out += _U16.pack(size)
+        else:
+            out.append(0xDF)
+            out += _U32.pack(size)
+        for key, item in value.items():
+            pack_into(out, key)
+            pack_into(out, item)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        _pack_array_header(out, len(value))
+        for item in value:
+            pack_into(out, item)
+    else:
+        raise TypeError(f"Cannot msgpack {type(value).__name__}", type(value).__name__, value)
+
+
+def packb(value: Any) -> bytes:
+    out = bytearray()
+    pack_into(out, value)
+    return bytes(out)
+
+
+def _unpack_array(data: bytes, offset: int, size: int) -> tuple[list, int]:
+    items = []
+    for _ in range(size):
+        item, offset = unpack_from(data, offset)
+        items.append(item)
+    return items, offset
+
+
+def _unpack_map(data: bytes, offset: int, size: int) -> tuple[dict, int]:
+    result = {}
+    for _ in range(size):
+        key, offset = unpack_from(data, offset)
+        result[key], offset = unpack_from(data, offset)
+    return result, offset
+
+
+def _unpack_str(data: bytes, offset: int, size: int) -> tuple[str, int]:
+    end = offset + size
+    if end > len(data):
+        raise IndexError(end)
+    return data[offset:end].decode("utf8"), end
+
+
+def _unpack_bin(data: bytes, offset: int, size: int) -> tuple[bytes, int]:
+    end = offset + size
+    if end > len(data):
+        raise IndexError(end)
+    return data[offset:end], end
+
+
+def unpack_from(data: bytes, offset: int = 0) -> tuple[Any, int]:
+    """
+    Read one msgpack value from ``data`` at ``offset``, returning it and the
+    offset after it. Arrays are read as lists and maps as dicts.
+    """
+    code = data[offset]
+    offset += 1
+    if code < 0x80:
+        return code, offset
+    if code >= 0xE0:
+        return code - 0x100, offset
+    if code <= 0x8F:
+        return _unpack_map(data, offset, code & 0x0F)
+    if code <= 0x9F:
+        return _unpack_array(data, offset, code & 0x0F)
+    if code <= 0xBF:
+        return _unpack_str(data, offset, code & 0x1F)
+    if code == 0xC0:
+        return None, offset
+    if code == 0xC2:
+        return False, offset
+    if code == 0xC3:
+        return True, offset
+    if code == 0xC4:
+        return _unpack_bin(data, offset + 1, data[offset])
+    if code == 0xC5:
+        return _unpack_bin(data, offset + 2, _U16.unpack_from(data, offset)[0])
+    if code == 0xC6:
+        return _unpack_bin(data, offset + 4, _U32.unpack_from(data, offset)[0])
+    if code == 0xCA:
+        return _F32.unpack_from(data, offset)[0], offset + 4
+    if code == 0xCB:
+        return _F64.unpack_from(data, offset)[0], offset + 8
+    if code == 0xCC:
+        return data[offset], offset + 1
+    if code == 0xCD:
+        return _U16.unpack_from(data, offset)[0], offset + 2
+    if code == 0xCE:
+        return _U32.unpack_from(data, offset)[0], offset + 4
+    if code == 0xCF:
+        return _U64.unpack_from(data, offset)[0], offset + 8
+    if code == 0xD0:
+        return _I8.unpack_from(data, offset)[0], offset + 1
+    if code == 0xD1:
+        return _I16.unpack_from(data, offset)[0], offset + 2
+    if code == 0xD2:
+        return _I32.unpack_from(data, offset)[0], offset + 4
+    if code == 0xD3:
+        return _I64.unpack_from(data, offset)[0], offset + 8
+    if code == 0xD9:
+        return _unpack_str(data, offset + 1, data[offset])
+    if code == 0xDA:
+        return _unpack_str(data, offset + 2, _U16.unpack_from(data, offset)[0])
+    if code == 0xDB:
+        return _unpack_str(data, offset + 4, _U32.unpack_from(data, offset)[0])
+    if code == 0xDC:
+        return _unpack_array(data, offset + 2, _U16.unpack_from(data, offset)[0])
+    if code == 0xDD:
+        return _unpack_array(data, offset + 4, _U32.unpack_from(data, offset)[0])
+    if code == 0xDE:
+        return _unpack_map(data, offset + 2, _U16.unpack_from(data, offset)[0])
+    if code == 0xDF:
+        return _unpack_map(data, offset + 4, _U32.unpack_from(data, offset)[0])
+    raise ValueError(f"Unsupported msgpack type 0x{code:02x} at {offset - 1}")
+
+
+def unpackb(data: bytes | bytearray | memoryview) -> Any:
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    try:
+        value, offset = unpack_from(data)
+    except (IndexError, struct.error) as e:
+        raise ValueError("Truncated msgpack data") from e
+    if offset != len(data):
+        raise ValueError(f"{len(data) - offset} trailing bytes after msgpack value")
+    return value
+
+
+Converter = Optional[Callable[[Any], Any]]
+
+
+def _describe(hint: Any) -> Any:
+    if isinstance(hint, type) and issubclass(hint, BaseAtomic) and hasattr(hint, "_columns"):
+        return ("struct", tuple((field, _describe(hint._slots[field])) for field in hint._columns))
+    args = get_args(hint)
+    if args:
+        return (repr(get_origin(hint)), tuple(_describe(arg) for arg in args))
+    return repr(hint)
+
+
+def _converter(hint: Any, field: str) -> Converter:
+    """
+    Return how to turn the decoded msgpack value of a field into the declared
+    type, or None if it is already right.
+
+    Values are not tagged with their type, so a union is only accepted if none
+    of its members need converting.
+    """
+    origin = get_origin(hint)
+    if origin is Annotated:
+        return _converter(get_args(hint)[0], field)
+    if origin is Union:
+        members = tuple(arg for arg in get_args(hint) if arg is not NoneType)
+        if len(members) != 1:
+            if any(_converter(member, field) is not None for member in members):
+                raise TypeError(
+                    f"Cannot msgpack {field!r} of union {hint!r}, its members are "
+                    "not told apart when decoded",
+                    field,
+                    hint,
+                )
+            # let the values through as decoded
+            return None
+        convert = _converter(members[0], field)
+        if convert is None:
+            return None
+
+        def convert_optional(value: Any) -> Any:
+            if value is None:
+                return None
+            return convert(value)
+
+        return convert_optional
+    if isinstance(hint, type) and issubclass(hint, BaseAtomic) and hasattr(hint, "_columns"):
+        return codec_for(hint).construct
+    if origin in CONTAINER_TYPES:
+        args = get_args(hint)
+        # decoded arrays are lists already
+        container = CONTAINER_TYPES[origin]
+        if container is list:
+            container = None
+        if origin is tuple and args and not (len(args) == 2 and args[1] is Ellipsis):
+            converters = tuple(_converter(arg, field) for arg in args)
+            if not any(converters):
+                return tuple
+
+            def convert_fixed(value: list) -> tuple:
+                return tuple(
+                    item if convert is None else convert(item)
+                    for convert, item in zip(converters, value)
+                )
+
+            return convert_fixed
+        convert_item = _converter(args[0], field) if args else None
+        if convert_item is None:
+            return container
+
+        def convert_items(value: list) -> Any:
+            items = [convert_item(item) for item in value]
+            if container is None:
+                return items
+            return container(items)
+
+        return convert_items
+    if origin in MAPPING_TYPES:
+        args = get_args(hint)
+        if not args:
+            return None
+        convert_key, convert_value = _converter(args[0], field), _converter(args[1], field)
+        if convert_key is None and convert_value is None:
+            return None
+
+        def convert_mapping(value: dict) -> dict:
+            return {
+                key if convert_key is None else convert_key(key): (
+                    item if convert_value is None else convert_value(item)
+                )
+                for key, item in value.items()
+            }
+
+        return convert_mapping
+    return None
+
+
+class MsgpackCodec(NamedTuple):
+    version: int
+    construct: Callable[[list], Any]
+
+
+def _build_codec(data_class: type[Atomic]) -> MsgpackCodec:
+    schema = _describe(data_class)
+    version = int.from_bytes(hashlib.sha256(repr(schema).encode("utf8")).digest()[:4], "big")
+    field_count = len(data_class._columns)
+    converters = tuple(
+        (index, convert)
+        for index, convert in enumerate(
+            _converter(data_class._slots[field], field) for field in data_class._columns
+        )
+        if convert is not None
+    )
+    trusted_construct = data_class._trusted_construct
+    qualname = data_class.__qualname__
+
+    def construct(values: list) -> Any:
+        if len(values) != field_count:
+            raise ValueError(f"Expected {field_count} values for {qualname}, got {len(values)}")
+        for index, convert in converters:
+            value = values[index]
+            if value is not None:
+                values[index] = convert(value)
+        return trusted_construct(*values)
+
+    return MsgpackCodec(version, construct)
+
+
+def codec_for(cls: type[Atomic]) -> MsgpackCodec:
+    """
+    Return the (cached) msgpack codec for an instruct class or instance.
+    """
+    return cached_on_class(cls, "_msgpack_codec", _build_codec)
+
+
+def _check_version(cls: type[Atomic], codec: MsgpackCodec, payload: Any) -> list:
+    if not isinstance(payload, list) or not payload:
+        raise ValueError(f"Not a msgpack payload for {cls.__qualname__}")
+    version = payload[0]
+    if version != codec.version:
+        raise SchemaMismatchError(
+            f"Data was written with schema version {version!r}, "
+            f"{cls.__qualname__} has schema version {codec.version}",
+            expected=codec.version,
+            received=version,
+        )
+    return payload
+
+
+def dumps(instance: Atomic) -> bytes:
+    """
+    Return ``instance`` as a msgpack array of its schema version and field values.
+    """
+    codec = codec_for(instance)
+    values = instance._astuple()
+    out = bytearray()
+    _pack_array_header(out, len(values) + 1)
+    _pack_int(out, codec.version)
+    for value in values:
+        pack_into(out, value)
+    return bytes(out)
+
+
+def dumps_many(instances: abc.Iterable[Atomic], cls: type[Atomic] | None = None) -> bytes:
+    """
+    Return instances of one class as a single msgpack array of the schema version
+    followed by each instance's field values.
+
+    The class is that of the first instance unless ``cls`` is given, which it
+    must be for a batch that may be empty.
+    """
+    instances = tuple(instances)
+    if cls is None:
+        if not instances:
+            raise ValueError("dumps_many() needs the class of an empty batch as cls")
+        cls = type(instances[0])
+    data_class = cls._data_class
+    codec = codec_for(data_class)
+    out = bytearray()
+    _pack_array_header(out, len(instances) + 1)
+    _pack_int(out, codec.version)
+    for instance in instances:
+        if type(instance)._data_class is not data_class:
+            raise TypeError(
+                f"dumps_many() got a {type(instance).__qualname__} in a batch of "
+                f"{data_class.__qualname__}",
+                "instances",
+                instance,
+            )
+        pack_into(out, instance)
+    return bytes(out)
+
+
+def loads(cls: type[Atomic], data: bytes | bytearray | memoryview) -> Atomic:
+    codec = codec_for(cls)
+    payload = _check_version(cls, codec, unpackb(data))
+    return codec.construct(payload[1:])
+
+
+def loads_many(cls: type[Atomic], data: bytes | bytearray | memoryview) -> tuple[Atomic, ...]:
+    codec = codec_for(cls)
+    _, *rows = _check_version(cls, codec, unpackb(data))
+    construct = codec.construct
+    return tuple(construct(row) for row in rows)
@@ -0,0 +1,124 @@
+"""
+Flat column projections of (subtracted) instruct classes.
+
+``projection(Cls - {"a": {"b"}})`` lists the columns a query has to select to
+load that class, with embedded classes flattened into dotted paths
+(``"a.c"``), and a loader that builds the instance tree from a row of values
+in that order.
+"""
+
+from __future__ import annotations
+
+import threading
+import typing
+from typing import Any, Callable, NamedTuple, Sequence, Tuple, Union
+
+from .types import BaseAtomic
+from .typing import get_origin, get_args, Annotated
+
+if typing.TYPE_CHECKING:
+    from .typing import Atomic
+
+NoneType = type(None)
+
+
+class Projection(NamedTuple):
+    columns: Tuple[str, ...]
+    load: Callable[[Sequence[Any]], Any]
+
+
+_projections_lock = threading.RLock()
+
+
+def _embedded_class(hint: Any) -> tuple[type[Atomic] | None, bool]:
+    """
+    Return the instruct class a field embeds directly (not in a collection) and
+    whether the field is optional.
+    """
+    origin = get_origin(hint)
+    if origin is Annotated:
+        return _embedded_class(get_args(hint)[0])
+    if origin is Union:
+        members = tuple(arg for arg in get_args(hint) if arg is not NoneType)
+        if len(members) == 1 and len(members) < len(get_args(hint)):
+            embedded, _ = _embedded_class(members[0])
+            return embedded, True
+        return None, False
+    if isinstance(hint, type) and issubclass(hint, BaseAtomic) and hasattr(hint, "_columns"):
+        return hint, False
+    return None, False
+
+
+def _plan(
+    cls: type[Atomic],
+    prefix: str,
+    separator: str,
+    columns: list[str],
+    namespace: dict[str, Any],
+    trusted: bool,
+) -> str:
+    """
+    Append the columns of ``cls`` and return the expression constructing it from
+    ``row``.
+    """
+    constructor = f"_construct_{len(namespace)}"
+    namespace[constructor] = cls._trusted_construct if trusted else cls
+    arguments = []
+    for field in cls._columns:
+        embedded, optional = _embedded_class(cls._slots[field])
+        if embedded is None:
+            arguments.append(f"row[{len(columns)}]")
+            columns.append(f"{prefix}{field}")
+            continue
+        first = len(columns)
+        expression = _plan(
+            embedded, f"{prefix}{field}{separator}", separator, columns, namespace, trusted
+        )
+        if optional:
+            # an outer join leaves every column of a missing embedded class null
+            present = " or ".join(
+                f"row[{index}] is not None" for index in range(first, len(columns))
+            )
+            expression = f"({expression} if {present} else None)"
+        arguments.append(expression)
+    return f"{constructor}({', '.join(arguments)})"
+
+
+def projection(cls: type[Atomic], *, separator: str = ".", trusted: bool = False) -> Projection:
+    """
+    Return the flat ``columns`` needed to load ``cls`` and a ``load(row)`` that
+    builds an instance from a sequence of values in the same order.
+
+    Fields holding an instruct class (or an ``Optional`` one) are flattened into
+    ``field{separator}subfield`` columns; every other field, including
+    collections of instruct classes, is a single column. An optional embedded
+    class whose columns are all ``None`` loads as ``None``. With ``trusted`` the
+    values are written into the slots without validation (see
+    ``trusted_construct``).
+    """
+    if not isinstance(cls, type):
+        cls = type(cls)
+    data_class = cls._data_class
+    key = (separator, trusted)
+    try:
+        return vars(data_class)["_projections"][key]
+    except KeyError:
+        pass
+    with _projections_lock:
+        projections = vars(data_class).get("_projections")
+        if projections is None:
+            # kept on the class as the loaders refer to it
+            projections = data_class._projections = {}
+        try:
+            return projections[key]
+        except KeyError:
+            pass
+        columns: list[str] = []
+        namespace: dict[str, Any] = {}
+        expression = _plan(cls, "", separator, columns, namespace, trusted)
+        code = compile(
+            f"lambda row: {expression}", f"<instruct:projection {cls.__qualname__}>", "eval"
+        )
+        load = eval(code, namespace)
+        projections[key] = result = Projection(tuple(columns), load)
+    return result
@@ -0,0 +1,419 @@
+"""
+Reading and writing instruct classes as streams of records (NDJSON, CSV).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+import datetime
+import functools
+import json
+import typing
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, Literal, Union
+
+from .typing import get_origin, get_args, Annotated
+
+if typing.TYPE_CHECKING:
+    from .typing import Atomic
+
+Format = Literal["ndjson", "csv", "tsv"]
+
+
+NoneType = type(None)
+
+_TRUE = frozenset(("1", "true", "t", "yes", "y", "on"))
+_FALSE = frozenset(("0", "false", "f", "no", "n", "off", ""))
+
+
+def _parse_bool(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in _TRUE:
+        return True
+    if lowered in _FALSE:
+        return False
+    raise ValueError(f"{value!r} is not a boolean")
+
+
+def column_converter(hint: Any) -> Callable[[str], Any] | None:
+    """
+    Return the function that parses a CSV cell for a field declared as ``hint``,
+    or None to keep the string. Handles ``int``, ``float``, ``bool``, ``datetime``,
+    ``date``, ``time``, ``Literal[...]`` and ``Optional`` of them (where an empty
+    cell is None).
+    """
+    origin = get_origin(hint)
+    if origin is Annotated:
+        return column_converter(get_args(hint)[0])
+    if origin is Union:
+        members = tuple(arg for arg in get_args(hint) if arg is not NoneType)
+        if len(members) != 1:
+            return None
+        convert = column_converter(members[0])
+        if convert is None:
+            if members[0] is str:
+                return None
+            return lambda value: value or None
+
+        def convert_optional(value: str) -> Any:
+            if not value:
+                return None
+            return convert(value)
+
+        return convert_optional
+    if origin is Literal:
+        choices = {str(choice): choice for choice in get_args(hint)}
+
+        def convert_literal(value: str) -> Any:
+            try:
+                return choices[value]
+            except KeyError:
+                raise ValueError(f"{value!r} is not one of {tuple(choices)}") from None
+
+        return convert_literal
+    if hint is bool:
+        return _parse_bool
+    if hint in (int, float):
+        return hint
+    if hint in (datetime.datetime, datetime.date, datetime.time):
+        return hint.fromisoformat
+    if hint in (bytes, bytearray):
+        return functools.partial(_decode_base64, hint)
+    return None
+
+
+def _decode_base64(hint: type, value: str) -> Any:
+    if not value.startswith("base64:"):
+        raise ValueError(f"{value!r} is not base64: encoded")
+    return hint(urlsafe_b64decode(value[len("base64:") :]))
+
+
+def _encode_base64(value: Any) -> str:
+    return f"base64:{urlsafe_b64encode(value).decode()}"
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat()
+
+
+def column_formatter(hint: Any) -> Callable[[Any], Any] | None:
+    """
+    The reverse of ``column_converter``: return the function that turns a value of
+    a field declared as ``hint`` into a cell ``column_converter`` can read back, or
+    None to leave it to ``csv.writer``. ``bytes`` use the ``base64:`` convention of
+    ``to_json``.
+    """
+    origin = get_origin(hint)
+    if origin is Annotated:
+        return column_formatter(get_args(hint)[0])
+    if origin is Union:
+        members = tuple(arg for arg in get_args(hint) if arg is not NoneType)
+        if len(members) != 1:
+            return None
+        # None is written as an empty cell by ``csv.writer``
+        return column_formatter(members[0])
+    if hint in (bytes, bytearray):
+        return _encode_base64
+    if hint in (datetime.datetime, datetime.date, datetime.time):
+        return _isoformat
+    return None
+
+
+def _missing_cell(row: list[str], column: str) -> ValueError:
+    return ValueError(f"Row {row!r} is too short to have a {column!r} cell")
+
+
+def csv_row_constructor(
+    cls: type[Atomic], header: Iterable[str], *, trusted: bool = False
+) -> Callable[[list[str]], Atomic]:
+    """
+    Map the ``header`` columns to the fields of ``cls`` once and return a function
+    that builds an instance from a row of cells. Columns that are not fields
+    are ignored.
+
+    With ``trusted`` the converted values are written directly into the slots and
+    a cell that fails to convert raises ``ValueError``; otherwise the instance is
+    constructed normally and such a cell is handed to the field as-is, so it is
+    reported (or coerced) like any other bad value. Either way a row too short to
+    have a cell for one of the columns raises ``ValueError``.
+    """
+    fields = tuple(cls._columns)
+    field_positions = {field: index for index, field in enumerate(fields)}
+    columns = []
+    for column_index, column in enumerate(header):
+        if column in field_positions:
+            converter = column_converter(cls._slots[column])
+            columns.append((column_index, field_positions[column], column, converter))
+    columns = tuple(columns)
+    covers_all = len({field_index for _, field_index, _, _ in columns}) == len(fields)
+
+    if trusted:
+
+        def convert_trusted(row: list[str]) -> Iterator[tuple[str, int, Any]]:
+            for column_index, field_index, column, converter in columns:
+                try:
+                    value = row[column_index]
+                except IndexError:
+                    raise _missing_cell(row, column) from None
+                if converter is not None:
+                    try:
+                        value = converter(value)
+                    except ValueError as e:
+                        raise ValueError(f"Unable to convert {column!r}: {e}") from e
+                yield column, field_index, value
+
+        if covers_all:
+            construct = cls._trusted_construct
+
+            def build_trusted(row: list[str]) -> Atomic:
+                values = [None] * len(fields)
+                for _, field_index, value in convert_trusted(row):
+                    values[field_index] = value
+                return construct(*values)
+
+            return build_trusted
+
+        from_dict = cls._trusted_from_dict
+
+        # fields without a column keep their defaults
+        def build_trusted_partial(row: list[str]) -> Atomic:
+            return from_dict({column: value for column, _, value in convert_trusted(row)})
+
+        return build_trusted_partial
+
+    def convert_row(row: list[str]) -> Iterator[tuple[str, int, Any]]:
+        for column_index, field_index, column, converter in columns:
+            try:
+                value = row[column_index]
+            except IndexError:
+                raise _missing_cell(row, column) from None
+            if converter is not None:
+                try:
+                    value = converter(value)
+                except ValueError:
+                    pass
+            yield column, field_index, value
+
+    if covers_all:
+
+        def build_positional(row: list[str]) -> Atomic:
+            values = [None] * len(fields)
+            for _, field_index, value in convert_row(row):
+                values[field_index] = value
+            return cls(*values)
+
+        return build_positional
+
+    def build_keywords(row: list[str]) -> Atomic:
+        return cls(**{column: value for column, _, value in convert_row(row)})
+
+    return build_keywords
+
+
+def read_csv(
+    cls: type[Atomic],
+    fileobj: Iterable[str],
+    *,
+    delimiter: str = ",",
+    trusted: bool = False,
+    **reader_options: Any,
+) -> Iterator[Atomic]:
+    """
+    Yield an instance of ``cls`` per row of a CSV file whose first row names the
+    fields. See ``csv_row_constructor`` for how cells are converted.
+    """
+    reader = csv.reader(fileobj, delimiter=delimiter, **reader_options)
+    try:
+        header = next(reader)
+    except StopIteration:
+        return
+    build = csv_row_constructor(cls, header, trusted=trusted)
+    for row in reader:
+        if row:
+            yield build(row)
+
+
+def write_csv(
+    cls: type[Atomic],
+    fileobj: Any,
+    instances: Iterable[Atomic],
+    *,
+    delimiter: str = ",",
+    header: bool = True,
+    **writer_options: Any,
+) -> int:
+    """
+    Write ``instances`` as CSV rows in ``keys(cls)`` order, preceded by a header
+    row unless ``header`` is false. Unset fields are written as empty cells and
+    values are formatted so ``read_csv`` reads them back (see ``column_formatter``).
+    Returns the number of instances written; raises ``TypeError`` for an instance
+    that is not a ``cls``.
+    """
+    writer = csv.writer(fileobj, delimiter=delimiter, **writer_options)
+    if header:
+        writer.writerow(cls._columns)
+    formatters = tuple(
+        (index, formatter)
+        for index, formatter in enumerate(map(column_formatter, map(cls._slots.get, cls._columns)))
+        if formatter is not None
+    )
+    count = 0
+
+    def rows() -> Iterator[Any]:
+        nonlocal count
+        for instance in instances:
+            if not isinstance(instance, cls):
+                raise TypeError(
+                    f"Unable to write {type(instance).__name__} as a row of {cls.__name__}"
+                )
+            count += 1
+            if not formatters:
+                yield instance._astuple()
+                continue
+            row = list(instance._astuple())
+            for index, formatter in formatters:
+                if row[index] is not None:
+                    row[index] = formatter(row[index])
+            yield row
+
+    writer.writerows(rows())
+    return count
+
+
+def _row_builder(
+    cls: type[Atomic], format: Format, header: list[str] | None, *, trusted: bool
+) -> Callable[[list[Any]], list[Any]]:
+    """
+    Return a function that turns a batch of records (decoded lines for NDJSON,
+    parsed rows for CSV) into instances.
+    """
+    if format == "ndjson":
+        if trusted:
+            construct = cls.from_json
+            return lambda lines: [
+                construct(json.loads(line), trusted=True) for line in lines if line.strip()
+            ]
+        return lambda lines: [cls(**json.loads(line)) for line in lines if line.strip()]
+    assert header is not None
+    build_row = csv_row_constructor(cls, header, trusted=trusted)
+    return lambda rows: [build_row(row) for row in rows if row]
+
+
+def _discard(pending: Iterable[asyncio.Future[Any]]) -> None:
+    """
+    Cancel the batches still in flight, retrieving the error of those already
+    done so asyncio does not log it as never retrieved.
+    """
+    for future in pending:
+        if not future.cancel() and not future.cancelled():
+            future.exception()
+
+
+async def aiter_from(
+    cls: type[Atomic],
+    stream: Any,
+    *,
+    format: Format = "ndjson",
+    batch_size: int = 256,
+    executor: Executor | None = None,
+    offload_threshold: int = 64,
+    max_pending: int = 2,
+    trusted: bool = False,
+    encoding: str = "utf8",
+) -> AsyncIterator[Atomic]:
+    """
+    Yield instances of ``cls`` read from ``stream``, an ``asyncio.StreamReader``
+    or anything with an awaitable ``readline()``.
+
+    ``format`` is ``"ndjson"`` (one JSON object per line) or ``"csv"``/``"tsv"``
+    with a header row naming the fields, where a quoted cell may span lines.
+    Records are read and constructed ``batch_size`` at a time. With an
+    ``executor``, batches of at least ``offload_threshold`` records are
+    constructed on it while the next batch is read. No more than ``max_pending``
+    batches are in flight, so a slow consumer stops the stream being read rather
+    than buffering it. ``trusted`` uses the ``from_json(..., trusted=True)``
+    decoder for NDJSON.
+    """
+    if format not in ("ndjson", "csv", "tsv"):
+        raise ValueError(f"Unknown format {format!r}")
+    if batch_size < 1 or max_pending < 1:
+        raise ValueError("batch_size and max_pending must be positive")
+    loop = asyncio.get_running_loop()
+
+    async def read_line() -> str | None:
+        line = await stream.readline()
+        if not line:
+            return None
+        if isinstance(line, bytes):
+            line = line.decode(encoding)
+        return line
+
+    read_record: Callable[[], Awaitable[Any]] = read_line
+    header = None
+    if format != "ndjson":
+        buffered: deque[str] = deque()
+        # one reader over the whole stream, only advanced once ``buffered`` holds
+        # a complete record (or the stream ended), so it never cuts one in two
+        reader = csv.reader(
+            iter(lambda: buffered.popleft() if buffered else None, None),
+            delimiter="\t" if format == "tsv" else ",",
+        )
+
+        async def read_row() -> list[str] | None:
+            in_quotes = False
+            while True:
+                line = await read_line()
+                if line is None:
+                    if not buffered:
+                        return None
+                    # an unterminated quote, left to ``csv.reader`` as in ``read_csv``
+                    break
+                buffered.append(line)
+                # a quote character inside a quoted cell is doubled, so an odd
+                # count opens or closes a cell spanning lines
+                if line.count('"') % 2:
+                    in_quotes = not in_quotes
+                if not in_quotes:
+                    break
+            return next(reader)
+
+        read_record = read_row
+        header = await read_row()
+        if header is None:
+            return
+    build = _row_builder(cls, format, header, trusted=trusted)
+
+    pending: deque[asyncio.Future[list[Any]]] = deque()
+    finished = False
+    try:
+        while not finished:
+            records = []
+            while len(records) < batch_size:
+                record = await read_record()
+                if record is None:
+                    finished = True
+                    break
+                records.append(record)
+            if records:
+                if executor is not None and len(records) >= offload_threshold:
+                    pending.append(loop.run_in_executor(executor, build, records))
+                else:
+                    future = loop.create_future()
+                    try:
+                        future.set_result(build(records))
+                    except Exception as e:
+                        # raise it in order, after the batches before it
+                        future.set_exception(e)
+                    pending.append(future)
+            # drain down to the in flight limit before reading any more
+            while pending and (finished or len(pending) >= max_pending):
+                for instance in await pending.popleft():
+                    yield instance
+            if not finished:
+                # let other tasks run between batches
+                await asyncio.sleep(0)
+    finally:
+        _discard(pending)
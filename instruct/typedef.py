@@ -6,6 +6,7 @@ import warnings
 import typing
 from functools import wraps
 from types import FunctionType
+from weakref import WeakValueDictionary
 from contextlib import suppress
 from collections.abc import (
     Mapping as AbstractMapping,
@@ -1092,6 +1093,14 @@ else:
         return False
 
 
+# (hint, repr(hint), check_ranges) -> checker type. The repr keeps hints that
+# compare equal but render differently (i.e. ``Union[int, str]`` vs
+# ``Union[str, int]``) apart so the checker names stay as written.
+_typedef_cache: WeakValueDictionary[tuple[Any, str, tuple[Range, ...]], type] = (
+    WeakValueDictionary()
+)
+
+
 @assert_never_null
 def parse_typedef(
     typedef: tuple[type, ...] | list[type],
@@ -1111,8 +1120,28 @@ def parse_typedef(
     List[int] -> (IntList,) where IntList is a custom type with a special
     metaclass that executes an embedded function for checking if all members
     of the collection is the right type. i.e all(isintance(item, int) for item in object)
+
+    Identical typedefs share one checker type for as long as something uses it.
     """
+    key = (typedef, repr(typedef), check_ranges)
+    try:
+        return _typedef_cache[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # unhashable typedef (i.e. a dict of fields)
+        return _parse_typedef(typedef, check_ranges=check_ranges)
+    new_type = _parse_typedef(typedef, check_ranges=check_ranges)
+    if isinstance(new_type, CustomTypeCheckMetaBase):
+        _typedef_cache[key] = new_type
+    return new_type
 
+
+def _parse_typedef(
+    typedef: tuple[type, ...] | list[type],
+    *,
+    check_ranges: tuple[Range, ...] = (),
+) -> type | tuple[type]:
     if not is_typing_definition(typedef):
         # ARJ: Okay, we're not a typing module descendant.
         # Are we a type itelf?
@@ -1,7 +1,7 @@
 from __future__ import annotations
 import sys
 import inspect
-from collections import UserDict
+from collections import OrderedDict, UserDict
 from collections.abc import (
     Mapping as AbstractMapping,
     Sequence as AbstractSequence,
@@ -27,6 +27,7 @@ from typing import (
     Tuple,
     KeysView,
     Collection,
+    NamedTuple,
     cast as cast_type,
     TYPE_CHECKING,
     overload,
@@ -126,6 +127,89 @@ class AbstractAtomic:
 
 Ts = TypeVarTuple("Ts")
 
+
+class GenericCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    retained: int
+    maxretained: int
+
+
+# public class -> {args: specialized class}
+generic_cache: WeakKeyDictionary[type, WeakValueDictionary[Tuple[Any, ...], type]] = (
+    WeakKeyDictionary()
+)
+# public class -> (TypeVar field -> TypeVar, fields that need a nested specialization)
+generic_field_plans: WeakKeyDictionary[type, Tuple[Mapping[str, Any], Tuple[str, ...]]] = (
+    WeakKeyDictionary()
+)
+# Strong references to the most recently used specializations so that ones
+# only ever used inline (``Page[User](...)``) are not rebuilt every time.
+_retained_generics: OrderedDict[Tuple[type, Tuple[Any, ...]], type] = OrderedDict()
+_generic_cache_stats = {"hits": 0, "misses": 0, "maxretained": 128}
+
+
+def generic_cache_info() -> GenericCacheInfo:
+    """
+    Report the hits/misses of ``Genericizable`` specialization, the number of
+    live specializations and how many are strongly retained.
+    """
+    return GenericCacheInfo(
+        _generic_cache_stats["hits"],
+        _generic_cache_stats["misses"],
+        sum(len(specializations) for specializations in generic_cache.values()),
+        len(_retained_generics),
+        _generic_cache_stats["maxretained"],
+    )
+
+
+def clear_generic_cache(*, maxretained: int | None = None) -> None:
+    """
+    Forget all specializations and reset the statistics.
+
+    ``maxretained`` sets how many recently used specializations are kept alive
+    (``0`` disables strong retention).
+    """
+    generic_cache.clear()
+    generic_field_plans.clear()
+    _retained_generics.clear()
+    _generic_cache_stats["hits"] = _generic_cache_stats["misses"] = 0
+    if maxretained is not None:
+        if maxretained < 0:
+            raise ValueError(f"maxretained must be >= 0, not {maxretained!r}")
+        _generic_cache_stats["maxretained"] = maxretained
+
+
+def _retain_generic(cls: type, args: Tuple[Any, ...], specialized: type) -> None:
+    maxretained = _generic_cache_stats["maxretained"]
+    if not maxretained:
+        return
+    key = (cls, args)
+    _retained_generics[key] = specialized
+    _retained_generics.move_to_end(key)
+    while len(_retained_generics) > maxretained:
+        _retained_generics.popitem(last=False)
+
+
+def _generic_field_plan(cls) -> Tuple[Mapping[str, Any], Tuple[str, ...]]:
+    try:
+        return generic_field_plans[cls]
+    except KeyError:
+        pass
+    typevar_fields = {}
+    complex_fields = []
+    typehints = get_type_hints(cls, include_extras=True)
+    for field_name in cls.__parameters_by_field__:
+        typehint = typehints[field_name]
+        if isinstance(typehint, TypeVar):
+            typevar_fields[field_name] = typehint
+        else:
+            complex_fields.append(field_name)
+    plan = generic_field_plans[cls] = (typevar_fields, tuple(complex_fields))
+    return plan
+
+
 # ARJ: Because we cannot inherit Generic (due to a metaclass layout conflict),
 # we must instead create a wrap-around type that can be used with
 # the AtomicMeta class
@@ -134,7 +218,6 @@ if TYPE_CHECKING:
     class Genericizable(Generic[Unpack[Ts]]): ...
 
 else:
-    generic_cache = WeakKeyDictionary()
 
     class Genericizable:
         __slots__ = ()
@@ -170,37 +253,40 @@ else:
 
             cls = public_class(cls)
             if cls.__parameters__ and len(args) == len(cls.__parameters__):
+                try:
+                    cached_generics = generic_cache[cls]
+                except KeyError:
+                    cached_generics = generic_cache[cls] = WeakValueDictionary()
+                try:
+                    new_cls = cached_generics[args]
+                except KeyError:
+                    pass
+                except TypeError:
+                    # unhashable type arguments cannot be cached
+                    cached_generics = None
+                else:
+                    _generic_cache_stats["hits"] += 1
+                    _retain_generic(cls, args, new_cls)
+                    return new_cls
+                _generic_cache_stats["misses"] += 1
+
                 params = cls.__parameters__
                 param_mapping = {p: n for p, n in zip(cls.__parameters__, args)}
                 new_params = tuple(
                     t if not isinstance(param_mapping[t], TypeVar) else param_mapping[t]
                     for t in params
                 )
-                try:
-                    cached_generics = generic_cache[cls]
-                    return cached_generics[args]
-                except KeyError:
-                    cached_generics = generic_cache[cls] = WeakValueDictionary()
-
-                new_annotations = {}
-                complex_fields = []
-                typehints = get_type_hints(cls, include_extras=True)
-                for field_name in cls.__parameters_by_field__:
-                    typevar_params = cls.__parameters_by_field__[field_name]
-                    typehint = typehints[field_name]
-                    if isinstance(typehint, TypeVar):
-                        new_annotations[field_name] = param_mapping[typehint]
-                    else:
-                        complex_fields.append(field_name)
-
-                for attr_name in cls.__parameters_by_field__.keys() & frozenset(complex_fields):
+                typevar_fields, complex_fields = _generic_field_plan(cls)
+                new_annotations = {
+                    field_name: param_mapping[typevar]
+                    for field_name, typevar in typevar_fields.items()
+                }
+                for attr_name in complex_fields:
                     typevar_params = cls.__parameters_by_field__[attr_name]
-                    attr_type_args = []
-                    for new_type, typevar in zip(args, typevar_params):
-                        attr_type_args.append(new_type)
+                    attr_type_args = tuple(param_mapping[typevar] for typevar in typevar_params)
                     type_genericable = cls._columns[attr_name]
-                    new_annotations[attr_name] = type_genericable[tuple(attr_type_args)]
-                new_cls = cached_generics[args] = type(
+                    new_annotations[attr_name] = type_genericable[attr_type_args]
+                new_cls = type(
                     cls.__name__,
                     (cls - frozenset(new_annotations.keys()),),
                     {
@@ -210,7 +296,9 @@ else:
                         "__module__": cls.__module__,
                     },
                 )
-
+                if cached_generics is not None:
+                    cached_generics[args] = new_cls
+                    _retain_generic(cls, args, new_cls)
                 return new_cls
             raise TypeError(f"{cls} is not a generic class")
 
@@ -0,0 +1,327 @@
+"""
+Validating data against an instruct class without raising.
+
+``Cls.validate(data)`` runs each value through the generated setter and
+returns ``(instance, ())`` or ``(None, errors)``, where each error is a
+``FieldError`` naming the path of the offending value (``"items[2].name"``).
+"""
+
+from __future__ import annotations
+
+import functools
+import reprlib
+import threading
+import typing
+from collections import abc
+from typing import Any, Mapping, NamedTuple, Union
+
+from .exceptions import ValidationError
+from .typedef import parse_typedef
+from .types import BaseAtomic
+from .typing import CustomTypeCheck, get_origin, get_args, Annotated, Literal
+
+if typing.TYPE_CHECKING:
+    from .typing import Atomic
+
+NoneType = type(None)
+
+_repr = reprlib.Repr()
+_repr.maxstring = 80
+_repr.maxother = 80
+
+
+class FieldError(NamedTuple):
+    path: str
+    value: str
+    expected: str
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.value} is not {self.expected}"
+
+
+@functools.lru_cache(maxsize=1024)
+def describe_expected_types(types_required: tuple[type, ...]) -> str:
+    """
+    Describe what a field accepts, i.e. ``"either an int or str"``. Cached, as a
+    field's type vector is fixed once its class exists.
+    """
+    pending_types_required_names = []
+    for req_cls in types_required:
+        # ARJ: Handle Literal[1, 2, 3]-cases.. :/
+        if issubclass(req_cls, CustomTypeCheck) and req_cls.__origin__ is Literal:
+            pending_types_required_names.extend(
+                f'"{arg}"' if isinstance(arg, str) else str(arg) for arg in req_cls.__args__
+            )
+            continue
+        pending_types_required_names.append(req_cls.__name__)
+    types_required_names = tuple(pending_types_required_names)
+    if len(types_required_names) > 1:
+        if len(types_required_names) == 2:
+            left, right = types_required_names
+            return f"either an {left} or {right}"
+        *rest_types, end = types_required_names
+        rest = ", ".join([x for x in rest_types])
+        return f"either an {rest} or a {end}"
+    (expected_type,) = types_required_names
+    return f"a {expected_type}"
+
+
+def describe_value(value: Any) -> str:
+    """
+    A ``repr`` of ``value`` short enough for an error message.
+    """
+    return _repr.repr(value)
+
+
+def _as_tuple(types: Any) -> tuple[type, ...]:
+    if isinstance(types, tuple):
+        return types
+    return (types,)
+
+
+def _atomic(hint: Any) -> type[Atomic] | None:
+    if isinstance(hint, type) and issubclass(hint, BaseAtomic) and hasattr(hint, "_columns"):
+        return hint
+    return None
+
+
+class _ItemPlan(NamedTuple):
+    types: tuple[type, ...]
+    atomic: type[Atomic] | None
+
+
+class _FieldPlan(NamedTuple):
+    types: tuple[type, ...]
+    # an instruct class a dict value may describe
+    atomic: type[Atomic] | None
+    # for typed collections, the items (or keys and values) to report by index
+    items: _ItemPlan | None
+    keys: _ItemPlan | None
+
+
+def _unwrap(hint: Any) -> Any:
+    origin = get_origin(hint)
+    if origin is Annotated:
+        return _unwrap(get_args(hint)[0])
+    if origin is Union:
+        members = tuple(arg for arg in get_args(hint) if arg is not NoneType)
+        if len(members) == 1:
+            return _unwrap(members[0])
+    return hint
+
+
+def _item_plan(hint: Any) -> _ItemPlan:
+    hint = _unwrap(hint)
+    return _ItemPlan(_as_tuple(parse_typedef(hint)), _atomic(hint))
+
+
+def _plan_field(cls: type[Atomic], field: str) -> _FieldPlan:
+    hint = _unwrap(cls._slots[field])
+    origin = get_origin(hint)
+    args = get_args(hint)
+    items = keys = None
+    if isinstance(origin, type) and args:
+        if issubclass(origin, abc.Mapping) and len(args) == 2:
+            keys, items = _item_plan(args[0]), _item_plan(args[1])
+        elif issubclass(origin, (abc.Sequence, abc.Set)) and not issubclass(origin, (str, bytes)):
+            if origin is not tuple or (len(args) == 2 and args[1] is Ellipsis):
+                items = _item_plan(args[0])
+    return _FieldPlan(
+        _as_tuple(cls._column_types[field]),
+        _atomic(hint),
+        items,
+        keys,
+    )
+
+
+_plans_lock = threading.Lock()
+_NOT_WALKED = object()
+
+
+def _plans_for(cls: type[Atomic]) -> Mapping[str, _FieldPlan]:
+    data_class = cls._data_class
+    try:
+        return vars(data_class)["_validation_plans"]
+    except KeyError:
+        pass
+    with _plans_lock:
+        try:
+            return vars(data_class)["_validation_plans"]
+        except KeyError:
+            pass
+        plans = {field: _plan_field(data_class, field) for field in data_class._columns}
+        # kept on the class like the codecs
+        data_class._validation_plans = plans
+    return plans
+
+
+def _check_item(plan: _ItemPlan, value: Any, path: str, errors: list[FieldError]) -> Any:
+    if isinstance(value, plan.types):
+        return value
+    if plan.atomic is not None and isinstance(value, dict):
+        instance, nested_errors = _validate(plan.atomic, value, f"{path}.")
+        errors.extend(nested_errors)
+        return instance
+    errors.append(FieldError(path, _repr.repr(value), describe_expected_types(plan.types)))
+    return None
+
+
+def _rebuild(value: Any, items: list[Any]) -> Any:
+    """
+    Put checked ``items`` back into a collection like ``value``. Only the
+    builtin collections are rebuilt as their own type, as others (``range``,
+    ``defaultdict``, ...) are not constructed from an iterable of items.
+    """
+    if type(value) in (list, tuple, set, frozenset, dict):
+        return type(value)(items)
+    if isinstance(value, abc.Mapping):
+        return dict(items)
+    if isinstance(value, tuple):
+        return tuple(items)
+    if isinstance(value, abc.Set):
+        return set(items)
+    return items
+
+
+def _check_collection(plan: _FieldPlan, value: Any, path: str, errors: list[FieldError]) -> Any:
+    """
+    Report the items of a typed collection that do not fit, returning the
+    collection with any dicts for instruct classes constructed, ``value`` itself
+    if nothing needed constructing, or ``_NOT_WALKED`` if ``value`` is not such a
+    collection.
+    """
+    if plan.keys is not None:
+        if not isinstance(value, abc.Mapping):
+            return _NOT_WALKED
+        originals = list(value.items())
+        items = [
+            (
+                _check_item(plan.keys, key, f"{path}[{key!r}]", errors),
+                _check_item(plan.items, item, f"{path}[{key!r}]", errors),
+            )
+            for key, item in originals
+        ]
+        changed = any(
+            new_key is not key or new_item is not item
+            for (key, item), (new_key, new_item) in zip(originals, items)
+        )
+    elif plan.items is not None:
+        if isinstance(value, (str, bytes, abc.Mapping)) or not isinstance(value, abc.Collection):
+            return _NOT_WALKED
+        originals = list(value)
+        items = [
+            _check_item(plan.items, item, f"{path}[{index}]", errors)
+            for index, item in enumerate(originals)
+        ]
+        changed = any(new_item is not item for item, new_item in zip(originals, items))
+    else:
+        return _NOT_WALKED
+    if not changed:
+        return value
+    return _rebuild(value, items)
+
+
+class _Discard(Exception):
+    pass
+
+
+def _validate(
+    cls: type[Atomic], data: Mapping[str, Any], prefix: str
+) -> tuple[Atomic | None, tuple[FieldError, ...]]:
+    # the batch machinery lives in the package root, which imports this module
+    from . import batch_update
+
+    plans = _plans_for(cls)
+    errors: list[FieldError] = []
+    values = {}
+    # Each value goes through the generated setter of a scratch instance, so
+    # coercion, ``handle_type_error`` handlers and Range checks all apply. The
+    # batch keeps its event listeners from being called.
+    scratch = cls.__new__(cls)
+    try:
+        with batch_update(scratch):
+            for field, value in data.items():
+                path = f"{prefix}{field}"
+                try:
+                    plan = plans[field]
+                except KeyError:
+                    errors.append(FieldError(path, _repr.repr(value), f"a field of {cls.__name__}"))
+                    continue
+                value = _check_field(scratch, field, plan, value, path, errors)
+                if value is not _NOT_WALKED:
+                    values[field] = value
+            raise _Discard
+    except _Discard:
+        pass
+    if errors:
+        return None, tuple(errors)
+    try:
+        return cls(**values), ()
+    except Exception as e:
+        # checks beyond the fields, i.e. in ``__post_init__``
+        path = prefix.rstrip(".") or cls.__name__
+        if isinstance(e, ValidationError):
+            return None, tuple(FieldError(path, _repr.repr(data), str(error)) for error in e.errors)
+        return None, (FieldError(path, _repr.repr(data), str(e)),)
+
+
+def _setter_accepts(scratch: Atomic, field: str, value: Any, plan: _FieldPlan) -> bool:
+    try:
+        setattr(scratch, field, value)
+    except Exception:
+        return False
+    if scratch._configuration["fast"]:
+        # ``fast=True`` setters (the default under ``python -O``) only assert
+        # the type, so check what they stored
+        return isinstance(getattr(scratch, field), plan.types)
+    return True
+
+
+def _check_field(
+    scratch: Atomic,
+    field: str,
+    plan: _FieldPlan,
+    value: Any,
+    path: str,
+    errors: list[FieldError],
+) -> Any:
+    """
+    Return the value to construct with, or ``_NOT_WALKED`` after reporting why
+    ``value`` does not fit ``field``.
+    """
+    if _setter_accepts(scratch, field, value, plan):
+        return value
+    # explain the failure, building what the setter does not accept as data
+    if plan.atomic is not None and isinstance(value, dict):
+        instance, nested_errors = _validate(plan.atomic, value, f"{path}.")
+        if nested_errors:
+            errors.extend(nested_errors)
+            return _NOT_WALKED
+        if _setter_accepts(scratch, field, instance, plan):
+            return instance
+    else:
+        count = len(errors)
+        checked = _check_collection(plan, value, path, errors)
+        if len(errors) > count:
+            return _NOT_WALKED
+        if checked is not _NOT_WALKED and checked is not value:
+            if _setter_accepts(scratch, field, checked, plan):
+                return checked
+    errors.append(FieldError(path, _repr.repr(value), describe_expected_types(plan.types)))
+    return _NOT_WALKED
+
+
+def validate(
+    cls: type[Atomic], data: Mapping[str, Any]
+) -> tuple[Atomic | None, tuple[FieldError, ...]]:
+    """
+    Construct ``cls`` from ``data`` if every value fits its field, returning
+    ``(instance, ())``, else ``(None, errors)`` without raising.
+
+    Values are checked by the generated setters (so ``__coerce__`` functions and
+    ``handle_type_error`` handlers apply, and on ``fast=True`` classes the
+    stored value's type is checked as well), dicts are accepted for nested instruct
+    classes, and every error is collected rather than only the first. Nested fields are reported as
+    ``"field.nested"`` and items of typed collections as ``"field[index]"``.
+    """
+    return _validate(cls, data, "")
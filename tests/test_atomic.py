@@ -42,6 +42,7 @@ from instruct import (
     asdict,
     asjson,
     schema_for,
+    FieldError,
 )
 
 if sys.version_info < (3, 9):
@@ -1806,3 +1807,1125 @@ def test_class_iter():
 
     assert "bar-value" in Custom
     assert "bar_value" in tuple(Custom)
+
+
+def test_getitem_wide_class():
+    Wide = AtomicMeta(
+        "Wide",
+        (SimpleBase,),
+        {"__slots__": {f"field_{index}": int for index in range(100)}, "__module__": __name__},
+    )
+    w = Wide(*range(100))
+    assert w["field_99"] == 99
+    assert w[99] == w[-1] == 99
+    assert w[-100] == w[0] == w["field_0"] == 0
+    w["field_50"] = -50
+    assert w.field_50 == -50
+    w[-1] = -1
+    assert w.field_99 == -1
+    with pytest.raises(TypeError):
+        w["field_1"] = "not an int"
+    for missing in ("field_100", 100, -101, ["unhashable"]):
+        with pytest.raises(KeyError):
+            w[missing]
+        with pytest.raises(KeyError):
+            w[missing] = 1
+        assert instruct.get(w, missing, "default") == "default"
+
+
+def test_specialized_setters():
+    calls = []
+
+    def to_int(value):
+        calls.append(value)
+        return int(value, 10)
+
+    class Scalar(SimpleBase):
+        value: int
+
+    class Coerced(SimpleBase):
+        value: int
+
+        __coerce__ = {"value": (str, to_int)}
+
+    class Nested(SimpleBase):
+        child: {"value": int}  # type:ignore # noqa:F821
+
+    s = Scalar(1)
+    with pytest.raises(ClassCreationFailed):
+        Scalar("1")
+    with pytest.raises(TypeError):
+        s.value = "1"
+
+    c = Coerced(1)
+    assert not calls
+    c.value = "2"
+    assert c.value == 2 and calls == ["2"]
+    with pytest.raises(TypeError):
+        c.value = 3.0
+
+    n = Nested({"value": 1})
+    assert n.child.value == 1
+    n.child = Nested.child(2)
+    assert n.child.value == 2
+    with pytest.raises(TypeError):
+        n.child = 1
+
+
+def test_trusted_construct():
+    changes = []
+
+    class Trusted(SimpleBase):
+        name: str
+        value: int
+
+        @add_event_listener("value")
+        def _on_value(self, old, new):
+            changes.append((old, new))
+
+    t = Trusted.trusted_construct("a", 1)
+    assert (t.name, t.value) == ("a", 1)
+    assert isinstance(t, Trusted)
+    assert not changes
+    # No validation is done on trusted data
+    t = Trusted.trusted_construct("a", "not an int")
+    assert t.value == "not an int"
+    # Missing trailing values keep their defaults
+    t = Trusted.trusted_construct("a")
+    assert t.value is None
+    with pytest.raises(TypeError):
+        Trusted.trusted_construct("a", 1, 2)
+
+    t = Trusted.trusted_from_dict({"value": 2, "unknown": 1})
+    assert (t.name, t.value) == (None, 2)
+    assert not changes
+    # the instance behaves normally afterwards
+    t.value = 3
+    assert changes == [(2, 3)]
+    with pytest.raises(TypeError):
+        t.value = "3"
+
+    del changes[:]
+    Trusted.trusted_construct("a", 5, fire_listeners=True)
+    assert changes == [(None, 5)]
+    del changes[:]
+    Trusted.trusted_from_dict({"name": "b"}, fire_listeners=True)
+    assert not changes
+
+    class TrustedHistory(SimpleBase, history=True):
+        value: int
+
+    h = TrustedHistory.trusted_construct(1)
+    h.value = 2
+    assert [delta.new for delta in h._changes["value"]] == [1, 2]
+
+
+def test_unchecked_sibling():
+    class Checked(SimpleBase, fast=False):
+        name: str
+        value: int
+
+        __coerce__ = {"value": (str, int)}
+
+    class CheckedChild(Checked):
+        extra: int
+
+    # the unchecked setters are only made once a sibling is asked for
+    instruct.finalize(Checked)
+    assert not isinstance(vars(Checked)["_unchecked_properties"].value["value"], property)
+    Unchecked = Checked.unchecked()
+    assert isinstance(vars(Unchecked)["value"], property)
+    assert Unchecked is Checked.unchecked()
+    assert Unchecked.unchecked() is Unchecked
+    assert Unchecked is not Checked._data_class
+
+    item = Unchecked(name="a", value="1")
+    assert isinstance(item, Checked)
+    assert public_class(item) is Checked
+    assert item.value == 1
+    assert item == Checked(name="a", value=1)
+    # pickles as the public class
+    assert item.__reduce__()[1][0] is Checked
+
+    checked = Checked(name="a", value=1)
+    with pytest.raises(TypeError):
+        checked.value = 1.5
+    # the slots are shared so an instance may be switched in place
+    checked.__class__ = Unchecked
+    checked.value = 2
+    assert checked.value == 2
+
+    child = CheckedChild.unchecked()("b", 2, 3)
+    assert isinstance(child, Checked)
+    assert child._astuple() == ("b", 2, 3)
+
+    # a value of the wrong type is stored rather than rejected or asserted on
+    item.value = 1.5
+    assert item.value == 1.5
+    child = CheckedChild.unchecked()("b", None, object)
+    assert child.extra is object
+
+    class Holder(SimpleBase):
+        inner: Checked
+
+    holder = Holder.unchecked()(inner={"name": "c", "value": "3"})
+    assert holder.inner == Checked(name="c", value=3)
+    holder.inner = {"name": "d", "value": 4}
+    assert holder.inner == Checked(name="d", value=4)
+
+    class AlreadyFast(SimpleBase, fast=True):
+        value: int
+
+    assert AlreadyFast.unchecked() is not AlreadyFast._data_class
+    assert AlreadyFast.unchecked()(value="x").value == "x"
+
+
+def test_memory_usage_and_shared_code():
+    class First(SimpleBase):
+        id: int
+        name: str
+
+    class Second(SimpleBase):
+        id: int
+        name: str
+
+    # identical generated source compiles to one shared code object
+    assert First.id.fset.__code__ is Second.id.fset.__code__
+    assert First.__eq__.__code__ is Second.__eq__.__code__
+
+    usage = instruct.memory_usage(First)
+    assert isinstance(usage, instruct.MemoryUsage)
+    assert usage.code_objects > 0
+    assert usage.total == (
+        usage.code_bytes + usage.function_bytes + usage.metadata_bytes + usage.type_bytes
+    )
+    assert instruct.memory_usage(First()) == usage
+
+    seen = set()
+    instruct.memory_usage(First, seen=seen)
+    second = instruct.memory_usage(Second, seen=seen)
+    assert second.code_bytes < instruct.memory_usage(Second).code_bytes
+
+    with pytest.raises(TypeError):
+        instruct.memory_usage(int)
+
+
+def test_generic_cache_keeps_other_specializations():
+    from instruct.types import generic_cache_info, clear_generic_cache
+
+    T = TypeVar("T")
+
+    class Page(SimpleBase):
+        items: List[T]
+        first: T
+
+    page_int = Page[int]
+    page_str = Page[str]
+    before = generic_cache_info()
+    # alternating specializations are both served from the cache
+    assert Page[int] is page_int
+    assert Page[str] is page_str
+    after = generic_cache_info()
+    assert after.hits == before.hits + 2
+    assert after.misses == before.misses
+    assert page_int(items=[1], first=2).first == 2
+    with pytest.raises(ClassCreationFailed):
+        page_str(items=[1], first="a")
+
+    clear_generic_cache(maxretained=0)
+    try:
+        assert generic_cache_info() == (0, 0, 0, 0, 0)
+        Page[float]
+        assert generic_cache_info().misses == 1
+        assert generic_cache_info().retained == 0
+    finally:
+        clear_generic_cache(maxretained=128)
+
+
+def test_lazy_method_annotations_finalize():
+    class Lazy(SimpleBase, lazy=False, lazy_method_annotations=True):
+        value: int
+        name: "Optional[str]"
+
+    assert "return" not in Lazy.__iter__.__annotations__
+    assert instruct.finalize(Lazy) is Lazy
+    assert Lazy.__getitem__.__annotations__["key"] == Literal["value", "name"]
+    # finalize is idempotent
+    instruct.finalize(Lazy)
+
+    class LazyParent(SimpleBase, lazy=False, lazy_method_annotations=True):
+        value: int
+
+    class Child(LazyParent):
+        other: str
+
+    assert LazyParent.__getitem__.__annotations__["key"] != Literal["value"]
+    # instantiating a subclass finalizes the lazy bases too
+    child = Child(1, "a")
+    assert (child.value, child.other) == (1, "a")
+    assert LazyParent.__getitem__.__annotations__["key"] == Literal["value"]
+    assert LazyParent(2).value == 2
+    with pytest.raises(TypeError):
+        instruct.finalize(int)
+
+
+def test_lazy_materialization():
+    class Lazy(SimpleBase, lazy=True):
+        value: int
+        name: str
+
+    assert "_pending_finalize" in vars(Lazy)
+    assert not isinstance(vars(Lazy)["value"], property)
+    assert tuple(Lazy._columns) == ("value", "name")
+    item = Lazy(1, "a")
+    assert "_pending_finalize" not in vars(Lazy)
+    assert isinstance(vars(Lazy)["value"], property)
+    assert item._asdict() == {"value": 1, "name": "a"}
+    with pytest.raises(ClassCreationFailed):
+        Lazy(value="1")
+
+    class LazyTrusted(SimpleBase, lazy=True):
+        value: int
+
+    assert LazyTrusted.trusted_construct(1).value == 1
+
+    class LazyAccess(SimpleBase, lazy=True):
+        value: int
+
+    # class level access materializes too
+    assert isinstance(LazyAccess.value, property)
+    assert "_pending_finalize" not in vars(LazyAccess)
+
+    class LazyParent(SimpleBase, lazy=True):
+        value: int
+        other: str
+
+    class LazyChild(LazyParent, lazy=True):
+        extra: int
+
+    assert "_pending_finalize" not in vars(LazyParent)
+    assert "_pending_finalize" in vars(LazyChild)
+    assert (LazyParent - "other")(value=1).value == 1
+    assert LazyChild(1, "a", 2)._astuple() == (1, "a", 2)
+
+    class Warm(SimpleBase, lazy=True):
+        value: int
+
+    thread = instruct.warmup(Warm)
+    thread.join()
+    assert "_pending_finalize" not in vars(Warm)
+    assert instruct.warmup(Warm, background=False) is None
+
+
+def test_render_cache():
+    rendered = instruct._rendered
+    assert instruct.render_string("{{ a }}{{ b }}", a=[1], b=(2,)) == "[1](2,)"
+    # lists and tuples are told apart in the cache
+    assert instruct.render_string("{{ a }}{{ b }}", a=(1,), b=[2]) == "(1,)[2]"
+    assert instruct.render_string("{{ a }}", a={"x": 1}) == "{'x': 1}"
+
+    class RenderOnce(SimpleBase):
+        value: int
+        name: str
+
+    count = len(rendered)
+
+    class RenderTwice(SimpleBase):
+        value: int
+        name: str
+
+    # only the class name dependent renders are new
+    assert len(rendered) - count < 8
+    assert RenderTwice(1, "a")._astuple() == (1, "a")
+
+
+def test_binary_roundtrip():
+    class Point(SimpleBase):
+        x: int
+        label: Optional[str]
+
+    class Shape(SimpleBase):
+        id: int
+        ratio: float
+        visible: bool
+        payload: bytes
+        origin: Point
+        points: List[Point]
+        tags: Dict[str, int]
+        pair: Tuple[int, str]
+
+    shape = Shape(
+        id=1,
+        ratio=0.5,
+        visible=True,
+        payload=b"abc",
+        origin=Point(0, None),
+        points=[Point(1, "a"), Point(2, "b")],
+        tags={"x": 1},
+        pair=(3, "c"),
+    )
+    buffer = bytearray(b"prefix")
+    written = instruct.dumps_into(shape, buffer)
+    assert written == len(buffer) - len(b"prefix")
+    loaded, end = Shape.loads_from(memoryview(buffer), len(b"prefix"))
+    assert end == len(buffer)
+    assert isinstance(loaded.payload, memoryview)
+    assert bytes(loaded.payload) == b"abc"
+    assert (loaded.id, loaded.ratio, loaded.visible) == (1, 0.5, True)
+    assert loaded.origin == Point(0, None)
+    assert loaded.points == [Point(1, "a"), Point(2, "b")]
+    assert (loaded.tags, loaded.pair) == ({"x": 1}, (3, "c"))
+    copied, _ = Shape.loads_from(bytes(buffer), len(b"prefix"), copy=True)
+    assert copied == shape
+
+    class PointAlt(SimpleBase):
+        x: int
+        label: Optional[str]
+
+    class PointOther(SimpleBase):
+        x: str
+        label: Optional[str]
+
+    assert Point.schema_fingerprint() == PointAlt.schema_fingerprint()
+    assert Point.schema_fingerprint() != PointOther.schema_fingerprint()
+    buffer = bytearray()
+    instruct.dumps_into(Point(1, None), buffer)
+    with pytest.raises(instruct.exceptions.SchemaMismatchError):
+        PointOther.loads_from(buffer)
+    with pytest.raises(instruct.exceptions.SchemaMismatchError):
+        Point.loads_from(buffer[:-2])
+
+    buffer = bytearray(b"prefix")
+    for x in (1 << 63, -(1 << 63) - 1):
+        with pytest.raises(ValueError, match="'x'") as exc:
+            instruct.dumps_into(Point(x, None), buffer)
+        assert exc.value.data == {"field": "x", "value": x}
+        assert buffer == b"prefix"
+    instruct.dumps_into(Point((1 << 63) - 1, None), buffer)
+    assert Point.loads_from(buffer, len(b"prefix"))[0].x == (1 << 63) - 1
+
+
+def test_msgpack_roundtrip():
+    from instruct import msgpack
+
+    class Tag(SimpleBase):
+        name: str
+        weight: Optional[float]
+
+    class Post(SimpleBase):
+        id: int
+        title: str
+        body: bytes
+        tags: List[Tag]
+        scores: Tuple[int, ...]
+        main: Optional[Tag]
+        extra: Dict[str, Any]
+
+    post = Post(
+        id=-70000,
+        title="x" * 40,
+        body=b"\x00\x01",
+        tags=[Tag("a", 1.5), Tag("b", None)],
+        scores=(1, 300, -5),
+        main=None,
+        extra={"k": [1, None, True]},
+    )
+    data = instruct.to_msgpack(post)
+    payload = msgpack.unpackb(data)
+    assert payload[0] == msgpack.codec_for(Post).version
+    assert payload[1:4] == [-70000, "x" * 40, b"\x00\x01"]
+    assert payload[4] == [["a", 1.5], ["b", None]]
+    loaded = Post.from_msgpack(data)
+    assert loaded == post
+    assert loaded.scores == (1, 300, -5)
+    assert loaded.tags[0] == Tag("a", 1.5)
+
+    tags = [Tag(str(index), float(index)) for index in range(20)]
+    assert Tag.from_many_msgpack(instruct.to_many_msgpack(tags)) == tuple(tags)
+    with pytest.raises(TypeError):
+        instruct.to_many_msgpack([tags[0], post])
+    with pytest.raises(TypeError):
+        instruct.to_many_msgpack([post], Tag)
+    empty = instruct.to_many_msgpack([], Tag)
+    assert msgpack.unpackb(empty) == [msgpack.codec_for(Tag).version]
+    assert Tag.from_many_msgpack(empty) == ()
+    with pytest.raises(ValueError):
+        instruct.to_many_msgpack([])
+
+    class OtherTag(SimpleBase):
+        name: str
+        weight: Optional[int]
+
+    with pytest.raises(instruct.exceptions.SchemaMismatchError):
+        OtherTag.from_msgpack(instruct.to_msgpack(tags[0]))
+    with pytest.raises(ValueError):
+        Tag.from_msgpack(instruct.to_msgpack(tags[0])[:-3])
+    for value in (0, 127, 128, 255, 65536, 2**40, -1, -33, -129, -40000, -(2**40), 2.5, "é" * 300):
+        assert msgpack.unpackb(msgpack.packb(value)) == value
+
+    class Holder(SimpleBase):
+        thing: Union[Tag, str]
+
+    class Plain(SimpleBase):
+        thing: Union[int, str, List[str]]
+
+    # members that need converting can not be told apart in the array
+    with pytest.raises(TypeError, match="'thing'"):
+        instruct.to_msgpack(Holder(Tag("a", 1.0)))
+    assert Plain.from_msgpack(instruct.to_msgpack(Plain(["a"]))) == Plain(["a"])
+
+
+def test_from_json_trusted():
+    class Stamp(Base):
+        label: str
+        day: datetime.date
+
+    class Record(Base):
+        id: int
+        created: datetime.datetime
+        blob: bytes
+        stamps: List[Stamp]
+        by_name: Dict[str, Stamp]
+        latest: Optional[Stamp]
+        sizes: Tuple[int, ...]
+
+    record = Record(
+        id=1,
+        created=datetime.datetime(2020, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+        blob=b"\x00\xff",
+        stamps=[Stamp("a", datetime.date(2020, 1, 1))],
+        by_name={"b": Stamp("b", datetime.date(2021, 1, 1))},
+        latest=None,
+        sizes=(1, 2),
+    )
+    data = json.loads(json.dumps(record.to_json()))
+    loaded = Record.from_json(data, trusted=True)
+    assert loaded == record
+    assert loaded.sizes == (1, 2)
+    assert isinstance(loaded.by_name["b"], Stamp)
+    assert Record.from_many_json([data, data], trusted=True) == (record, record)
+    assert instruct.trusted_json_decoder(Record) is instruct.trusted_json_decoder(Record)
+
+    class Custom(Base):
+        BINARY_JSON_ENCODERS = {"raw": lambda val: val.decode("utf8")}
+        raw: bytes
+
+        __coerce__ = {"raw": (str, lambda val: val.encode("utf8"))}
+
+    # fields that to_json can not reverse fall back to the checked constructor
+    assert Custom.from_json({"raw": "abc"}, trusted=True).raw == b"abc"
+
+
+def test_aiter_from_stream():
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    class Row(SimpleBase):
+        id: int
+        name: str
+
+    class TextRow(SimpleBase):
+        id: str
+        name: str
+
+    async def collect(data, **options):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return [item async for item in Row.aiter_from(reader, **options)]
+
+    async def collect_csv(data, **options):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return [item async for item in TextRow.aiter_from(reader, format="csv", **options)]
+
+    ndjson = b"".join(
+        json.dumps({"id": index, "name": f"n{index}"}).encode() + b"\n" for index in range(10)
+    )
+    rows = asyncio.run(collect(ndjson, batch_size=3))
+    assert [row.id for row in rows] == list(range(10))
+    with ThreadPoolExecutor(1) as executor:
+        rows = asyncio.run(
+            collect(ndjson + b"\n", batch_size=4, executor=executor, offload_threshold=2)
+        )
+    assert [row.name for row in rows] == [f"n{index}" for index in range(10)]
+    assert asyncio.run(collect(ndjson, trusted=True))[-1]._astuple() == (9, "n9")
+    rows = asyncio.run(collect_csv(b'name,id\r\na,1\r\n"b,c",2\r\n'))
+    assert [row._astuple() for row in rows] == [("1", "a"), ("2", "b,c")]
+    # batches are cut between records, not inside a quoted cell spanning lines
+    rows = asyncio.run(collect_csv(b"name,id\n" + b'"line1\nline2",0\n' * 3, batch_size=3))
+    assert [row._astuple() for row in rows] == [("0", "line1\nline2")] * 3
+    rows = asyncio.run(collect_csv(b'id,name\n1,"a ""b\nc"""\n2,"open\n', batch_size=1))
+    assert [row.name for row in rows] == ['a "b\nc"', "open\n"]
+    with pytest.raises(ClassCreationFailed):
+        asyncio.run(collect(b'{"id": "x"}\n'))
+
+    async def close_early(data):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        errors = []
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda loop, context: errors.append(context))
+        stream = Row.aiter_from(reader, batch_size=1, max_pending=3)
+        assert (await stream.__anext__()).id == 0
+        await stream.aclose()
+        del stream
+        gc.collect()
+        return errors
+
+    # the failed batch still pending is discarded without being logged
+    import gc
+
+    assert asyncio.run(close_early(b'{"id": 0, "name": ""}\n{"id": "x"}\n')) == []
+
+
+def test_csv_read_write():
+    import io
+    from typing import Literal
+
+    class Row(SimpleBase):
+        id: int
+        name: str
+        score: Optional[float]
+        active: bool
+        at: datetime.datetime
+        kind: Literal["a", "b"]
+
+    rows = [
+        Row(1, "x", None, True, datetime.datetime(2024, 1, 2, 3, 4), "a"),
+        Row(2, "y,z", 1.5, False, datetime.datetime(2024, 1, 2), "b"),
+    ]
+    buffer = io.StringIO()
+    assert Row.write_csv(buffer, rows) == 2
+    assert buffer.getvalue().splitlines()[0] == "id,name,score,active,at,kind"
+    buffer.seek(0)
+    assert list(Row.read_csv(buffer)) == rows
+    buffer.seek(0)
+    assert list(Row.read_csv(buffer, trusted=True)) == rows
+    (partial,) = Row.read_csv(io.StringIO("name,id,extra\nq,3,ignored\n"))
+    assert partial._astuple() == (3, "q", None, None, None, None)
+    with pytest.raises(ClassCreationFailed):
+        list(Row.read_csv(io.StringIO("id\nabc\n")))
+    with pytest.raises(ValueError):
+        list(Row.read_csv(io.StringIO("kind\nc\n"), trusted=True))
+    for trusted in (False, True):
+        with pytest.raises(ValueError, match=r"\['4'\] is too short to have a 'name' cell"):
+            list(Row.read_csv(io.StringIO("id,name\n3,a\n4\n"), trusted=trusted))
+
+    class Defaults(SimpleBase):
+        id: int
+        name: str
+        tags: List[str]
+        blob: Optional[bytes]
+
+        def _set_defaults(self):
+            self.name = "default"
+            self.tags = []
+            super()._set_defaults()
+
+    for trusted in (False, True):
+        (row,) = Defaults.read_csv(io.StringIO("id\n3\n"), trusted=trusted)
+        assert asdict(row) == {"id": 3, "name": "default", "tags": [], "blob": None}
+
+    class Blob(SimpleBase):
+        id: int
+        blob: Optional[bytes]
+
+    with_bytes = [Blob(1, b"\x00,\xff"), Blob(2)]
+    buffer = io.StringIO()
+    Blob.write_csv(buffer, with_bytes)
+    assert "base64:" in buffer.getvalue()
+    for trusted in (False, True):
+        buffer.seek(0)
+        assert list(Blob.read_csv(buffer, trusted=trusted)) == with_bytes
+    with pytest.raises(TypeError):
+        Blob.write_csv(io.StringIO(), [rows[0]])
+
+
+def test_subtraction_cache():
+    def make(field_type):
+        class Item(SimpleBase):
+            id: int
+            name: field_type
+
+        return Item
+
+    first, second = make(str), make(bytes)
+    assert first.__qualname__ == second.__qualname__
+    try:
+        instruct.clear_subtraction_cache(maxsize=8)
+        without_id = first - {"id"}
+        assert (second - {"id"})._slots["name"] is bytes
+        assert first - "id" is without_id
+        assert first - ["id"] is without_id
+        assert first & {"name"} is without_id
+        info = instruct.subtraction_cache_info()
+        assert info.misses == 2 and info.hits >= 3
+        instruct.clear_subtraction_cache(maxsize=2)
+        assert instruct.subtraction_cache_info() == (0, 0, 0, 2)
+        first - {"name"}
+        second - {"name"}
+        assert instruct.subtraction_cache_info().size == 2
+        with pytest.raises(ValueError):
+            instruct.clear_subtraction_cache(maxsize=-1)
+    finally:
+        instruct.clear_subtraction_cache(maxsize=1024)
+
+
+def test_projection():
+    class Address(SimpleBase):
+        street: str
+        city: str
+
+    class Person(SimpleBase):
+        id: int
+        home: Address
+        work: Optional[Address]
+        tags: List[str]
+
+    thin = Person - {"home": {"city"}}
+    projection = instruct.projection(thin)
+    assert projection.columns == ("id", "home.street", "work.street", "work.city", "tags")
+    assert instruct.projection(thin) is projection
+    person = projection.load((1, "Main St", None, None, ["a"]))
+    assert isinstance(person, thin)
+    assert person.home.street == "Main St" and person.work is None
+    assert instruct.keys(person.home) == {"street"}
+    person = projection.load((2, "Main St", "1st Ave", "Springfield", []))
+    assert person.work.city == "Springfield"
+    with pytest.raises(ClassCreationFailed):
+        projection.load(("x", "Main St", None, None, []))
+
+    only = instruct.projection(Person & {"id", "work"}, separator="__", trusted=True)
+    assert only.columns == ("id", "work__street", "work__city")
+    assert only.load((3, "1st Ave", "Springfield")).work.street == "1st Ave"
+
+
+def test_replace_class_references_cached():
+    class Inner(SimpleBase):
+        a: int
+        b: int
+
+    def make():
+        return Inner
+
+    thin = Inner - {"b"}
+    replaced = instruct.replace_class_references(make, (Inner, thin))
+    assert replaced() is thin
+    assert instruct.replace_class_references(make, (Inner, thin)) is replaced
+
+    class Outer(SimpleBase):
+        inner: Inner
+
+        def build(self):
+            return Inner
+
+        def other(self):
+            return 1
+
+    assert [key for (key, _), _ in instruct.find_users_of({"Inner"}, Outer)] == ["build"]
+    assert list(instruct.find_users_of({"Missing"}, Outer)) == []
+
+
+def test_field_trees_are_shared():
+    class Inner(SimpleBase):
+        a: int
+        b: int
+
+    class Outer(SimpleBase):
+        inner: Inner
+        name: str
+
+    tree = instruct.show_all_fields(Outer)
+    assert tree == {"inner": {"a": None, "b": None}, "name": None}
+    assert instruct.show_all_fields(Outer()) is tree
+    with pytest.raises(TypeError):
+        tree["name"] = {}
+    assert instruct.show_all_fields(Outer, deep_traverse_on={"name": None}) == {
+        "inner": None,
+        "name": None,
+    }
+    # only the full tree is kept, so projections do not pile up entries
+    for _ in range(3):
+        Outer & {"inner": {"a"}}
+    assert instruct._all_fields[Outer] is tree
+
+    thin = Outer - {"inner": {"b"}}
+    assert instruct.skipped_fields(thin) == {"inner": {"b": None}}
+    assert instruct.skipped_fields(thin(name="x")) is instruct.skipped_fields(thin)
+    assert instruct.skipped_fields(Outer) is None
+
+
+def test_listeners_bound_into_setters():
+    calls = []
+
+    # the mappings are compared before any instance would finalize a lazy class
+    class Parent(SimpleBase, lazy=False):
+        x: int
+        y: int
+
+        @add_event_listener("x")
+        def on_x(self, old, new):
+            calls.append(("parent", old, new))
+
+    def mappings(cls):
+        return (
+            dict(vars(cls)["_listener_funcs"].value),
+            dict(vars(cls)["_unchecked_properties"].value),
+        )
+
+    parent_mappings = mappings(Parent)
+
+    class Child(Parent, lazy=False):
+        def on_x(self, old, new):
+            calls.append(("child", old, new))
+
+    class GrandChild(Child, lazy=False):
+        pass
+
+    # overriding a listener gives the subclass new mappings, leaving the parent's
+    assert mappings(Parent) == parent_mappings
+    assert mappings(Child)[1]["x"] is not parent_mappings[1]["x"]
+
+    Parent(x=1).x = 2
+    Child(x=1).x = 3
+    GrandChild(x=1).x = 4
+    Child.unchecked()(x=5).x = 6
+    assert calls == [
+        ("parent", None, 1),
+        ("parent", 1, 2),
+        ("child", None, 1),
+        ("child", 1, 3),
+        ("child", None, 1),
+        ("child", 1, 4),
+        ("child", None, 5),
+        ("child", 5, 6),
+    ]
+    assert instruct.listeners_in_effect(Child, "x") == instruct.listeners_in_effect(Parent, "x")
+
+    class Fast(SimpleBase, fast=True, lazy=False):
+        x: int
+
+        @add_event_listener("x")
+        def changed(self, name, old, new):
+            calls.append((name, old, new))
+
+        @add_event_listener("x")
+        def touched(self):
+            calls.append("touched")
+
+    del calls[:]
+    Fast(x=1).x = 2
+    assert calls == ["touched", ("x", None, 1), "touched", ("x", 1, 2)]
+
+
+def test_batch_update_and_grouped_listeners():
+    calls = []
+
+    class Row(SimpleBase):
+        a: int
+        b: int
+        c: int
+
+        @add_event_listener("a")
+        def on_a(self, old, new):
+            calls.append(("a", old, new))
+
+        @add_event_listener("a", "b", grouped=True)
+        def on_a_or_b(self, **changed):
+            calls.append(("a|b", changed))
+
+        @add_event_listener(grouped=True)
+        def on_any(self, **changed):
+            calls.append(("any", changed))
+
+    row = Row(a=1, b=2, c=3)
+    del calls[:]
+    row.c = 4
+    assert calls == [("any", {"c": 4})]
+    del calls[:]
+
+    with instruct.batch_update(row):
+        row.a = 5
+        row.a = 6
+        row.b = 7
+        with instruct.batch_update(row):
+            row.c = 8
+        assert calls == []
+    assert calls == [("a", 1, 6), ("a|b", {"a": 6, "b": 7}), ("any", {"a": 6, "b": 7, "c": 8})]
+    del calls[:]
+
+    assert instruct.update(row, a=9, c=1) is row
+    assert calls == [("a", 6, 9), ("a|b", {"a": 9}), ("any", {"a": 9, "c": 1})]
+    del calls[:]
+
+    with pytest.raises(KeyError):
+        with instruct.batch_update(row):
+            row.a = 10
+            raise KeyError("a")
+    assert calls == [] and row.a == 10
+    with pytest.raises(ClassCreationFailed):
+        instruct.update(row, d=1)
+
+
+def test_error_messages_are_lazy():
+    from instruct.exceptions import LazyMessage
+
+    formatted = []
+
+    def format_message(*args):
+        formatted.append(args)
+        return "formatted"
+
+    error = instruct.exceptions.TypeError(LazyMessage(format_message, 1), "field", 1)
+    assert formatted == []
+    assert str(error) == "formatted" and error.message == "formatted"
+    assert instruct.exceptions.asjson(error)["message"] == "formatted"
+    assert formatted == [(1,)]
+
+    class Item(SimpleBase):
+        value: Union[int, str]
+
+    with pytest.raises(ClassCreationFailed) as exc_info:
+        Item(value=[])
+    assert str(exc_info.value) == "Unable to construct Item, encountered 1 error"
+    (error,) = exc_info.value.errors
+    assert str(error) == "Unable to set value to [] (list). value expects either an int or str"
+    assert instruct.describe_expected_types((int, str)) == "either an int or str"
+
+    # the value is captured when raised, and args[0] stands in for the message
+    value = []
+    with pytest.raises(ClassCreationFailed) as exc_info:
+        Item(value=value)
+    (error,) = exc_info.value.errors
+    value.append("x" * 1000)
+    (message,) = error.args
+    assert message == "Unable to set value to [] (list). value expects either an int or str"
+    assert message.startswith("Unable to set value") and "[]" in message
+    assert message + "!" == f"{error}!"
+    item = Item(value=1)
+    with pytest.raises(TypeError) as exc_info:
+        item.value = ["x" * 1000]
+    assert len(str(exc_info.value)) < 200
+    assert type(pickle.loads(pickle.dumps(message))) is str
+
+
+def test_validate():
+    class Item(SimpleBase):
+        name: str
+        quantity: int
+
+    class Order(SimpleBase):
+        id: int
+        items: List[Item]
+        tags: Dict[str, int]
+        shipping: Optional[Item]
+
+        __coerce__ = {"id": (str, int)}
+
+    order, errors = Order.validate(
+        {
+            "id": "3",
+            "items": [{"name": "a", "quantity": 1}],
+            "shipping": {"name": "b", "quantity": 2},
+        }
+    )
+    assert errors == ()
+    assert order.id == 3 and order.items == [Item("a", 1)] and order.shipping == Item("b", 2)
+
+    order, errors = Order.validate(
+        {
+            "id": 1.5,
+            "items": [Item("a", 1), {"name": 3, "quantity": 1}, 7],
+            "tags": {"x": "y"},
+            "shipping": {"name": "b", "quantity": "z"},
+            "unknown": 1,
+        }
+    )
+    assert order is None
+    assert errors == (
+        FieldError("id", "1.5", "a int"),
+        FieldError("items[1].name", "3", "a str"),
+        FieldError("items[2]", "7", "a Item"),
+        FieldError("tags['x']", "'y'", "a int"),
+        FieldError("shipping.quantity", "'z'", "a int"),
+        FieldError("unknown", "1", "a field of Order"),
+    )
+    assert str(errors[1]) == "items[1].name: 3 is not a str"
+    ((path, value, expected),) = Order.validate({"items": 5})[1]
+    assert path == "items" and value == "5" and expected.startswith("a List[")
+
+    class Fast(SimpleBase, fast=True):
+        a: int
+        item: Item
+
+    # fast setters only assert, validate() checks the types itself
+    assert Fast.validate({"a": "not an int"})[1] == (FieldError("a", "'not an int'", "a int"),)
+    fast, errors = Fast.validate({"a": 1, "item": {"name": "x", "quantity": 2}})
+    assert errors == () and fast.item == Item(name="x", quantity=2)
+
+    # handlers are only called by checked setters
+    class Handled(SimpleBase, fast=False):
+        x: int
+        xs: List[int]
+        counts: Dict[str, int]
+
+        @handle_type_error("x")
+        def _on_type_failure(self, value):
+            if isinstance(value, str) and value.isdigit():
+                self.x = int(value)
+                return True
+
+    assert Handled(x="5").x == 5
+    handled, errors = Handled.validate({"x": "5"})
+    assert errors == () and handled.x == 5
+    assert Handled.validate({"x": "a"})[1] == (FieldError("x", "'a'", "a int"),)
+    # collections that cannot be rebuilt from their items are reported, not raised
+    (error,) = Handled.validate({"xs": range(3)})[1]
+    assert error.path == "xs"
+    from collections import defaultdict
+
+    assert Handled.validate({"counts": defaultdict(int, a="x")})[1] == (
+        FieldError("counts['a']", "'x'", "a int"),
+    )
+    assert Handled.validate({"counts": defaultdict(int, a=1)})[1] == ()
+
+
+def test_instrumentation(monkeypatch):
+    monkeypatch.delenv("INSTRUCT_STATS", raising=False)
+    instruct.reset_stats()
+
+    class Point(Base, instrumented=True):
+        x: int
+        y: int
+
+        __coerce__ = {"x": (str, int)}
+
+        @add_event_listener("y")
+        def _on_y(self, old, new):
+            pass
+
+    class Point3D(Point):
+        z: int
+
+    class Plain(SimpleBase):
+        a: int
+
+    point = Point("1", 2)
+    point.y = 3
+    with pytest.raises(instruct.exceptions.TypeError):
+        point.x = []
+    point.to_json()
+    point.__reduce__()
+    Point3D(1, 2, 3)
+    Plain(1)
+
+    current = instruct.stats()
+    assert f"{__name__}.{Point3D.__qualname__}" in current
+    # unless the base classes were instrumented by ``INSTRUCT_STATS`` on import
+    if not SimpleBase._configuration["instrumented"]:
+        assert f"{__name__}.{Plain.__qualname__}" not in current
+    point_stats = current[f"{__name__}.{Point.__qualname__}"]
+    assert point_stats["constructions"] == point_stats["to_json"] == point_stats["pickles"] == 1
+    x, y = point_stats["fields"]["x"], point_stats["fields"]["y"]
+    assert (x["sets"], x["coercions"], x["type_failures"]) == (2, 1, 1)
+    assert (y["sets"], y["listener_calls"]) == (2, 2)
+    assert point_stats["construction_time"] > 0 and x["time"] > 0
+    assert set(current[f"{__name__}.{Point3D.__qualname__}"]["fields"]) == {"x", "y", "z"}
+
+    instruct.reset_stats()
+    assert instruct.stats() == {}
+
+    monkeypatch.setenv("INSTRUCT_STATS", "Other, FromEnvironment")
+
+    class FromEnvironment(SimpleBase):
+        a: int
+
+    FromEnvironment(1)
+    assert instruct.stats()[f"{__name__}.{FromEnvironment.__qualname__}"]["constructions"] == 1
+
+
+def test_generated_code_filenames():
+    import gc
+    import linecache
+    import traceback
+
+    class First(SimpleBase):
+        value: int
+
+    class Second(SimpleBase):
+        value: int
+
+    class Instrumented(SimpleBase, instrumented=True):
+        value: int
+
+    class AlsoInstrumented(SimpleBase, instrumented=True):
+        value: int
+
+    for cls in (First, Second, Instrumented, AlsoInstrumented):
+        instruct.finalize(cls)
+    setter = vars(First)["value"].fset
+    filename = setter.__code__.co_filename
+    assert filename.startswith("<instruct:property:")
+    # identical source is shared between classes
+    assert vars(Second)["value"].fset.__code__ is setter.__code__
+    assert First._data_class.__eq__.__code__.co_filename.startswith("<instruct:eq:")
+    assert (
+        linecache.getline(filename, setter.__code__.co_firstlineno)
+        .strip()
+        .startswith("def _set_value(")
+    )
+
+    # instrumented classes get copies named after the class (and field)
+    for cls in (Instrumented, AlsoInstrumented):
+        prefix = f"<instruct:{__name__}.{cls.__qualname__}"
+        assert vars(cls)["value"].fset.__code__.co_filename == f"{prefix}.value:property>"
+        assert cls._data_class.__eq__.__code__.co_filename == f"{prefix}:eq>"
+        assert cls._data_class._asdict.__code__.co_filename == f"{prefix}:asdict>"
+        assert cls._data_class.__iter__.__code__.co_filename == f"{prefix}:iter>"
+        assert linecache.getline(f"{prefix}:eq>", 1)
+
+    with pytest.raises(instruct.exceptions.TypeError) as exc_info:
+        Second(1).value = "a"
+    (frame,) = [
+        frame
+        for frame in traceback.extract_tb(exc_info.tb)
+        if frame.filename == vars(Second)["value"].fset.__code__.co_filename
+    ]
+    assert frame.name == "_set_value" and frame.line
+
+    # the source lines are dropped once no class uses them
+    def make_class():
+        class Temporary(SimpleBase, instrumented=True):
+            only_in_this_test: int
+
+        return instruct.finalize(Temporary)
+
+    Temporary = make_class()
+    filename = vars(Temporary)["only_in_this_test"].fset.__code__.co_filename
+    shared = make_class()
+    del Temporary
+    gc.collect()
+    assert filename in linecache.cache
+    del shared
+    gc.collect()
+    assert not any(
+        "only_in_this_test" in "".join(entry[2])
+        for name, entry in tuple(linecache.cache.items())
+        if name.startswith("<instruct:")
+    )
+
+
+def test_failed_construction_frames_are_inspectable():
+    class Item(SimpleBase):
+        id: int
+
+    with pytest.raises(ClassCreationFailed) as exc_info:
+        Item("a")
+    for error in (exc_info.value, exc_info.value.__cause__):
+        traceback = error.__traceback__
+        while traceback is not None:
+            assert isinstance(traceback.tb_frame.f_locals, dict)
+            traceback = traceback.tb_next
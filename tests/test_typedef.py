@@ -293,3 +293,18 @@ def test_strict_heterogenous():
     assert isinstance(("", -1), t)
     assert isinstance(("a", 1.0), t)
     assert isinstance(("b", 4), t)
+
+
+def test_parse_typedef_shares_checkers():
+    int_list = parse_typedef(List[int])
+    assert parse_typedef(List[int]) is int_list
+    assert parse_typedef(Dict[str, Any]) is parse_typedef(Dict[str, Any])
+    assert parse_typedef(List[str]) is not int_list
+
+    class First(Base):
+        values: List[int]
+
+    class Second(Base):
+        values: List[int]
+
+    assert First._columns["values"] is Second._columns["values"]